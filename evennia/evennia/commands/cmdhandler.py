@@ -38,12 +38,14 @@ from weakref import WeakValueDictionary
 from traceback import format_exc
 from itertools import chain
 from copy import copy
+import time
 import types
 from twisted.internet import reactor
 from twisted.internet.task import deferLater
 from twisted.internet.defer import inlineCallbacks, returnValue
 from django.conf import settings
 from evennia.commands.command import InterruptCommand
+from evennia.commands.cmdsethandler import get_cmdset_version
 from evennia.comms.channelhandler import CHANNELHANDLER
 from evennia.utils import logger, utils
 from evennia.utils.utils import string_suggestions, to_unicode
@@ -51,6 +53,7 @@ from evennia.utils.utils import string_suggestions, to_unicode
 from django.utils.translation import ugettext as _
 
 _IN_GAME_ERRORS = settings.IN_GAME_ERRORS
+_CACHE_MERGED_CMDSETS = settings.CACHE_MERGED_CMDSETS
 
 __all__ = ("cmdhandler", "InterruptCommand")
 _GA = object.__getattribute__
@@ -135,6 +138,38 @@ _ERROR_RECURSION_LIMIT = "Command recursion limit ({recursion_limit}) " \
 _GET_INPUT = None
 
 
+class CmdSetMergeMetrics(object):
+    """
+    Counters of cmdset gathering and merging.
+
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.commands = 0           # commands which merged cmdsets
+        self.hits = 0               # merged cmdsets taken from callers
+        self.misses = 0             # cmdsets gathered and merged again
+        self.merge_time = 0.0       # seconds spent gathering and merging
+
+    def stats(self):
+        """
+        Get metrics.
+
+        Returns:
+            stats (dict): Metrics.
+
+        """
+        return {"commands": self.commands,
+                "hits": self.hits,
+                "misses": self.misses,
+                "merge_time": self.merge_time,
+                "merge_time_per_command": self.merge_time / self.commands if self.commands else 0}
+
+
+CMDSET_MERGE_METRICS = CmdSetMergeMetrics()
+
+
 # helper functions
 
 def _msg_err(receiver, stringtuple):
@@ -251,6 +286,37 @@ class ErrorReported(Exception):
 # Helper function
 
 
+def get_merge_fingerprint(session, account, obj, callertype):
+    """
+    Get a fingerprint of everything which the merged cmdset depends on.
+
+    Args:
+        session (Session or None): The Session associated with caller, if any.
+        account (Account or None): The calling Account associated with caller, if any.
+        obj (Object or None): The Object associated with caller, if any.
+        callertype (str): This identifies caller as either "account", "object" or "session".
+
+    Returns:
+        fingerprint (tuple): Versions of cmdsets of the caller's entities and
+            location, and the channel cmdsets. They are compared to find out
+            if the merged cmdset can be used again.
+
+    Notes:
+        Cmdset versions change in CmdSetHandler.update(), when locks or
+        permissions change and when objects move, see
+        `evennia.commands.cmdsethandler.invalidate_cmdsets`.
+
+    """
+    location = obj.location if obj else None
+    return (callertype,
+            get_cmdset_version(session) if session else None,
+            get_cmdset_version(account) if account else None,
+            get_cmdset_version(obj) if obj else None,
+            get_cmdset_version(location) if location else None,
+            CHANNELHANDLER.get_cmdset(account) if account else None,
+            CHANNELHANDLER.get_cmdset(obj) if obj else None)
+
+
 @inlineCallbacks
 def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string):
     """
@@ -278,8 +344,19 @@ def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string)
         Object's cmdset is merged last (and will thus take precedence
         over same-named and same-prio commands on Account and Session).
 
+        If `settings.CACHE_MERGED_CMDSETS` is set, the merged cmdset is kept
+        on the caller and is used again until the merge fingerprint changes.
+
     """
     try:
+        if _CACHE_MERGED_CMDSETS:
+            fingerprint = get_merge_fingerprint(session, account, obj, callertype)
+            cached = getattr(caller, "_merged_cmdset", None)
+            if cached and cached[0] == fingerprint:
+                CMDSET_MERGE_METRICS.hits += 1
+                returnValue(cached[1])
+        CMDSET_MERGE_METRICS.misses += 1
+
         @inlineCallbacks
         def _get_channel_cmdset(account_or_obj):
             """
@@ -457,6 +534,10 @@ def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string)
             cmdset = None
         for cset in (cset for cset in local_obj_cmdsets if cset):
             cset.duplicates = cset.old_duplicates
+        if _CACHE_MERGED_CMDSETS and cmdset:
+            # hooks may have changed cmdsets while gathering them
+            fingerprint = get_merge_fingerprint(session, account, obj, callertype)
+            caller._merged_cmdset = (fingerprint, cmdset)
         returnValue(cmdset)
     except ErrorReported:
         raise
@@ -654,8 +735,11 @@ def cmdhandler(called_by, raw_string, _testing=False, callertype="session", sess
 
             else:
                 # no explicit cmdobject given, figure it out
+                merge_begin = time.time()
                 cmdset = yield get_and_merge_cmdsets(caller, session, account, obj,
                                                      callertype, raw_string)
+                CMDSET_MERGE_METRICS.commands += 1
+                CMDSET_MERGE_METRICS.merge_time += time.time() - merge_begin
                 if not cmdset:
                     # this is bad and shouldn't happen.
                     raise NoCmdSets
@@ -66,6 +66,7 @@ the 'Fishing' set. Fishing from a boat? No problem!
 from builtins import object
 from future.utils import raise_
 import sys
+from itertools import count
 from traceback import format_exc
 from importlib import import_module
 from inspect import trace
@@ -75,7 +76,7 @@ from evennia.commands.cmdset import CmdSet
 from evennia.server.models import ServerConfig
 
 from django.utils.translation import ugettext as _
-__all__ = ("import_cmdset", "CmdSetHandler")
+__all__ = ("import_cmdset", "CmdSetHandler", "get_cmdset_version", "invalidate_cmdsets")
 
 _CACHED_CMDSETS = {}
 _CMDSET_PATHS = utils.make_iter(settings.CMDSET_PATHS)
@@ -115,6 +116,55 @@ _ERROR_CMDSET_NO_FALLBACK = _(
 )
 
 
+# every change of cmdsets gets a new version number, so numbers are never
+# reused by different entities or states
+_CMDSET_VERSIONS = count(1)
+
+
+def get_cmdset_version(obj):
+    """
+    Get the version of cmdsets seen from an entity. It changes when cmdsets,
+    locks or permissions of the entity or of its contents change, or when
+    objects move in or out of it.
+
+    Args:
+        obj (Session, Account or Object): The entity.
+
+    Returns:
+        version (int): The version number, unique to the entity and its state.
+
+    """
+    try:
+        return obj._cmdset_version
+    except AttributeError:
+        version = next(_CMDSET_VERSIONS)
+        obj._cmdset_version = version
+        return version
+
+
+def invalidate_cmdsets(obj, location=True):
+    """
+    Cmdsets of an entity or its contents changed. Change the versions of the
+    entity and its location, so merged cmdsets cached by the cmdhandler are
+    not used again.
+
+    Args:
+        obj (Session, Account or Object): The changed entity.
+        location (bool, optional): Also change the version of the entity's
+            location, since objects in a location see each other's cmdsets.
+
+    """
+    if obj is None:
+        return
+
+    obj._cmdset_version = next(_CMDSET_VERSIONS)
+
+    if location:
+        location = getattr(obj, "db_location", None)
+        if location is not None:
+            location._cmdset_version = next(_CMDSET_VERSIONS)
+
+
 class _ErrorCmdSet(CmdSet):
     """
     This is a special cmdset used to report errors.
@@ -395,6 +445,7 @@ class CmdSetHandler(object):
                 continue
             self.mergetype_stack.append(new_current.actual_mergetype)
         self.current = new_current
+        invalidate_cmdsets(self.obj)
 
     def add(self, cmdset, emit_to_obj=None, permanent=False, default_cmdset=False):
         """
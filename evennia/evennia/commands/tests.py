@@ -376,3 +376,80 @@ class TestGetAndMergeCmdSets(TwistedTestCase, EvenniaTest):
             self.assertEqual(len(cmdset.commands), 9)
         deferred.addCallback(_callback)
         return deferred
+
+
+from twisted.internet.defer import inlineCallbacks
+
+
+class TestMergedCmdSetCache(TwistedTestCase, EvenniaTest):
+    "Test the merged cmdsets cached on callers."
+
+    def setUp(self):
+        self.patch(sys.modules['evennia.server.sessionhandler'], 'delay', _mockdelay)
+        self.patch(cmdhandler, '_CACHE_MERGED_CMDSETS', True)
+        super(TestMergedCmdSetCache, self).setUp()
+        self.cmdset_a = _CmdSetA()
+        self.cmdset_b = _CmdSetB()
+        self.cmdset_a.no_channels = True
+        self.char1.cmdset.add(self.cmdset_a)
+
+    def merge(self):
+        return cmdhandler.get_and_merge_cmdsets(self.char1, None, None, self.char1, "object", "")
+
+    @inlineCallbacks
+    def assert_cached(self):
+        "The merged cmdset is used again."
+        cmdset = yield self.merge()
+        hits = cmdhandler.CMDSET_MERGE_METRICS.hits
+        cached = yield self.merge()
+        self.assertIs(cached, cmdset)
+        self.assertEqual(cmdhandler.CMDSET_MERGE_METRICS.hits, hits + 1)
+
+    @inlineCallbacks
+    def assert_invalidated(self, change):
+        "The cmdsets are merged again after the change."
+        cmdset = yield self.merge()
+        change()
+        misses = cmdhandler.CMDSET_MERGE_METRICS.misses
+        merged = yield self.merge()
+        self.assertIsNot(merged, cmdset)
+        self.assertEqual(cmdhandler.CMDSET_MERGE_METRICS.misses, misses + 1)
+
+    def test_hit(self):
+        return self.assert_cached()
+
+    @inlineCallbacks
+    def test_cmdset_add(self):
+        yield self.assert_invalidated(lambda: self.char1.cmdset.add(self.cmdset_b))
+        cmdset = yield self.merge()
+        self.assertTrue(all(cmd.from_cmdset == "B" for cmd in cmdset.commands
+                            if cmd.key in ("a", "b")))
+
+    @inlineCallbacks
+    def test_cmdset_delete(self):
+        self.char1.cmdset.add(self.cmdset_b)
+        yield self.assert_invalidated(lambda: self.char1.cmdset.delete("B"))
+        cmdset = yield self.merge()
+        self.assertTrue(all(cmd.from_cmdset == "A" for cmd in cmdset.commands
+                            if cmd.key in ("a", "b", "c", "d")))
+
+    def test_permission_change(self):
+        return self.assert_invalidated(lambda: self.char1.permissions.add("Builder"))
+
+    def test_lock_change(self):
+        # objects in the location are checked with their call locks
+        return self.assert_invalidated(lambda: self.obj1.locks.add("call:false()"))
+
+    def test_move_out(self):
+        return self.assert_invalidated(lambda: self.obj1.move_to(self.room2, quiet=True))
+
+    @inlineCallbacks
+    def test_move_in(self):
+        self.obj1.move_to(self.room2, quiet=True)
+        yield self.assert_invalidated(lambda: self.obj1.move_to(self.room1, quiet=True))
+        yield self.assert_cached()
+
+    @inlineCallbacks
+    def test_caller_moves(self):
+        yield self.assert_invalidated(lambda: self.char1.move_to(self.room2, quiet=True))
+        yield self.assert_cached()
@@ -115,6 +115,7 @@ __all__ = ("LockHandler", "LockException")
 
 WARNING_LOG = settings.LOCKWARNING_LOG_FILE
 _LOCK_HANDLER = None
+_INVALIDATE_CMDSETS = None
 
 
 
@@ -274,6 +275,12 @@ class LockHandler(object):
         """
         self.obj.lock_storage = ";".join([tup[2] for tup in self.locks.values()])
 
+        # call-locks decide which cmdsets are seen around the object
+        global _INVALIDATE_CMDSETS
+        if not _INVALIDATE_CMDSETS:
+            from evennia.commands.cmdsethandler import invalidate_cmdsets as _INVALIDATE_CMDSETS
+        _INVALIDATE_CMDSETS(self.obj)
+
     def cache_lock_bypass(self, obj):
         """
         We cache superuser bypass checks here for efficiency. This
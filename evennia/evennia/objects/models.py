@@ -26,6 +26,19 @@ from evennia.utils import logger
 from evennia.utils.utils import (make_iter, dbref, lazy_property)
 
 
+_INVALIDATE_CMDSETS = None
+
+
+def _invalidate_cmdsets(obj):
+    """
+    Objects moved in or out, cmdsets seen from the location changed.
+    """
+    global _INVALIDATE_CMDSETS
+    if not _INVALIDATE_CMDSETS:
+        from evennia.commands.cmdsethandler import invalidate_cmdsets as _INVALIDATE_CMDSETS
+    _INVALIDATE_CMDSETS(obj, location=False)
+
+
 class ContentsHandler(object):
     """
     Handles and caches the contents of an object to avoid excessive
@@ -54,6 +67,7 @@ class ContentsHandler(object):
 
         """
         self._pkcache.update(dict((obj.pk, None) for obj in ObjectDB.objects.filter(db_location=self.obj) if obj.pk))
+        _invalidate_cmdsets(self.obj)
 
     def get(self, exclude=None):
         """
@@ -92,6 +106,7 @@ class ContentsHandler(object):
 
         """
         self._pkcache[obj.pk] = None
+        _invalidate_cmdsets(self.obj)
 
     def remove(self, obj):
         """
@@ -102,6 +117,7 @@ class ContentsHandler(object):
 
         """
         self._pkcache.pop(obj.pk, None)
+        _invalidate_cmdsets(self.obj)
 
     def clear(self):
         """
@@ -5,8 +5,10 @@ Portal. This module sets up the Client-side communication.
 """
 
 import os
+import time
+from django.conf import settings
 from evennia.server.portal import amp
-from twisted.internet import protocol
+from twisted.internet import protocol, reactor
 from evennia.utils import logger
 
 
@@ -128,7 +130,10 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             (sessid, kwargs).
 
         """
-        return self.callRemote(command, packed_data=amp.dumps((sessid, kwargs))).addErrback(
+        begin = time.time()
+        packed_data = amp.dumps((sessid, kwargs))
+        amp.AMP_METRICS.encode_time += time.time() - begin
+        return self.callRemote(command, packed_data=packed_data).addErrback(
                 self.errback, command.key)
 
     def send_MsgServer2Portal(self, session, **kwargs):
@@ -140,9 +145,44 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             session (Session): Unique Session.
             kwargs (any, optiona): Extra data.
 
+        Notes:
+            If `settings.AMP_BATCH_SEND` is set, messages are buffered
+            and sent in one AMP box when the reactor is idle.
+
         """
+        amp.AMP_METRICS.messages += 1
+
+        if settings.AMP_BATCH_SEND:
+            self.send_buffer.append((session.sessid, kwargs))
+            if not self.send_task:
+                self.send_task = reactor.callLater(0, self.flush_MsgServer2Portal)
+            return None
+
+        amp.AMP_METRICS.frames += 1
         return self.data_to_portal(amp.MsgServer2Portal, session.sessid, **kwargs)
 
+    def flush_MsgServer2Portal(self):
+        """
+        Send all buffered messages to the Portal in one AMP box.
+
+        """
+        self.send_task = None
+        buffer = self.send_buffer
+        if not buffer:
+            return None
+        self.send_buffer = []
+
+        amp.AMP_METRICS.frames += 1
+        if len(buffer) == 1:
+            sessid, kwargs = buffer[0]
+            return self.data_to_portal(amp.MsgServer2Portal, sessid, **kwargs)
+
+        begin = time.time()
+        packed_data = amp.dumps(buffer)
+        amp.AMP_METRICS.encode_time += time.time() - begin
+        return self.callRemote(amp.MsgServer2PortalBatch, packed_data=packed_data).addErrback(
+                self.errback, amp.MsgServer2PortalBatch.key)
+
     def send_AdminServer2Portal(self, session, operation="", **kwargs):
         """
         Administrative access method called by the Server to send an
@@ -156,6 +196,8 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             kwargs (dict, optional): Data going into the adminstrative.
 
         """
+        # keep the order of messages, such as messages before disconnecting
+        self.flush_MsgServer2Portal()
         return self.data_to_portal(amp.AdminServer2Portal, session.sessid,
                                    operation=operation, **kwargs)
 
@@ -22,6 +22,7 @@ from evennia.utils.utils import to_str, variable_from_module
 
 # delayed import
 _LOGGER = None
+_SETTINGS = None
 
 # communication bits
 # (chr(9) and chr(10) are \t and \n, so skipping them)
@@ -73,6 +74,55 @@ Content-Type: text/html
 </html>""".strip()
 
 
+# compression markers of AMP strings
+UNCOMPRESSED = b'\x00'
+COMPRESSED = b'\x01'
+
+
+def _get_settings():
+    "Delayed import of settings, amp is imported by the launcher too."
+    global _SETTINGS
+    if not _SETTINGS:
+        from django.conf import settings as _SETTINGS
+    return _SETTINGS
+
+
+class AMPMetrics(object):
+    """
+    Counters of sent AMP messages.
+
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.messages = 0           # session messages sent
+        self.frames = 0             # AMP boxes carrying session messages
+        self.bytes_raw = 0          # bytes before compression
+        self.bytes_sent = 0         # bytes after compression
+        self.compressed = 0         # compressed strings
+        self.encode_time = 0.0      # seconds spent pickling and compressing
+
+    def stats(self):
+        """
+        Get metrics.
+
+        Returns:
+            stats (dict): Metrics.
+
+        """
+        return {"messages": self.messages,
+                "frames": self.frames,
+                "messages_per_frame": float(self.messages) / self.frames if self.frames else 0,
+                "bytes_raw": self.bytes_raw,
+                "bytes_sent": self.bytes_sent,
+                "compressed": self.compressed,
+                "encode_time": self.encode_time}
+
+
+AMP_METRICS = AMPMetrics()
+
+
 # Helper functions for pickling.
 
 def dumps(data):
@@ -142,15 +192,39 @@ class Compressed(amp.String):
 
     def toString(self, inObject):
         """
-        Convert to send as a string on the wire, with compression.
+        Convert to send as a string on the wire, with compression. Short
+        strings are not compressed. The first byte marks if the string
+        is compressed.
         """
-        return zlib.compress(super(Compressed, self).toString(inObject), 9)
+        begin = time.time()
+        string = super(Compressed, self).toString(inObject)
+        settings = _get_settings()
+        if len(string) < settings.AMP_COMPRESS_THRESHOLD:
+            result = UNCOMPRESSED + string
+        else:
+            result = COMPRESSED + zlib.compress(string, settings.AMP_COMPRESS_LEVEL)
+            AMP_METRICS.compressed += 1
+
+        AMP_METRICS.bytes_raw += len(string)
+        AMP_METRICS.bytes_sent += len(result)
+        AMP_METRICS.encode_time += time.time() - begin
+        return result
 
     def fromString(self, inString):
         """
         Convert (decompress) from the string-representation on the wire to Python.
+        Strings without markers are sent by older versions, they are always
+        compressed.
         """
-        return super(Compressed, self).fromString(zlib.decompress(inString))
+        marker = inString[:1]
+        if marker == COMPRESSED:
+            inString = zlib.decompress(inString[1:])
+        elif marker == UNCOMPRESSED:
+            inString = inString[1:]
+        else:
+            # a legacy zlib stream
+            inString = zlib.decompress(inString)
+        return super(Compressed, self).fromString(inString)
 
 
 class MsgLauncher2Portal(amp.Command):
@@ -187,6 +261,19 @@ class MsgServer2Portal(amp.Command):
     response = []
 
 
+class MsgServer2PortalBatch(amp.Command):
+    """
+    Messages Server -> Portal
+
+    Carries messages to many sessions produced in the same reactor tick.
+
+    """
+    key = "MsgServer2PortalBatch"
+    arguments = [('packed_data', Compressed())]
+    errors = {Exception: 'EXCEPTION'}
+    response = []
+
+
 class AdminPortal2Server(amp.Command):
     """
     Administration Portal -> Server
@@ -268,6 +355,7 @@ class AMPMultiConnectionProtocol(amp.AMP):
         self.send_reset_time = time.time()
         self.send_mode = True
         self.send_task = None
+        self.send_buffer = []
         self.multibatches = 0
 
     def dataReceived(self, data):
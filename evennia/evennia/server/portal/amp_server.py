@@ -365,6 +365,33 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             logger.log_trace("packed_data len {}".format(len(packed_data)))
         return {}
 
+    @amp.MsgServer2PortalBatch.responder
+    @amp.catch_traceback
+    def portal_receive_server2portal_batch(self, packed_data):
+        """
+        Receives messages to many sessions arriving to Portal from Server.
+        This method is executed on the Portal.
+
+        Args:
+            packed_data (str): Pickled list of (sessid, kwargs) coming over the wire.
+
+        """
+        try:
+            messages = self.data_in(packed_data)
+        except Exception:
+            logger.log_trace("packed_data len {}".format(len(packed_data)))
+            return {}
+
+        sessions = self.factory.portal.sessions
+        for sessid, kwargs in messages:
+            try:
+                session = sessions.get(sessid, None)
+                if session:
+                    sessions.data_out(session, **kwargs)
+            except Exception:
+                logger.log_trace("batch message to session {}".format(sessid))
+        return {}
+
     @amp.AdminServer2Portal.responder
     @amp.catch_traceback
     def portal_receive_adminserver2portal(self, packed_data):
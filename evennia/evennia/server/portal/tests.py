@@ -73,3 +73,58 @@ class TestIRC(TestCase):
         s = r'|wthis|Xis|gis|Ma|C|complex|*string'
 
         self.assertEqual(irc.parse_irc_to_ansi(irc.parse_ansi_to_irc(s)), s)
+
+
+import zlib
+from mock import Mock
+from django.test import override_settings
+from evennia.server.portal import amp, amp_server
+
+
+@override_settings(AMP_COMPRESS_THRESHOLD=512, AMP_COMPRESS_LEVEL=1)
+class TestAMPCompressed(TestCase):
+    "Test the wire format of compressed AMP arguments."
+    def setUp(self):
+        self.argument = amp.Compressed()
+
+    def test_uncompressed(self):
+        data = "a" * 511
+        string = self.argument.toString(data)
+        self.assertEqual(string, amp.UNCOMPRESSED + data)
+        self.assertEqual(self.argument.fromString(string), data)
+
+    def test_compressed(self):
+        data = "a" * 512
+        string = self.argument.toString(data)
+        self.assertEqual(string[:1], amp.COMPRESSED)
+        self.assertTrue(len(string) < len(data))
+        self.assertEqual(self.argument.fromString(string), data)
+
+    def test_legacy(self):
+        # older versions send zlib streams without markers
+        data = "a" * 10
+        self.assertEqual(self.argument.fromString(zlib.compress(data)), data)
+
+
+class TestAMPBatch(TestCase):
+    "Test receiving batches of messages on the portal."
+    def setUp(self):
+        self.sessions = {1: Mock(), 2: Mock(), 3: Mock()}
+        self.portal = Mock()
+        self.portal.sessions.get = self.sessions.get
+        self.protocol = amp_server.AMPServerProtocol()
+        self.protocol.factory = Mock()
+        self.protocol.factory.portal = self.portal
+
+    def test_batch(self):
+        def data_out(session, **kwargs):
+            if session is self.sessions[2]:
+                raise Exception("data_out failed")
+        self.portal.sessions.data_out = Mock(side_effect=data_out)
+        packed_data = amp.dumps([(1, {"text": "one"}), (2, {"text": "two"}), (3, {"text": "three"})])
+
+        self.protocol.portal_receive_server2portal_batch(packed_data)
+
+        self.portal.sessions.data_out.assert_any_call(self.sessions[1], text="one")
+        self.portal.sessions.data_out.assert_any_call(self.sessions[3], text="three")
+        self.assertEqual(self.portal.sessions.data_out.call_count, 3)
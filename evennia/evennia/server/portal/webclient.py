@@ -209,6 +209,14 @@ class WebSocketClient(Protocol, Session):
         text = to_str(text, force_string=True)
 
         options = kwargs.pop("options", {})
+        if options.get("raw") and options.get("json") and not options.get("send_prompt") and \
+                not options.get("screenreader", flags.get("SCREENREADER", False)):
+            # The text is a JSON document, put it in the frame without encoding
+            # it again. The client gets the decoded value instead of a string.
+            kwargs["json"] = True
+            self.sendLine('["text", [%s], %s]' % (text, json.dumps(kwargs)))
+            return
+
         raw = options.get("raw", flags.get("RAW", False))
         nocolor = options.get("nocolor", flags.get("NOCOLOR", False))
         screenreader = options.get("screenreader", flags.get("SCREENREADER", False))
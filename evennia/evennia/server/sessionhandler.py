@@ -191,6 +191,8 @@ class SessionHandler(dict):
         options = kwargs.pop("options", None) or {}
         raw = options.get("raw", False)
         strip_inlinefunc = options.get("strip_inlinefunc", False)
+        # the text is an encoded JSON document which is an ascii string
+        pre_encoded = raw and options.get("json", False)
 
         def _validate(data):
             "Helper function to convert data to AMP-safe (picketable) values"
@@ -234,6 +236,9 @@ class SessionHandler(dict):
                     # that the text command is not to be used.
                     continue
                 rkwargs[key] = [[], {}]
+            elif pre_encoded and key == "text" and isinstance(data, str):
+                # no need to validate pre-encoded texts
+                rkwargs[key] = [[data], {}]
             elif isinstance(data, dict):
                 rkwargs[key] = [[], _validate(data)]
             elif hasattr(data, "__iter__"):
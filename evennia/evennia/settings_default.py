@@ -109,6 +109,16 @@ EVENNIA_ADMIN = True
 AMP_HOST = 'localhost'
 AMP_PORT = 4006
 AMP_INTERFACE = '127.0.0.1'
+# AMP messages shorter than this (in bytes) are not compressed. Longer
+# messages are compressed with zlib at AMP_COMPRESS_LEVEL (1 is the fastest,
+# 9 the smallest). Messages start with a compression marker, which older
+# versions can not read, so after upgrading do a full `evennia reboot`;
+# `evennia reload` does not restart the Portal.
+AMP_COMPRESS_THRESHOLD = 512
+AMP_COMPRESS_LEVEL = 1
+# If True, messages the Server sends to sessions in the same reactor tick
+# are sent to the Portal in one AMP box.
+AMP_BATCH_SEND = False
 
 
 # Path to the lib directory containing the bulk of the codebase's code.
@@ -279,6 +289,12 @@ ATTRIBUTE_STORED_MODEL_RENAME = [
 # The command parser module to use. See the default module for which
 # functions it must implement
 COMMAND_PARSER = "evennia.commands.cmdparser.cmdparser"
+# Keep the merged cmdset on the caller and use it again until the caller's
+# cmdsets, permissions, location or the cmdsets and locks of objects around
+# it change. When it is used, at_cmdset_get() hooks are only called when
+# cmdsets are merged again, and call-locks of nearby objects should only
+# depend on the caller's permissions (not on e.g. what it is carrying).
+CACHE_MERGED_CMDSETS = False
 # On a multi-match when search objects or commands, the user has the
 # ability to search again with an index marker that differentiates
 # the results. If multiple "box" objects
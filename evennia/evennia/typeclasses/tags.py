@@ -18,6 +18,7 @@ from evennia.utils.utils import to_str, make_iter
 
 
 _TYPECLASS_AGGRESSIVE_CACHE = settings.TYPECLASS_AGGRESSIVE_CACHE
+_INVALIDATE_CMDSETS = None
 
 #------------------------------------------------------------
 #
@@ -419,3 +420,24 @@ class PermissionHandler(TagHandler):
 
     """
     _tagtype = "permission"
+
+    def _invalidate_cmdsets(self):
+        """
+        Permissions decide which cmdsets pass call-locks.
+        """
+        global _INVALIDATE_CMDSETS
+        if not _INVALIDATE_CMDSETS:
+            from evennia.commands.cmdsethandler import invalidate_cmdsets as _INVALIDATE_CMDSETS
+        _INVALIDATE_CMDSETS(self.obj, location=False)
+
+    def _setcache(self, key, category, tag_obj):
+        super(PermissionHandler, self)._setcache(key, category, tag_obj)
+        self._invalidate_cmdsets()
+
+    def _delcache(self, key, category):
+        super(PermissionHandler, self)._delcache(key, category)
+        self._invalidate_cmdsets()
+
+    def clear(self, category=None):
+        super(PermissionHandler, self).clear(category=category)
+        self._invalidate_cmdsets()
@@ -0,0 +1,8 @@
+"""
+Benchmarks of Muddery's hot paths.
+
+Benchmarks must run in a game directory, for example:
+
+    cd mygame
+    python -m muddery.benchmarks.statements
+"""
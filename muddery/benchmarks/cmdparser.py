@@ -0,0 +1,88 @@
+"""
+Compare commands per second parsed by the old and the new command parsers,
+with Muddery's default cmdsets merged as the cmdhandler does for a puppeted
+character.
+
+The old parser decodes every input as JSON and scans the merged cmdset, text
+inputs fall back to Evennia's parser after an exception. The new parser
+detects JSON by the first character and finds commands in an index cached in
+the merged cmdset.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.cmdparser
+"""
+
+from __future__ import print_function
+
+import json
+from muddery.benchmarks.utils import init_game_dir, timeit, report, report_header
+
+
+def old_cmdparser(raw_string, cmdset, caller, match_index=None):
+    """
+    The command parser before optimization.
+    """
+    import evennia.commands.cmdparser as evennia_cmdparser
+    from muddery.server.conf.cmdparser import CMD_LOGINSTART
+
+    try:
+        if raw_string == CMD_LOGINSTART:
+            cmd = CMD_LOGINSTART
+            args = ""
+        else:
+            data = json.loads(raw_string)
+            cmd = data["cmd"]
+            args = data["args"]
+
+        for cmdobj in cmdset:
+            if cmdobj.key == cmd:
+                return [(cmd, args, cmdobj, len(cmd), 1, raw_string)]
+
+        return []
+    except Exception:
+        return evennia_cmdparser.cmdparser(raw_string, cmdset, caller, match_index)
+
+
+def get_merged_cmdset():
+    """
+    Merge the default session, account and character cmdsets.
+    """
+    from muddery.commands.default_cmdsets import SessionCmdSet, AccountCmdSet, CharacterCmdSet
+
+    cmdset = SessionCmdSet()
+    for cmdset_class in (AccountCmdSet, CharacterCmdSet):
+        cmdset = cmdset_class() + cmdset
+    return cmdset
+
+
+def run(number=20000):
+    """
+    Run the benchmark.
+
+    Args:
+        number: (int) number of commands.
+    """
+    from muddery.server.conf.cmdparser import cmdparser
+
+    cmdset = get_merged_cmdset()
+    inputs = (("look", json.dumps({"cmd": "look", "args": ""})),
+              ("goto", json.dumps({"cmd": "goto", "args": "#10"})),
+              ("castskill", json.dumps({"cmd": "castskill",
+                                        "args": {"skill": "skill_normal_hit", "target": "#21"}})),
+              ("unknown command", json.dumps({"cmd": "no_such_command", "args": ""})),
+              ("text input", "say hello"))
+
+    report_header()
+    for name, raw_string in inputs:
+        before = timeit(lambda: old_cmdparser(raw_string, cmdset, None), number)
+        after = timeit(lambda: cmdparser(raw_string, cmdset, None), number)
+        report(name, before, after)
+        print("%-48s %12d/s %12d/s" % ("commands: %s" % name,
+                                       1 / before if before else 0,
+                                       1 / after if after else 0))
+
+
+if __name__ == "__main__":
+    init_game_dir(check_db=False)
+    run()
@@ -0,0 +1,95 @@
+"""
+Compare time spent in gathering and merging cmdsets per command with and
+without caching merged cmdsets on callers, using the first player character
+in the game's database.
+
+In the first round the character's cmdsets are merged on every command. In
+the second round merged cmdsets are cached, a combat cmdset is added and
+removed every 100 commands to show the cost of invalidations.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.cmdset_merge
+"""
+
+from __future__ import print_function
+
+from muddery.benchmarks.utils import init_game_dir, report, report_header
+
+
+def merge(character, number, combat_interval=0):
+    """
+    Merge the character's cmdsets as the cmdhandler does.
+
+    Args:
+        character: (object) the character.
+        number: (int) number of commands.
+        combat_interval: (int) add or remove the combat cmdset every this
+                         number of commands, 0 means never.
+
+    Returns:
+        (dict) metrics of cmdset merging.
+    """
+    import time
+    from django.conf import settings
+    from evennia.commands import cmdhandler
+
+    metrics = cmdhandler.CMDSET_MERGE_METRICS
+    metrics.reset()
+
+    in_combat = False
+    for i in xrange(number):
+        if combat_interval and i and i % combat_interval == 0:
+            if in_combat:
+                character.cmdset.delete(settings.CMDSET_COMBAT)
+            else:
+                character.cmdset.add(settings.CMDSET_COMBAT)
+            in_combat = not in_combat
+
+        begin = time.time()
+        cmdhandler.get_and_merge_cmdsets(character, None, None, character, "object", "")
+        metrics.commands += 1
+        metrics.merge_time += time.time() - begin
+
+    if in_combat:
+        character.cmdset.delete(settings.CMDSET_COMBAT)
+
+    return metrics.stats()
+
+
+def run(number=5000):
+    """
+    Run the benchmark.
+
+    Args:
+        number: (int) number of commands.
+    """
+    from django.conf import settings
+    from evennia.objects.models import ObjectDB
+    from evennia.commands import cmdhandler
+
+    character = ObjectDB.objects.filter(db_typeclass_path=settings.BASE_PLAYER_CHARACTER_TYPECLASS).first()
+    if not character:
+        print("No player characters in the database.")
+        return
+
+    cache_setting = cmdhandler._CACHE_MERGED_CMDSETS
+    try:
+        cmdhandler._CACHE_MERGED_CMDSETS = False
+        before = merge(character, number)
+
+        cmdhandler._CACHE_MERGED_CMDSETS = True
+        after = merge(character, number, combat_interval=100)
+    finally:
+        cmdhandler._CACHE_MERGED_CMDSETS = cache_setting
+
+    report_header()
+    report("merge cmdsets of %s" % character.key,
+           before["merge_time_per_command"],
+           after["merge_time_per_command"])
+    print("Cached merges: %d hits, %d misses." % (after["hits"], after["misses"]))
+
+
+if __name__ == "__main__":
+    init_game_dir()
+    run()
@@ -0,0 +1,103 @@
+"""
+Compare the old row by row importer with the batched importer, using a
+synthetic object_properties data file. Imported data are rolled back.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.importer
+"""
+
+from __future__ import print_function
+
+import os, csv, tempfile
+from muddery.benchmarks.utils import init_game_dir, timeit, report, report_header
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back imported data.
+    """
+    pass
+
+
+def write_data_file(filename, rows):
+    """
+    Write a synthetic object_properties data file.
+
+    Args:
+        filename: (string) file's name.
+        rows: (int) number of records.
+    """
+    with open(filename, "wb") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["object", "level", "property", "value"])
+        for i in xrange(rows):
+            writer.writerow(["object_%d" % (i // 100), i % 100 // 10 + 1, "property_%d" % (i % 10), i])
+
+
+def legacy_import_file(model, filename):
+    """
+    The old way to import a data file: validate and save records one by one.
+    """
+    from muddery.utils.readers import CSVReader
+
+    model.objects.all().delete()
+
+    reader = CSVReader(filename)
+    titles = reader.readln()
+    for values in reader:
+        record = dict(zip(titles, values))
+        record["level"] = int(record["level"])
+        data = model(**record)
+        data.full_clean()
+        data.save()
+
+
+def run_rollback(model, func):
+    """
+    Call the function in a transaction and roll it back.
+    """
+    from django.db import router, transaction
+
+    try:
+        with transaction.atomic(using=router.db_for_write(model)):
+            func()
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def run(rows=100000, legacy=True):
+    """
+    Run the benchmark.
+
+    Args:
+        rows: (int) number of records.
+        legacy: (boolean) also run the old importer, it is very slow.
+    """
+    from django.apps import apps
+    from django.conf import settings
+    from muddery.worlddata.dao.data_importer import import_file
+
+    model = apps.get_model(settings.WORLD_DATA_APP, "object_properties")
+
+    fd, filename = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_data_file(filename, rows)
+
+        before = 0
+        if legacy:
+            before = timeit(lambda: run_rollback(model, lambda: legacy_import_file(model, filename)), 1)
+
+        after = timeit(lambda: run_rollback(model, lambda: import_file(filename, table_name="object_properties")), 1)
+
+        report_header()
+        report("import %d object_properties" % rows, before, after)
+    finally:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    init_game_dir()
+    run()
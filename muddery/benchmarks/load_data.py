@@ -0,0 +1,111 @@
+"""
+Compare world data queries in objects' load_data() with database queries and
+with the in-memory world data snapshot, using the current game's world data.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.load_data
+"""
+
+from __future__ import print_function
+
+import itertools
+from muddery.benchmarks.utils import init_game_dir, timeit, report, report_header
+
+
+class SystemData(object):
+    """
+    Receives objects' system data.
+    """
+    pass
+
+
+def get_object_models(snapshot):
+    """
+    Get all object keys and their data tables.
+
+    Returns:
+        (list) [(key, [table names])]
+    """
+    tables = [name for name, table in snapshot.tables.items()
+              if name != "objects" and table.key_index is not None]
+
+    objects = []
+    for record in snapshot.all("objects"):
+        models = ["objects"] + [name for name in tables if record.key in snapshot.tables[name].key_index]
+        objects.append((record.key, models))
+    return objects
+
+
+def load_from_database(apps, app_label, key, models):
+    """
+    The old way to query an object's data.
+    """
+    system = SystemData()
+    for data_model in models:
+        data = apps.get_model(app_label, data_model).objects.get(key=key)
+        for field in data._meta.fields:
+            setattr(system, field.name, data.serializable_value(field.name))
+
+    model = apps.get_model(app_label, "object_properties")
+    properties = list(model.objects.filter(object=key, level=1))
+
+    model = apps.get_model(app_label, "event_data")
+    events = list(model.objects.filter(trigger_obj=key))
+    return system, properties, events
+
+
+def load_from_snapshot(snapshot, key, models):
+    """
+    Query an object's data from the snapshot.
+    """
+    system = SystemData()
+    for data_model in models:
+        data = snapshot.get(data_model, key=key)
+        for field in data._meta.fields:
+            setattr(system, field.name, data.serializable_value(field.name))
+
+    properties = list(snapshot.filter("object_properties", object=key, level=1))
+    events = list(snapshot.filter("event_data", trigger_obj=key))
+    return system, properties, events
+
+
+def run(number=3000):
+    """
+    Run the benchmark.
+
+    Args:
+        number: (int) number of objects to load, object keys are reused if
+                there are not enough objects.
+    """
+    from django.apps import apps
+    from django.conf import settings
+    from muddery.worlddata.dao.world_data_snapshot import WorldDataSnapshot
+
+    snapshot = WorldDataSnapshot()
+    reload_time = timeit(snapshot.reload, 1)
+
+    objects = get_object_models(snapshot)
+    if not objects:
+        print("No objects in world data.")
+        return
+
+    objects = list(itertools.islice(itertools.cycle(objects), number))
+    app_label = settings.WORLD_DATA_APP
+
+    def before():
+        for key, models in objects:
+            load_from_database(apps, app_label, key, models)
+
+    def after():
+        for key, models in objects:
+            load_from_snapshot(snapshot, key, models)
+
+    report_header()
+    report("load %d objects' data" % len(objects), timeit(before, 1), timeit(after, 1))
+    print("Loaded the snapshot in %.2fms." % (reload_time * 1e3))
+
+
+if __name__ == "__main__":
+    init_game_dir()
+    run()
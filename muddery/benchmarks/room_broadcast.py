@@ -0,0 +1,118 @@
+"""
+Compare sending room messages to all contents with sending them to the room's
+listeners, when N players move through a single room.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.room_broadcast
+"""
+
+from __future__ import print_function
+
+import json
+from muddery.benchmarks.utils import init_game_dir, timeit, report, report_header
+
+
+class Session(object):
+    """
+    A fake session.
+    """
+    def __init__(self):
+        self.frames = 0
+
+    def data_out(self, text=None, **kwargs):
+        self.frames += 1
+
+
+class Sessions(object):
+    """
+    A fake session handler.
+    """
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    def all(self):
+        return list(self.sessions)
+
+    def count(self):
+        return len(self.sessions)
+
+
+class Object(object):
+    """
+    A fake object.
+    """
+    def __init__(self, id, location, online):
+        self.id = id
+        self.pk = id
+        self.db_location_id = location.id
+        self.sessions = Sessions([Session()] if online else [])
+
+    def at_msg_receive(self, text=None, **kwargs):
+        return True
+
+    def msg(self, text=None, **kwargs):
+        """
+        Works like MudderyBaseObject.msg().
+        """
+        if not self.at_msg_receive(text=text, **kwargs):
+            return
+
+        for session in self.sessions.all():
+            session.data_out(text=text, **kwargs)
+
+
+class Room(object):
+    """
+    A fake room.
+    """
+    id = 1
+
+    def __init__(self):
+        self.contents = []
+
+    def msg_contents(self, message, exclude=None):
+        """
+        The old way to send messages to a room.
+        """
+        text = json.dumps(message)
+        contents = [obj for obj in self.contents if obj not in exclude]
+        for obj in contents:
+            obj.msg(text=text, options={"raw": True})
+
+
+def run(players=200, others=100):
+    """
+    Run the benchmark.
+
+    Args:
+        players: (int) number of players in the room.
+        others: (int) number of other objects in the room, such as NPCs,
+                things and exits.
+    """
+    from muddery.utils.listener_handler import ListenerHandler
+
+    room = Room()
+    room.contents = [Object(i + 2, room, i < players) for i in xrange(players + others)]
+    listeners = ListenerHandler(room)
+    movers = room.contents[:players]
+
+    def before():
+        for obj in movers:
+            change = {"players": [{"dbref": "#%d" % obj.id, "name": "player"}]}
+            room.msg_contents({"obj_moved_out": change}, exclude=[obj])
+            room.msg_contents({"obj_moved_in": change}, exclude=[obj])
+
+    def after():
+        for obj in movers:
+            change = {"players": [{"dbref": "#%d" % obj.id, "name": "player"}]}
+            listeners.broadcast({"obj_moved_out": change}, exclude=obj)
+            listeners.broadcast({"obj_moved_in": change}, exclude=obj)
+
+    report_header()
+    report("%d players move out and in" % players, timeit(before, 3), timeit(after, 3))
+
+
+if __name__ == "__main__":
+    init_game_dir()
+    run()
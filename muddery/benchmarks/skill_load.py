@@ -0,0 +1,120 @@
+"""
+Compare the time to load a character's skills from skill objects and from a
+packed skill record, using skills in the current game's world data.
+
+Skill objects are created in a transaction and rolled back. To load them, the
+object cache is flushed and every skill object is loaded from the database,
+as it happens when a character's skills attribute is read at login.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.skill_load
+"""
+
+from __future__ import print_function
+
+import itertools
+from muddery.benchmarks.utils import init_game_dir, timeit, report, report_header
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back created objects.
+    """
+    pass
+
+
+class Attributes(object):
+    """
+    A fake attribute handler.
+    """
+    def __init__(self, record):
+        self.record = record
+
+    def get(self, key):
+        return self.record
+
+
+class Owner(object):
+    """
+    A fake character with a skill record.
+    """
+    def __init__(self, record):
+        self.attributes = Attributes(record)
+
+
+def load_skill_objects(ids):
+    """
+    The old way to load a character's skills.
+    """
+    from evennia.objects.models import ObjectDB
+    from evennia.utils.idmapper.models import flush_cache
+
+    flush_cache()
+    skills = {}
+    for skill_id in ids:
+        skill = ObjectDB.objects.get(id=skill_id)
+        skills[skill.get_data_key()] = (skill, skill.db.cd_finish_time, skill.db.is_default)
+    return skills
+
+
+def load_skill_record(record):
+    """
+    Load a character's skills from the record.
+    """
+    from muddery.utils.skill_handler import SkillHandler
+
+    owner = Owner(record)
+    handler = SkillHandler(owner)
+    return handler.all()
+
+
+def run(skills_number=20, characters=50):
+    """
+    Run the benchmark.
+
+    Args:
+        skills_number: (int) number of skills of each character, skill keys
+                       are reused if there are not enough skills.
+        characters: (int) number of characters to load.
+    """
+    from django.db import router, transaction
+    from evennia.objects.models import ObjectDB
+    from muddery.utils.builder import build_object
+    from muddery.utils.skill_handler import SKILL_DATA, pack_skills
+    from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
+
+    WORLD_DATA.reload()
+    SKILL_DATA.reload()
+
+    keys = [record.key for record in WORLD_DATA.all("skills")]
+    if not keys:
+        print("No skills in world data.")
+        return
+
+    keys = list(itertools.islice(itertools.cycle(keys), skills_number))
+    record = pack_skills((key, False, 0) for key in keys)
+
+    results = {}
+
+    def before():
+        ids = [build_object(key).id for key in keys]
+        results["before"] = timeit(lambda: load_skill_objects(ids), characters)
+        raise Rollback
+
+    try:
+        with transaction.atomic(using=router.db_for_write(ObjectDB)):
+            before()
+    except Rollback:
+        pass
+
+    after = timeit(lambda: load_skill_record(record), characters)
+
+    report_header()
+    report("load %d skills of a character" % len(keys), results["before"], after)
+    print("Skill record: %d bytes." % len(record))
+
+
+if __name__ == "__main__":
+    init_game_dir()
+    run()
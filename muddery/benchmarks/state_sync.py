@@ -0,0 +1,105 @@
+"""
+Compare bytes sent to the client per combat round with full snapshots and with
+state deltas, using synthetic character data.
+
+In every round the character's hp and mp change. At the end of each combat the
+character gets one new object and its exp changes.
+
+Usage:
+
+    python -m muddery.benchmarks.state_sync
+"""
+
+from __future__ import print_function
+
+import json
+from muddery.utils.state_sync_handler import StateSyncHandler
+
+
+class Session(object):
+    """
+    A fake session.
+    """
+    sessid = 1
+
+
+class Sessions(object):
+    """
+    A fake session handler.
+    """
+    def all(self):
+        return [Session()]
+
+
+class Owner(object):
+    """
+    A fake character which counts bytes of messages.
+    """
+    def __init__(self):
+        self.sessions = Sessions()
+        self.bytes = 0
+
+    def msg(self, text=None, session=None):
+        self.bytes += len(json.dumps(text))
+
+
+def get_status(properties, round):
+    """
+    Get a character's status.
+    """
+    status = {"level": {"name": "LEVEL", "value": 10}}
+    for i in xrange(properties):
+        status["property_%d" % i] = {"name": "Property %d" % i, "value": i}
+    status["hp"] = {"name": "HP", "value": 1000 - round}
+    status["mp"] = {"name": "MP", "value": 500 - round}
+    status["exp"] = {"name": "EXP", "value": round // 10}
+    return status
+
+
+def get_inventory(items):
+    """
+    Get a character's inventory.
+    """
+    return [{"dbref": "#%d" % (1000 + i),
+             "name": "Object %d" % i,
+             "number": 1,
+             "desc": "This is the description of object %d." % i,
+             "icon": "icon_%d" % i} for i in xrange(items)]
+
+
+def run(rounds=100, rounds_per_combat=10, properties=20, items=40):
+    """
+    Run the benchmark.
+
+    Args:
+        rounds: (int) number of combat rounds.
+        rounds_per_combat: (int) number of rounds in a combat.
+        properties: (int) number of the character's properties.
+        items: (int) number of objects in the inventory.
+    """
+    full = Owner()
+    delta = Owner()
+    handler = StateSyncHandler(delta)
+
+    # send full data when puppeted
+    handler.send({"status": get_status(properties, 0), "inventory": get_inventory(items)})
+    delta.bytes = 0
+
+    for round in xrange(1, rounds + 1):
+        states = {"status": get_status(properties, round)}
+        if round % rounds_per_combat == 0:
+            items += 1
+            states["inventory"] = get_inventory(items)
+
+        full.msg(states)
+        handler.send(states)
+
+    print("%-48s %14s %14s %9s" % ("benchmark", "before", "after", "ratio"))
+    print("%-48s %12.1fB %12.1fB %8.1fx" % ("bytes per combat round",
+                                           float(full.bytes) / rounds,
+                                           float(delta.bytes) / rounds,
+                                           float(full.bytes) / delta.bytes if delta.bytes else 0))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,171 @@
+"""
+Compare the old regex-substitute-then-eval statement evaluation with compiled
+statements, using statements shipped in the example_cn template.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.statements
+"""
+
+from __future__ import print_function
+
+import os, re, ast, glob
+from muddery.benchmarks.utils import init_game_dir, timeit, report, report_header
+from muddery.server.launcher import configs
+
+
+# columns which contain statements
+CONDITION_COLUMNS = ("condition", "unlock_condition", "loot_condition")
+SKILL_COLUMNS = ("function",)
+
+
+re_function = re.compile(r'[a-zA-Z_][a-zA-Z0-9_\.]*\(.*?\)')
+def legacy_exec_function(func_set, func_word, caller, obj, **kwargs):
+    """
+    The old way to call a statement function.
+    """
+    try:
+        pos = func_word.index("(")
+        func_key = func_word[:pos]
+        func_args = ast.literal_eval(func_word[pos:])
+        if type(func_args) != tuple:
+            func_args = (func_args,)
+    except ValueError:
+        func_key = func_word
+        func_args = ()
+
+    func_class = func_set.get_func_class(func_key)
+    if not func_class:
+        return
+
+    func_obj = func_class()
+    func_obj.set(caller, obj, func_args, **kwargs)
+    return func_obj.func()
+
+
+def legacy_match_condition(func_set, condition, caller, obj, **kwargs):
+    """
+    The old way to match a condition.
+    """
+    def function(word):
+        if legacy_exec_function(func_set, word.group(), caller, obj, **kwargs):
+            return "True"
+        else:
+            return "False"
+
+    return eval(re_function.sub(function, condition))
+
+
+def legacy_do_skill(func_set, action, caller, obj, **kwargs):
+    """
+    The old way to do a skill.
+    """
+    results = []
+    for function in action.split(";"):
+        result = legacy_exec_function(func_set, function, caller, obj, **kwargs)
+        if result:
+            results.append(result)
+    return results
+
+
+class QuestState(object):
+    """
+    Quest states of the benchmark's caller.
+    """
+    def is_in_progress(self, quest_key):
+        return False
+
+    def can_provide(self, quest_key):
+        return True
+
+    def is_finished(self, quest_key):
+        return True
+
+
+class Caller(object):
+    """
+    The benchmark's caller. Skills change its properties.
+    """
+    def __init__(self):
+        self.quest_handler = QuestState()
+        self.contents = []
+        self.ndb = self
+        self.combat_handler = None
+
+    def get_name(self):
+        return "caller"
+
+    def change_properties(self, increments):
+        return dict(increments)
+
+
+def load_statements(data_path):
+    """
+    Load all statements in data files.
+
+    Returns:
+        (conditions, skills): statement lists
+    """
+    from muddery.utils.readers import CSVReader
+
+    conditions = set()
+    skills = set()
+    for filename in glob.glob(os.path.join(data_path, "*.csv")):
+        reader = CSVReader(filename)
+        try:
+            titles = reader.readln()
+        except StopIteration:
+            continue
+
+        for line in reader:
+            for title, value in zip(titles, line):
+                if not value:
+                    continue
+                if title in CONDITION_COLUMNS:
+                    conditions.add(value)
+                elif title in SKILL_COLUMNS:
+                    skills.add(value)
+
+    return sorted(conditions), sorted(skills)
+
+
+def run(number=10000):
+    """
+    Run the benchmark.
+    """
+    from muddery.statements.default_statement_func_set import ConditionFuncSet, SkillFuncSet
+    from muddery.statements.statement_compiler import StatementCompiler
+
+    data_path = os.path.join(configs.MUDDERY_TEMPLATE, "example_cn", "worlddata", "data")
+    conditions, skills = load_statements(data_path)
+
+    condition_func_set = ConditionFuncSet()
+    skill_func_set = SkillFuncSet()
+    condition_compiler = StatementCompiler(condition_func_set)
+    skill_compiler = StatementCompiler(skill_func_set)
+    caller = Caller()
+    target = Caller()
+
+    report_header()
+    total_before = 0
+    total_after = 0
+    for condition in conditions:
+        before = timeit(lambda: legacy_match_condition(condition_func_set, condition, caller, target), number)
+        after = timeit(lambda: condition_compiler.compile_condition(condition).evaluate(caller, target), number)
+        report(condition, before, after)
+        total_before += before
+        total_after += after
+
+    for skill in skills:
+        before = timeit(lambda: legacy_do_skill(skill_func_set, skill, caller, target), number)
+        after = timeit(lambda: skill_compiler.compile_actions(skill).execute(caller, target), number)
+        report(skill, before, after)
+        total_before += before
+        total_after += after
+
+    report("total", total_before, total_after)
+
+
+if __name__ == "__main__":
+    init_game_dir(check_db=False)
+    run()
@@ -0,0 +1,57 @@
+"""
+Helper functions of benchmarks.
+"""
+
+from __future__ import print_function
+
+import os, sys, time
+from muddery.server.launcher import configs
+
+
+def init_game_dir(check_db=True):
+    """
+    Set up Django and Evennia in the current game directory.
+
+    Args:
+        check_db: (boolean) check the database and initialize Evennia.
+    """
+    sys.path.insert(1, configs.EVENNIA_LIB)
+    from evennia.server import evennia_launcher
+    evennia_launcher.init_game_directory(os.getcwd(), check_db=check_db)
+
+
+def timeit(func, number=1000):
+    """
+    Call a function repeatedly.
+
+    Args:
+        func: (function) the function to call.
+        number: (int) call times.
+
+    Returns:
+        (float) average seconds per call.
+    """
+    begin = time.time()
+    for i in xrange(number):
+        func()
+    return (time.time() - begin) / number
+
+
+def report(name, before, after):
+    """
+    Print a comparison of two timings.
+
+    Args:
+        name: (string) benchmark's name.
+        before: (float) seconds per call before optimization.
+        after: (float) seconds per call after optimization.
+    """
+    speedup = before / after if after else 0
+    print("%-48s %12.2fus %12.2fus %8.1fx" % (name, before * 1e6, after * 1e6, speedup))
+
+
+def report_header():
+    """
+    Print the header of comparisons.
+    """
+    print("%-48s %14s %14s %9s" % ("benchmark", "before", "after", "speedup"))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Compare CPU time per message on the server and the portal before and after
+sending pre-encoded JSON texts, using typical look_around and skill_cast
+messages.
+
+Server: encode the message and clean it for AMP.
+Portal: put the text into a websocket frame.
+
+Usage (in a game directory):
+
+    python -m muddery.benchmarks.wire_encoding
+"""
+
+from __future__ import print_function
+
+import json
+from muddery.benchmarks.utils import init_game_dir, timeit, report, report_header
+
+
+class Session(object):
+    """
+    A fake server session.
+    """
+    protocol_flags = {"ENCODING": "utf-8"}
+
+
+def get_look_around():
+    """
+    A room with exits, NPCs, objects and players.
+    """
+    def objs(prefix, number):
+        return [{"dbref": "#%d" % (100 + i),
+                 "name": u"%s 对象 %d" % (prefix, i),
+                 "key": "%s_%d" % (prefix, i)} for i in xrange(number)]
+
+    npcs = objs("npc", 5)
+    for npc in npcs:
+        npc["provide_quest"] = False
+        npc["complete_quest"] = False
+
+    return {"look_around": {"dbref": "#10",
+                            "name": u"城门",
+                            "desc": u"这里是城门，城墙高大，守卫森严。{y北边{n是大街，{y南边{n是树林。" * 3,
+                            "cmds": [{"name": u"攻击", "cmd": "attack", "args": "#10"}],
+                            "icon": "room_gate",
+                            "peaceful": False,
+                            "background": {"resource": "bg_gate.jpg", "width": 800, "height": 600},
+                            "exits": objs("exit", 4),
+                            "npcs": npcs,
+                            "things": objs("thing", 6),
+                            "players": objs("player", 8),
+                            "offlines": []}}
+
+
+def get_skill_cast():
+    """
+    A skill cast in a combat of two characters.
+    """
+    status = {}
+    for dbref in ("#20", "#21"):
+        status[dbref] = {"max_hp": 1200, "hp": 860, "max_mp": 300, "mp": 120, "level": 12}
+
+    return {"skill_cast": {"caller": "#20",
+                           "skill": "skill_normal_hit",
+                           "cast": u"{c张三{n使用了{c普通攻击{n。",
+                           "target": "#21",
+                           "result": u"{c李四{n受到了{c85{n点伤害。",
+                           "status": status}}
+
+
+def run(number=10000):
+    """
+    Run the benchmark.
+
+    Args:
+        number: (int) number of messages.
+    """
+    from evennia.server.sessionhandler import SESSION_HANDLER
+    from evennia.server.portal.webclient import WebSocketClient
+
+    class Client(WebSocketClient):
+        """
+        A websocket client without connections.
+        """
+        def __init__(self):
+            self.protocol_flags = {"ENCODING": "utf-8"}
+            self.bytes = 0
+
+        def sendLine(self, line):
+            self.bytes += len(line)
+
+    session = Session()
+
+    report_header()
+    for name, message in (("look_around", get_look_around()), ("skill_cast", get_skill_cast())):
+        # server
+        def server_before():
+            text = json.dumps(message)
+            return SESSION_HANDLER.clean_senddata(session, {"text": text, "options": {"raw": True}})
+
+        def server_after():
+            text = json.dumps(message)
+            return SESSION_HANDLER.clean_senddata(session, {"text": text, "options": {"raw": True, "json": True}})
+
+        report("server: %s" % name, timeit(server_before, number), timeit(server_after, number))
+
+        # portal
+        before_data = server_before()["text"]
+        after_data = server_after()["text"]
+        before_client = Client()
+        after_client = Client()
+
+        def portal_before():
+            before_client.send_text(*before_data[0], options=dict(before_data[1]["options"]))
+
+        def portal_after():
+            after_client.send_text(*after_data[0], options=dict(after_data[1]["options"]))
+
+        report("portal: %s" % name, timeit(portal_before, number), timeit(portal_after, number))
+        print("%-48s %13dB %13dB" % ("frame size: %s" % name,
+                                     before_client.bytes / number,
+                                     after_client.bytes / number))
+
+
+if __name__ == "__main__":
+    init_game_dir(check_db=False)
+    run()
@@ -6,10 +6,10 @@ from __future__ import print_function
 
 import random
 import traceback
-from twisted.internet import reactor
 from django.conf import settings
 from evennia import DefaultScript
 from evennia.utils import logger
+from muddery.combat.combat_scheduler import COMBAT_SCHEDULER
 
 
 class BaseCombatHandler(DefaultScript):
@@ -59,6 +59,9 @@ class BaseCombatHandler(DefaultScript):
         # remove combat commands
         character.cmdset.delete(settings.CMDSET_COMBAT)
 
+        # write changed properties to db
+        character.custom_properties_handler.flush()
+
         if character.has_account:
             # notify combat finished
             character.msg({"left_combat": True})
@@ -112,7 +115,7 @@ class BaseCombatHandler(DefaultScript):
         self.start_combat()
 
         if self.timeout:
-            self.timer = reactor.callLater(self.timeout, self.at_timeout)
+            self.timer = COMBAT_SCHEDULER.call_later(self.timeout, self.at_timeout)
 
     def at_timeout(self):
         """
@@ -0,0 +1,183 @@
+"""
+CombatScheduler runs timed actions of all combats with one reactor timer.
+
+Actions are kept in a heap ordered by their due time. On every tick, all due
+actions are called in one batch.
+"""
+
+from __future__ import print_function
+
+import time, heapq, traceback
+from django.conf import settings
+from twisted.internet import task
+from evennia.utils import logger
+
+
+class ScheduledCall(object):
+    """
+    A scheduled action. It has the same active() and cancel() methods as
+    Twisted's DelayedCall.
+    """
+    def __init__(self, scheduler, due_time, interval, func, args):
+        """
+        Args:
+            scheduler: (CombatScheduler) the scheduler.
+            due_time: (float) the time to call the function.
+            interval: (float) call the function repeatedly in this interval. Zero
+                      means call it only once.
+            func: (function) the function to call.
+            args: (tuple) function's args.
+        """
+        self.scheduler = scheduler
+        self.due_time = due_time
+        self.interval = interval
+        self.func = func
+        self.args = args
+        self.cancelled = False
+        self.called = False
+
+    def active(self):
+        """
+        If the call is waiting to be called.
+        """
+        return not self.cancelled and not self.called
+
+    def cancel(self):
+        """
+        Cancel the call.
+        """
+        if self.active():
+            self.cancelled = True
+            self.scheduler.count -= 1
+
+
+class CombatScheduler(object):
+    """
+    Calls combat actions with one timer.
+    """
+    def __init__(self):
+        """
+        Initialize the scheduler.
+        """
+        self.tick_interval = settings.COMBAT_TICK_INTERVAL
+
+        # (due time, sequence, call)
+        self.queue = []
+        self.sequence = 0
+
+        # number of active calls
+        self.count = 0
+
+        self.loop = None
+
+        # metrics
+        self.ticks = 0
+        self.calls = 0
+        self.last_lag = 0
+        self.max_lag = 0
+
+    def call_later(self, delay, func, *args):
+        """
+        Call a function after a delay.
+
+        Args:
+            delay: (float) delay in seconds.
+            func: (function) the function to call.
+
+        Returns:
+            (ScheduledCall) the call.
+        """
+        return self.add(ScheduledCall(self, time.time() + delay, 0, func, args))
+
+    def call_repeatedly(self, interval, func, *args):
+        """
+        Call a function now and then call it repeatedly in an interval.
+
+        Args:
+            interval: (float) interval in seconds.
+            func: (function) the function to call.
+
+        Returns:
+            (ScheduledCall) the call.
+        """
+        return self.add(ScheduledCall(self, time.time(), interval, func, args))
+
+    def add(self, call):
+        """
+        Add a call to the queue and start the timer.
+        """
+        self.sequence += 1
+        heapq.heappush(self.queue, (call.due_time, self.sequence, call))
+        self.count += 1
+
+        if not self.loop or not self.loop.running:
+            self.loop = task.LoopingCall(self.tick)
+            self.loop.start(self.tick_interval, now=False)
+
+        return call
+
+    def tick(self):
+        """
+        Call all due functions.
+        """
+        now = time.time()
+        self.ticks += 1
+
+        due_calls = []
+        while self.queue and self.queue[0][0] <= now:
+            due_calls.append(heapq.heappop(self.queue)[2])
+
+        if due_calls:
+            self.last_lag = now - due_calls[0].due_time
+            if self.last_lag > self.max_lag:
+                self.max_lag = self.last_lag
+
+        for call in due_calls:
+            if call.cancelled:
+                continue
+
+            if not call.interval:
+                call.called = True
+                self.count -= 1
+
+            self.calls += 1
+            try:
+                call.func(*call.args)
+            except Exception, e:
+                logger.log_errmsg("Combat action error: %s" % e)
+                traceback.print_exc()
+
+            if call.interval and not call.cancelled:
+                # call it again, skip missed calls
+                call.due_time += call.interval
+                if call.due_time < now:
+                    call.due_time = now + call.interval
+                self.sequence += 1
+                heapq.heappush(self.queue, (call.due_time, self.sequence, call))
+
+        if not self.count:
+            # no more calls
+            self.queue = []
+            self.loop.stop()
+
+    def queue_depth(self):
+        """
+        Get the number of waiting calls.
+        """
+        return self.count
+
+    def stats(self):
+        """
+        Get the scheduler's metrics.
+
+        Returns:
+            (dict) metrics
+        """
+        return {"queue_depth": self.count,
+                "ticks": self.ticks,
+                "calls": self.calls,
+                "last_lag": self.last_lag,
+                "max_lag": self.max_lag}
+
+
+COMBAT_SCHEDULER = CombatScheduler()
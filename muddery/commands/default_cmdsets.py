@@ -39,6 +39,7 @@ class CharacterCmdSet(default_cmds.CharacterCmdSet):
         self.add(general.CmdLook())
         self.add(general.CmdGoto())
         self.add(general.CmdInventory())
+        self.add(general.CmdResync())
         self.add(general.CmdTalk())
         self.add(general.CmdDialogue())
         self.add(general.CmdLoot())
@@ -46,6 +47,7 @@ class CharacterCmdSet(default_cmds.CharacterCmdSet):
         self.add(general.CmdDiscard())
         self.add(general.CmdEquip())
         self.add(general.CmdTakeOff())
+        self.add(general.CmdLookSkill())
         self.add(general.CmdCastSkill())
         self.add(general.CmdAttack())
         self.add(general.CmdMakeMatch())
@@ -59,6 +61,7 @@ class CharacterCmdSet(default_cmds.CharacterCmdSet):
         self.add(general.CmdShopping())
         self.add(general.CmdBuy())
         self.add(general.CmdSay())
+        self.add(general.CmdCheckDataKeys())
         self.add(general.CmdTest())
 
         # Add empty login commands to the normal cmdset to
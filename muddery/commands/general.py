@@ -15,6 +15,7 @@ from muddery.utils.localized_strings_handler import _
 from muddery.utils.exception import MudderyError
 from muddery.utils.honours_handler import HONOURS_HANDLER
 from muddery.utils.match_queue_handler import MATCH_QUEUE_HANDLER
+from muddery.utils.data_key_registry import DATA_KEY_REGISTRY
 from muddery.dao.honours_mapper import HONOURS_MAPPER
 import traceback
 import random
@@ -112,8 +113,33 @@ class CmdInventory(Command):
 
     def func(self):
         "check inventory"
-        inv = self.caller.return_inventory()
-        self.caller.msg({"inventory":inv})
+        self.caller.state_sync.resync(["inventory"], self.session)
+
+
+class CmdResync(Command):
+    """
+    Get full data of the character's inventory, status, equipments, skills or
+    quests again.
+
+    Usage:
+        {"cmd":"resync",
+         "args":[<channel's name>]
+        }
+    """
+    key = "resync"
+    locks = "cmd:all()"
+
+    def func(self):
+        "resend data"
+        caller = self.caller
+        if not self.args:
+            return
+
+        channels = self.args
+        if not isinstance(channels, list):
+            channels = [channels]
+
+        caller.state_sync.resync(channels, self.session)
 
 
 #------------------------------------------------------------
@@ -540,6 +566,43 @@ class CmdTakeOff(Command):
         caller.msg(message)
 
 
+#------------------------------------------------------------
+# look at a skill
+#------------------------------------------------------------
+
+class CmdLookSkill(Command):
+    """
+    look at a skill of the caller
+
+    Usage:
+        {"cmd":"look_skill",
+         "args":<skill's key>
+        }
+
+    Observes a learned skill.
+    """
+    key = "look_skill"
+    locks = "cmd:all()"
+
+    def func(self):
+        """
+        Look at the skill.
+        """
+        caller = self.caller
+        args = self.args
+
+        if not args:
+            caller.msg({"alert":_("You should select a skill.")})
+            return
+
+        skill = caller.skill_handler.get(args)
+        if not skill:
+            caller.msg({"alert":_("You do not have this skill.")})
+            return
+
+        caller.msg({"look_obj": skill.get_appearance(caller)})
+
+
 #------------------------------------------------------------
 # cast a skill
 #------------------------------------------------------------
@@ -1104,6 +1167,46 @@ class CmdCreateConnect(Command):
         pass
         
         
+#------------------------------------------------------------
+# check the data key registry
+#------------------------------------------------------------
+class CmdCheckDataKeys(Command):
+    """
+    Compare the data key registry with the database. If args is "fix", reload
+    the registry when they are different.
+
+    Usage:
+        {"cmd":"check_data_keys",
+         "args":<"fix">
+        }
+    """
+    key = "check_data_keys"
+    locks = "cmd:perm(Builder)"
+
+    def func(self):
+        "check data keys"
+        caller = self.caller
+
+        if not DATA_KEY_REGISTRY.is_loaded():
+            caller.msg({"alert": _("The data key registry is not loaded.")})
+            return
+
+        result = DATA_KEY_REGISTRY.check()
+        for name, objs in result.items():
+            for obj_id, key in objs.items():
+                logger.log_errmsg("Data key registry error: %s #%s %s" % (name, obj_id, key))
+
+        message = _("Missing: %d, stale: %d, mismatched: %d.") % (len(result["missing"]),
+                                                                 len(result["stale"]),
+                                                                 len(result["mismatched"]))
+
+        if self.args == "fix" and (result["missing"] or result["stale"] or result["mismatched"]):
+            DATA_KEY_REGISTRY.reload()
+            message += " " + _("The registry has been reloaded.")
+
+        caller.msg({"msg": message})
+
+
 #------------------------------------------------------------
 # do some tests
 #------------------------------------------------------------
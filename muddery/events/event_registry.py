@@ -0,0 +1,101 @@
+"""
+EventRegistry keeps all events in world data, indexed by trigger objects and
+trigger types.
+"""
+
+from __future__ import print_function
+
+from evennia.utils import logger
+from muddery.worlddata.dao import common_mappers as CM
+
+
+class EventRegistry(object):
+    """
+    All events of the game.
+    """
+    def __init__(self):
+        """
+        Initialize the registry.
+        """
+        # {trigger object's key: {trigger type: (events)}}
+        # It is None before the events are loaded.
+        self.object_events = None
+
+        # {(trigger type, trigger object's key): (cumulative odds)}
+        self.cumulative_odds = {}
+
+    def reload(self):
+        """
+        Load all events.
+        """
+        object_events = {}
+        for record in CM.EVENT_DATA.all():
+            event = {}
+            for field in record._meta.fields:
+                event[field.name] = record.serializable_value(field.name)
+
+            events = object_events.setdefault(record.trigger_obj, {})
+            events.setdefault(record.trigger_type, []).append(event)
+
+        cumulative_odds = {}
+        for trigger_obj, events in object_events.items():
+            for trigger_type in events:
+                event_list = tuple(events[trigger_type])
+                events[trigger_type] = event_list
+                cumulative_odds[(trigger_type, trigger_obj)] = get_cumulative_odds(event_list)
+
+        self.object_events = object_events
+        self.cumulative_odds = cumulative_odds
+        logger.log_info("Loaded %d objects' events." % len(object_events))
+
+    def get_object_events(self, object_key):
+        """
+        Get an object's events. Do not modify them.
+
+        Args:
+            object_key: (string) trigger object's key.
+
+        Returns:
+            (dict) {trigger type: (events)}
+        """
+        if self.object_events is None:
+            self.reload()
+
+        return self.object_events.get(object_key, {})
+
+    def get_cumulative_odds(self, trigger_type, object_key):
+        """
+        Get cumulative odds of an object's events.
+
+        Args:
+            trigger_type: (string) event's trigger type.
+            object_key: (string) trigger object's key.
+
+        Returns:
+            (tuple) cumulative odds of events in order.
+        """
+        if self.object_events is None:
+            self.reload()
+
+        return self.cumulative_odds.get((trigger_type, object_key), ())
+
+
+def get_cumulative_odds(events):
+    """
+    Get cumulative odds of events.
+
+    Args:
+        events: (list) events in order.
+
+    Returns:
+        (tuple) the sum of odds of each event and events before it.
+    """
+    total = 0
+    cumulative_odds = []
+    for event in events:
+        total += event["odds"]
+        cumulative_odds.append(total)
+    return tuple(cumulative_odds)
+
+
+EVENT_REGISTRY = EventRegistry()
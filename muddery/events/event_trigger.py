@@ -4,14 +4,16 @@ EventHandler handles all events. The handler sets on every object.
 
 from __future__ import print_function
 
-import random
+import random, bisect
 from muddery.utils import defines
 from muddery.statements.statement_handler import STATEMENT_HANDLER
 from muddery.utils import utils
-from muddery.worlddata.dao import event_mapper
+from muddery.events.event_registry import EVENT_REGISTRY, get_cumulative_odds
 from muddery.mappings.event_action_set import EVENT_ACTION_SET
 from django.conf import settings
 from django.apps import apps
+from django.db.models.signals import m2m_changed, post_save, class_prepared
+from evennia.accounts.models import AccountDB
 from evennia.utils import logger
 from muddery.typeclasses.script_room_interval import ScriptRoomInterval
 from muddery.utils.localized_strings_handler import _
@@ -19,6 +21,59 @@ from muddery.utils.localized_strings_handler import _
 
 PERMISSION_BYPASS_EVENTS = {perm.lower() for perm in settings.PERMISSION_BYPASS_EVENTS}
 
+# If accounts can bypass events. {account's id: boolean}
+_bypass_cache = {}
+
+
+def _at_account_tags_changed(sender, instance, pk_set=None, **kwargs):
+    """
+    Remove cached bypass flags when accounts' permissions change.
+    """
+    if isinstance(instance, AccountDB):
+        _bypass_cache.pop(instance.id, None)
+    elif pk_set:
+        # changed from the tag's side
+        for pk in pk_set:
+            _bypass_cache.pop(pk, None)
+    else:
+        _bypass_cache.clear()
+
+
+def _at_account_saved(sender, instance, **kwargs):
+    """
+    Remove the cached bypass flag when an account's superuser flag may change.
+    """
+    _bypass_cache.pop(instance.id, None)
+
+
+def _at_class_prepared(sender, **kwargs):
+    """
+    Watch new account typeclasses.
+    """
+    if issubclass(sender, AccountDB):
+        post_save.connect(_at_account_saved, sender=sender)
+
+
+def _connect_account_classes():
+    """
+    Accounts are saved as their typeclasses, which are proxy models of
+    AccountDB, so watch AccountDB and all its typeclasses.
+    """
+    classes = [AccountDB]
+    while classes:
+        cls = classes.pop()
+        post_save.connect(_at_account_saved, sender=cls)
+        classes.extend(cls.__subclasses__())
+
+    # typeclasses loaded later
+    class_prepared.connect(_at_class_prepared, dispatch_uid="event_trigger_bypass_classes")
+
+
+# Permissions are tags of accounts, superuser flags are saved with accounts.
+m2m_changed.connect(_at_account_tags_changed, sender=AccountDB.db_tags.through,
+                    dispatch_uid="event_trigger_bypass_tags")
+_connect_account_classes()
+
 
 class EventTrigger(object):
     """
@@ -54,28 +109,13 @@ class EventTrigger(object):
         Initialize the handler.
         """
         self.owner = owner
-        self.events = {}
 
         if not object_key:
             object_key = owner.get_data_key()
+        self.object_key = object_key
 
-        # Load events.
-        event_records = event_mapper.get_object_event(object_key)
-
-        for record in event_records:
-            event = {}
-
-            # Set data.
-            event_action = record.action
-            trigger_type = record.trigger_type
-
-            for field in record._meta.fields:
-                event[field.name] = record.serializable_value(field.name)
-            event["action"] = event_action
-
-            if not trigger_type in self.events:
-                self.events[trigger_type] = []
-            self.events[trigger_type].append(event)
+        # Get events from the registry, they are shared by all triggers.
+        self.events = EVENT_REGISTRY.get_object_events(object_key)
 
     @classmethod
     def all_triggers(cls):
@@ -107,14 +147,24 @@ class EventTrigger(object):
         if not character:
             return False
 
-        if character.account:
-            if character.account.is_superuser:
-                # superusers can bypass events
-                return True
-            for perm in character.account.permissions.all():
-                if perm in PERMISSION_BYPASS_EVENTS:
-                    # has permission to bypass events
-                    return True
+        account = character.account
+        if not account:
+            return False
+
+        try:
+            return _bypass_cache[account.id]
+        except KeyError:
+            pass
+
+        if account.is_superuser:
+            # superusers can bypass events
+            bypass = True
+        else:
+            # has permission to bypass events
+            bypass = not PERMISSION_BYPASS_EVENTS.isdisjoint(account.permissions.all())
+
+        _bypass_cache[account.id] = bypass
+        return bypass
 
     def trigger(self, event_type, character, obj):
         """
@@ -144,14 +194,20 @@ class EventTrigger(object):
                          if not character.is_event_closed(e["key"]) and
                              STATEMENT_HANDLER.match_condition(e["condition"], character, obj)]
 
-        rand = random.random()
-        for event in candidates:
-            if rand < event["odds"]:
-                func = EVENT_ACTION_SET.func(event["action"])
-                if func:
-                    func(event["key"], character, obj)
-                return True
-            rand -= event["odds"]
+        if len(candidates) == len(event_list):
+            # all events are available
+            cumulative_odds = EVENT_REGISTRY.get_cumulative_odds(event_type, self.object_key)
+        else:
+            cumulative_odds = get_cumulative_odds(candidates)
+
+        # choose an event by odds
+        index = bisect.bisect_right(cumulative_odds, random.random())
+        if index < len(candidates):
+            event = candidates[index]
+            func = EVENT_ACTION_SET.func(event["action"])
+            if func:
+                func(event["key"], character, obj)
+            return True
 
     #########################
     #
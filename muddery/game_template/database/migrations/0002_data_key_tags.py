@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations
+
+
+def add_tags(apps, schema_editor):
+    """
+    Mirror objects' data keys and unique types to indexed tags.
+    """
+    ObjectDB = apps.get_model("objects", "ObjectDB")
+    Tag = apps.get_model("typeclasses", "Tag")
+    Through = ObjectDB.db_tags.through
+
+    for attr_key, tag_category in (("key", settings.DATA_KEY_CATEGORY),
+                                   ("type", settings.UNIQUE_TYPE_CATEGORY)):
+        records = ObjectDB.objects.filter(db_attributes__db_key=attr_key,
+                                          db_attributes__db_category=settings.DATA_KEY_CATEGORY)
+        values = records.values_list("id", "db_attributes__db_strvalue")
+
+        tags = {}
+        links = []
+        for obj_id, value in values:
+            if not value:
+                continue
+
+            # evennia keeps tags in lower case
+            value = value.strip().lower()
+            tag = tags.get(value)
+            if tag is None:
+                tag, created = Tag.objects.get_or_create(db_key=value,
+                                                         db_category=tag_category,
+                                                         db_model="objectdb",
+                                                         db_tagtype=None)
+                tags[value] = tag
+            links.append((obj_id, tag.id))
+
+        existing = set(Through.objects.filter(tag__db_category=tag_category).values_list("objectdb_id", "tag_id"))
+        Through.objects.bulk_create([Through(objectdb_id=obj_id, tag_id=tag_id)
+                                     for obj_id, tag_id in links if (obj_id, tag_id) not in existing],
+                                    batch_size=500)
+
+
+def remove_tags(apps, schema_editor):
+    """
+    Remove data key and unique type tags.
+    """
+    ObjectDB = apps.get_model("objects", "ObjectDB")
+    Through = ObjectDB.db_tags.through
+    Through.objects.filter(tag__db_category__in=(settings.DATA_KEY_CATEGORY,
+                                                 settings.UNIQUE_TYPE_CATEGORY)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('database', '0001_initial'),
+        ('objects', '0009_remove_objectdb_db_player'),
+        ('typeclasses', '0010_delete_old_player_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_tags, remove_tags),
+    ]
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+from django.db import migrations
+
+
+# the attribute of skill records, see muddery.utils.skill_handler
+SKILL_RECORD_KEY = "skill_record"
+
+
+def get_packed_id(value):
+    """
+    Get the id of a pickled object reference.
+    """
+    if isinstance(value, (tuple, list)) and len(value) == 4 and value[0] == "__packed_dbobj__":
+        return value[3]
+    return None
+
+
+def make_record(skill_ids, states):
+    """
+    Make a skill record in the same format as
+    muddery.utils.skill_handler.pack_skills().
+
+    Args:
+        skill_ids: (dict) {skill's key: skill object's id}
+        states: (dict) {skill object's id: {attribute's key: value}}
+    """
+    record = []
+    for key, skill_id in sorted(skill_ids.items()):
+        state = states.get(skill_id, {})
+        record.append([key,
+                       1 if state.get("is_default") else 0,
+                       state.get("cd_finish_time") or 0])
+    return json.dumps(record, separators=(",", ":"))
+
+
+def pack_skills(apps, schema_editor):
+    """
+    Pack characters' skill objects to skill records, then remove skill objects.
+    """
+    ObjectDB = apps.get_model("objects", "ObjectDB")
+    Attribute = apps.get_model("typeclasses", "Attribute")
+
+    skill_attrs = Attribute.objects.filter(db_key="skills",
+                                           db_category__isnull=True,
+                                           db_attrtype__isnull=True,
+                                           objectdb__isnull=False)
+
+    for skills_attr in skill_attrs:
+        owners = list(ObjectDB.objects.filter(db_attributes=skills_attr))
+        skills = skills_attr.db_value or {}
+
+        # {skill's key: skill object's id}
+        skill_ids = {}
+        for key, value in skills.items():
+            skill_id = get_packed_id(value)
+            if skill_id:
+                skill_ids[key] = skill_id
+
+        # skills' states
+        states = {}
+        values = Attribute.objects.filter(objectdb__id__in=skill_ids.values(),
+                                          db_key__in=("is_default", "cd_finish_time"),
+                                          db_category__isnull=True) \
+                                  .values_list("objectdb__id", "db_key", "db_value")
+        for skill_id, attr_key, attr_value in values:
+            states.setdefault(skill_id, {})[attr_key] = attr_value
+
+        record = make_record(skill_ids, states)
+
+        for owner in owners:
+            owner.db_attributes.filter(db_key=SKILL_RECORD_KEY, db_category__isnull=True).delete()
+            record_attr = Attribute.objects.create(db_key=SKILL_RECORD_KEY,
+                                                   db_value=record,
+                                                   db_model="objectdb",
+                                                   db_lock_storage="")
+            owner.db_attributes.add(record_attr)
+
+        # remove skill objects and their attributes
+        ids = skill_ids.values()
+        Attribute.objects.filter(objectdb__id__in=ids).delete()
+        ObjectDB.objects.filter(id__in=ids).delete()
+        skills_attr.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('database', '0002_data_key_tags'),
+    ]
+
+    # Skill objects are deleted, so this migration can not be reversed.
+    operations = [
+        migrations.RunPython(pack_skills),
+    ]
@@ -22,6 +22,10 @@ def at_server_start():
     This is called every time the server starts up, regardless of
     how it was shut down.
     """
+    # load world data
+    from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
+    WORLD_DATA.reload()
+
     # reset settings
     from muddery.utils.game_settings import GAME_SETTINGS
     GAME_SETTINGS.reset()
@@ -40,13 +44,25 @@ def at_server_start():
     from muddery.utils.attributes_info_handler import FOOD_ATTRIBUTES_INFO
     FOOD_ATTRIBUTES_INFO.reload()
 
+    # load objects' data keys
+    from muddery.utils.data_key_registry import DATA_KEY_REGISTRY
+    DATA_KEY_REGISTRY.reload()
+
     # reset default locations
     from muddery.utils import builder
     builder.reset_default_locations()
+
+    # load the world map
+    from muddery.utils.world_map_handler import WORLD_MAP
+    WORLD_MAP.reload()
     
-    # clear dialogues
+    # load events
+    from muddery.events.event_registry import EVENT_REGISTRY
+    EVENT_REGISTRY.reload()
+
+    # load dialogues
     from muddery.utils.dialogue_handler import DIALOGUE_HANDLER
-    DIALOGUE_HANDLER.clear()
+    DIALOGUE_HANDLER.reload()
     
     # reload equipment types
     from muddery.utils.equip_type_handler import EQUIP_TYPE_HANDLER
@@ -64,6 +80,14 @@ def at_server_start():
     # load condition descriptions
     from muddery.utils.desc_handler import DESC_HANDLER
     DESC_HANDLER.reload()
+
+    # clear skills' data
+    from muddery.utils.skill_handler import SKILL_DATA
+    SKILL_DATA.reload()
+
+    # compile statements in world data
+    from muddery.statements.statement_handler import STATEMENT_HANDLER
+    STATEMENT_HANDLER.reload()
     
     # load honours
     from muddery.dao.honours_mapper import HONOURS_MAPPER
@@ -75,7 +99,9 @@ def at_server_stop():
     This is called just before the server is shut down, regardless
     of it is for a reload, reset or shutdown.
     """
-    pass
+    # write changed properties to db
+    from muddery.utils.properties_handler import PROPERTIES_WRITER
+    PROPERTIES_WRITER.flush_all()
 
 
 def at_server_reload_start():
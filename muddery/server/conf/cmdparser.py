@@ -29,6 +29,57 @@ import evennia.commands.cmdparser as evennia_cmdparser
 CMD_LOGINSTART = "__unloggedin_look_command"
 
 
+def get_command_index(cmdset):
+    """
+    Get the cmdset's commands indexed by keys. The index is kept in the cmdset.
+
+    The cmdhandler caches merged cmdsets, a new merged cmdset is made when the
+    caller's cmdsets change, so the index is built once for every composition
+    of cmdsets. CmdSet.add() and CmdSet.remove() replace the cmdset's command
+    list, so the index is rebuilt when the cmdset itself is changed.
+
+    Args:
+        cmdset: (CmdSet) the merged cmdset.
+
+    Returns:
+        (dict) {command's key: command}
+    """
+    commands = cmdset.commands
+    index = getattr(cmdset, "muddery_command_index", None)
+    if index is None or index[0] is not commands:
+        keys = {}
+        for cmdobj in commands:
+            # the first matching command is used
+            if cmdobj.key not in keys:
+                keys[cmdobj.key] = cmdobj
+        index = (commands, keys)
+        cmdset.muddery_command_index = index
+
+    return index[1]
+
+
+def parse_json(raw_string):
+    """
+    Parse a JSON formated command.
+
+    Args:
+        raw_string: (string) the unparsed text.
+
+    Returns:
+        (tuple) (command's key, args), or None if it is not a JSON command.
+    """
+    if raw_string[:1] != "{":
+        raw_string = raw_string.lstrip()
+        if raw_string[:1] != "{":
+            return None
+
+    try:
+        data = json.loads(raw_string)
+        return data["cmd"], data["args"]
+    except Exception:
+        return None
+
+
 def cmdparser(raw_string, cmdset, caller, match_index=None):
     """
     This function is called by the cmdhandler once it has
@@ -49,23 +100,24 @@ def cmdparser(raw_string, cmdset, caller, match_index=None):
             (possibly) separate multiple matches.
 
     """
-    try:
-        if raw_string == CMD_LOGINSTART:
-            cmd = CMD_LOGINSTART
-            args = ""
-        else:
-            # Parse JSON formated command.
-            data = json.loads(raw_string)
-            cmd = data["cmd"]
-            args = data["args"]
+    if raw_string == CMD_LOGINSTART:
+        command = (CMD_LOGINSTART, "")
+    else:
+        command = parse_json(raw_string)
+        if command is None:
+            # Command is not in JSON, call evennia's cmdparser.
+            return evennia_cmdparser.cmdparser(raw_string, cmdset, caller, match_index)
 
+    cmd, args = command
+    try:
         # Find the matching command in cmdset.
-        for cmdobj in cmdset:
-            if cmdobj.key == cmd:
-                return [(cmd, args, cmdobj, len(cmd), 1, raw_string)]
+        cmdobj = get_command_index(cmdset).get(cmd)
+    except TypeError:
+        # the key is not hashable
+        cmdobj = None
 
+    if cmdobj is None:
         # can not find
         return []
-    except Exception:
-        # Command is not in JSON, call evennia's cmdparser.
-        return evennia_cmdparser.cmdparser(raw_string, cmdset, caller, match_index)
+
+    return [(cmd, args, cmdobj, len(cmd), 1, raw_string)]
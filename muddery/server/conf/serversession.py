@@ -24,10 +24,47 @@ settings file:
 from __future__ import print_function
 
 import json
+from collections import OrderedDict
+from django.conf import settings
+from twisted.internet import reactor
 from evennia.server.serversession import ServerSession as BaseServerSession
 from evennia.utils import logger
 
 
+class CoalesceMetrics(object):
+    """
+    Counts messages and frames sent by all sessions.
+    """
+    def __init__(self):
+        self.messages = 0
+        self.frames = 0
+
+    def stats(self):
+        """
+        Get metrics.
+
+        Returns:
+            (dict) metrics
+        """
+        return {"messages": self.messages,
+                "frames": self.frames,
+                "frames_saved": self.messages - self.frames}
+
+
+COALESCE_METRICS = CoalesceMetrics()
+
+
+def encode_message(text):
+    """
+    Convert a message to JSON.
+    """
+    try:
+        return json.dumps(text)
+    except Exception, e:
+        logger.log_tracemsg("json.dumps failed: %s" % e)
+        return json.dumps({"err": "There is an error occurred while outputing messages."})
+
+
 class ServerSession(BaseServerSession):
     """
     This class represents a player's session and is a template for
@@ -41,7 +78,19 @@ class ServerSession(BaseServerSession):
         """
         Send Evennia -> User
         Convert to JSON.
+
+        Options:
+            raw: (boolean) do not convert the text to JSON.
+            json: (boolean) the raw text is a JSON document, it will not be
+                  validated or encoded again before sent to the client.
         """
+        if settings.SESSION_COALESCE_MESSAGES and text and \
+            (not kwargs or kwargs.keys() == ["options"]):
+            # send it with other messages
+            options = kwargs.get("options") or {}
+            self.queue_message(text, options.get("raw", False), options.get("json", False))
+            return
+
         options = None
         if kwargs.has_key("options"):
             options = kwargs.get("options", None)
@@ -59,7 +108,76 @@ class ServerSession(BaseServerSession):
                 text = json.dumps({"err": "There is an error occurred while outputing messages."})
                 logger.log_tracemsg("json.dumps failed: %s" % e)
 
+            # the text has been encoded
+            kwargs["options"]["json"] = True
+
         # set raw=True
         kwargs["options"].update({"raw": True})
 
         return super(ServerSession, self).data_out(text=text, **kwargs)
+
+    def queue_message(self, text, raw, is_json=False):
+        """
+        Put a message in the queue, messages in the queue will be sent in one
+        frame when the reactor is idle.
+
+        Dict messages are merged if they have no common keys, keys keep their
+        orders. Otherwise they are sent as a list of messages.
+
+        Args:
+            text: (any) the message.
+            raw: (boolean) do not convert the message to JSON.
+            is_json: (boolean) the raw message is a JSON document.
+        """
+        pending = getattr(self, "pending_messages", None)
+        if pending is None:
+            pending = []
+            self.pending_messages = pending
+
+        if not raw and isinstance(text, dict):
+            last = pending[-1] if pending else None
+            if isinstance(last, OrderedDict) and not any(key in last for key in text):
+                last.update(text)
+            else:
+                pending.append(OrderedDict(text))
+        else:
+            if not raw or not is_json:
+                # raw texts which are not JSON are sent as JSON strings
+                text = encode_message(text)
+            pending.append(text)
+
+        COALESCE_METRICS.messages += 1
+
+        if not getattr(self, "flush_call", None):
+            self.flush_call = reactor.callLater(0, self.flush_messages)
+
+    def flush_messages(self):
+        """
+        Send all messages in the queue in one frame.
+        """
+        self.flush_call = None
+
+        pending = getattr(self, "pending_messages", None)
+        if not pending:
+            return
+        self.pending_messages = []
+
+        messages = [encode_message(item) if isinstance(item, OrderedDict) else item for item in pending]
+        if len(messages) == 1:
+            text = messages[0]
+        else:
+            text = "[" + ",".join(messages) + "]"
+
+        COALESCE_METRICS.frames += 1
+        super(ServerSession, self).data_out(text=text, options={"raw": True, "json": True})
+
+    def at_disconnect(self, reason=None):
+        """
+        Send remaining messages before disconnecting.
+        """
+        flush_call = getattr(self, "flush_call", None)
+        if flush_call and flush_call.active():
+            flush_call.cancel()
+            self.flush_messages()
+
+        super(ServerSession, self).at_disconnect(reason)
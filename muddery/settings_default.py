@@ -94,6 +94,10 @@ DATABASE_APPS_MAPPING = {
 # functions it must implement
 COMMAND_PARSER = "muddery.server.conf.cmdparser.cmdparser"
 
+# Muddery's cmdsets only change when characters enter or leave combats, so
+# merged cmdsets are kept on callers until their cmdsets change.
+CACHE_MERGED_CMDSETS = True
+
 # The handler that outputs errors when using any API-level search
 # (not manager methods). This function should correctly report errors
 # both for command- and object-searches. This allows full control
@@ -245,6 +249,9 @@ TEMPLATES = [{
 # Server-side session class used.
 SERVER_SESSION_CLASS = "muddery.server.conf.serversession.ServerSession"
 
+# Messages sent to a session in one reactor tick are merged into one frame.
+SESSION_COALESCE_MESSAGES = False
+
 # These are paths that will be prefixed to the paths given if the
 # immediately entered path fail to find a typeclass. It allows for
 # shorter input strings. They must either base off the game directory
@@ -337,6 +344,9 @@ CONDITION_FUNC_SET = "muddery.statements.default_statement_func_set.ConditionFun
 # Skill functions set
 SKILL_FUNC_SET = "muddery.statements.default_statement_func_set.SkillFuncSet"
 
+# Max number of compiled statements cached in each statement function set.
+STATEMENT_CACHE_SIZE = 1024
+
 
 ######################################################################
 # Default command sets
@@ -375,6 +385,10 @@ INSTALLED_APPS = INSTALLED_APPS + (ADDITIONAL_DATA_APP,)
 # attribute's category for data info
 DATA_KEY_CATEGORY = "data_key"
 
+# tag's category for unique objects' types, data keys are mirrored to tags
+# in DATA_KEY_CATEGORY
+UNIQUE_TYPE_CATEGORY = "unique_type"
+
 # data app name
 WORLD_DATA_APP = "worlddata"
 
@@ -396,6 +410,13 @@ LOCALIZED_STRINGS_MODEL = "localized_strings"
 # World data API's url path.
 WORLD_DATA_API_PATH = "worlddata/editor/api"
 
+# Number of records inserted in one query when importing data files.
+WORLD_DATA_IMPORT_BATCH_SIZE = 1000
+
+# Number of threads exporting tables when exporting all world data. Tables are
+# exported one by one if it is less than 2.
+WORLD_DATA_EXPORT_WORKERS = 1
+
 
 ###################################
 # permissions
@@ -425,6 +446,21 @@ HONOUR_COMBAT_HANDLER = "muddery.combat.honour_auto_combat_handler.HonourAutoCom
 
 AUTO_COMBAT_TIMEOUT = 60
 
+# Interval in seconds of the timer which runs all combats' timed actions.
+COMBAT_TICK_INTERVAL = 0.1
+
+
+###################################
+# properties settings
+###################################
+# Interval in seconds of writing changed mutable properties to db. Properties
+# are written immediately if it is 0.
+PROPERTIES_FLUSH_INTERVAL = 5
+
+# Changed properties are written to db immediately if they have not been
+# written in this time (in seconds).
+PROPERTIES_MAX_DIRTY_AGE = 30
+
 
 ###################################
 # honour settings
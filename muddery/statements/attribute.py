@@ -3,6 +3,7 @@ Set or get caller's attrubutes.
 """
 
 
+from muddery.utils import defines
 from muddery.statements.statement_function import StatementFunction
 
 
@@ -51,6 +52,7 @@ class FuncGetAttr(StatementFunction):
 
     key = "get_attr"
     const = True
+    depends = (defines.CHANGE_ATTRIBUTE,)
 
     def func(self):
         """
@@ -105,6 +107,7 @@ class FuncHasAttr(StatementFunction):
 
     key = "has_attr"
     const = True
+    depends = (defines.CHANGE_ATTRIBUTE,)
 
     def func(self):
         """
@@ -133,6 +136,7 @@ class FuncCheckAttr(StatementFunction):
 
     key = "check_attr"
     const = True
+    depends = (defines.CHANGE_ATTRIBUTE,)
 
     def func(self):
         """
@@ -3,6 +3,7 @@ Condition statements return a boolean value. They can be used in conditional sta
 """
 
 
+from muddery.utils import defines
 from muddery.statements.statement_function import StatementFunction
 
 
@@ -19,6 +20,7 @@ class FuncIsQuestInProgress(StatementFunction):
 
     key = "is_quest_in_progress"
     const = True
+    depends = (defines.CHANGE_QUEST,)
 
     def func(self):
         """
@@ -69,6 +71,7 @@ class FuncIsQuestFinished(StatementFunction):
 
     key = "is_quest_finished"
     const = True
+    depends = (defines.CHANGE_QUEST,)
 
     def func(self):
         """
@@ -94,6 +97,7 @@ class FuncHasObject(StatementFunction):
 
     key = "has_object"
     const = True
+    depends = (defines.CHANGE_OBJECT,)
 
     def func(self):
         """
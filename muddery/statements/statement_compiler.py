@@ -0,0 +1,425 @@
+"""
+Statement compiler.
+
+Statements are parsed once into a validated expression tree and cached by their
+source strings. Only a small set of operators is allowed in statements, and all
+statement functions are resolved from the function set at compile time.
+"""
+
+import ast, operator, traceback
+from collections import OrderedDict
+from evennia.utils import logger
+from muddery.utils.exception import MudderyError
+
+
+# Allowed operators.
+_UNARY_OPS = {ast.Not: operator.not_,
+              ast.USub: operator.neg,
+              ast.UAdd: operator.pos}
+
+_BIN_OPS = {ast.Add: operator.add,
+            ast.Sub: operator.sub,
+            ast.Mult: operator.mul,
+            ast.Div: getattr(operator, "div", operator.truediv),
+            ast.FloorDiv: operator.floordiv,
+            ast.Mod: operator.mod}
+
+_COMPARE_OPS = {ast.Eq: operator.eq,
+                ast.NotEq: operator.ne,
+                ast.Lt: operator.lt,
+                ast.LtE: operator.le,
+                ast.Gt: operator.gt,
+                ast.GtE: operator.ge,
+                ast.Is: operator.is_,
+                ast.IsNot: operator.is_not,
+                ast.In: lambda a, b: a in b,
+                ast.NotIn: lambda a, b: a not in b}
+
+# Names can be used without quotations.
+_CONST_NAMES = {"True": True,
+                "False": False,
+                "None": None}
+
+
+class StatementSyntaxError(MudderyError):
+    """
+    The statement can not be compiled.
+    """
+    pass
+
+
+class CompiledStatement(object):
+    """
+    A compiled statement.
+
+    A condition statement is a single expression. An action statement is a list of
+    expressions separated by ";", they are executed one by one.
+    """
+    def __init__(self, source, exprs=None, func_keys=None, unknown_funcs=None, error=None):
+        """
+        Args:
+            source: (string) statement's source string.
+            exprs: (list) compiled expressions.
+            func_keys: (set) keys of all functions used in the statement.
+            unknown_funcs: (set) keys of functions that can not be found in the function set.
+            error: (string) compile error's message. It is None if the statement is valid.
+        """
+        self.source = source
+        self.exprs = exprs or []
+        self.func_keys = func_keys or set()
+        self.unknown_funcs = unknown_funcs or set()
+        self.error = error
+
+    def evaluate(self, caller, obj, **kwargs):
+        """
+        Evaluate a condition statement.
+
+        Args:
+            caller: (object) statement's caller
+            obj: (object) caller's current target
+
+        Returns:
+            the value of the expression
+        """
+        if self.error:
+            return False
+
+        # a condition has only one expression
+        return self.exprs[0](caller, obj, kwargs)
+
+    def execute(self, caller, obj, **kwargs):
+        """
+        Execute all expressions of an action statement. If an expression raises an
+        exception, others will still be executed.
+
+        Args:
+            caller: (object) statement's caller
+            obj: (object) caller's current target
+
+        Returns:
+            (list) results of all expressions.
+        """
+        if self.error:
+            return []
+
+        results = []
+        for expr in self.exprs:
+            try:
+                results.append(expr(caller, obj, kwargs))
+            except Exception, e:
+                logger.log_errmsg("Exec statement error: %s %s" % (self.source, repr(e)))
+                traceback.print_exc()
+                results.append(None)
+        return results
+
+
+class StatementCompiler(object):
+    """
+    Compiles statements with functions in a function set and caches compiled
+    statements with LRU eviction. Statements in world data can be preloaded,
+    preloaded statements will never be evicted.
+    """
+    def __init__(self, func_set, cache_size=1024):
+        """
+        Args:
+            func_set: (object) statement function set.
+            cache_size: (int) max number of cached statements.
+        """
+        self.func_set = func_set
+        self.cache_size = cache_size
+        self.preloaded = {}
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """
+        Clear the cache and preloaded statements.
+        """
+        self.preloaded = {}
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def compile_condition(self, source):
+        """
+        Get a compiled condition statement. A condition is a single expression.
+
+        Args:
+            source: (string) condition's source string.
+
+        Returns:
+            (CompiledStatement) the compiled statement.
+        """
+        return self._get_compiled(source, False)
+
+    def compile_actions(self, source):
+        """
+        Get a compiled action statement. Actions are expressions separated by ";".
+        A function without args can omit its parentheses.
+
+        Args:
+            source: (string) action's source string.
+
+        Returns:
+            (CompiledStatement) the compiled statement.
+        """
+        return self._get_compiled(source, True)
+
+    def preload(self, source, is_action):
+        """
+        Compile a statement and keep it until the compiler is cleared. Errors
+        are not logged here, the caller should check the compiled statement.
+
+        Args:
+            source: (string) statement's source string.
+            is_action: (boolean) the statement is an action or a condition.
+
+        Returns:
+            (CompiledStatement) the compiled statement.
+        """
+        cache_key = (is_action, source)
+        compiled = self.preloaded.get(cache_key)
+        if compiled is None:
+            compiled = self._compile(source, is_action)
+            self.preloaded[cache_key] = compiled
+        return compiled
+
+    def _get_compiled(self, source, is_action):
+        """
+        Get a compiled statement from the cache or compile it.
+        """
+        cache_key = (is_action, source)
+        compiled = self.preloaded.get(cache_key)
+        if compiled is not None:
+            self.hits += 1
+            return compiled
+
+        compiled = self.cache.pop(cache_key, None)
+        if compiled is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            compiled = self._compile(source, is_action)
+            if compiled.error:
+                logger.log_errmsg("Statement error: can not compile %s: %s" % (source, compiled.error))
+            for func_key in compiled.unknown_funcs:
+                logger.log_errmsg("Statement error: Can not find function: %s of %s." % (func_key, source))
+
+            if len(self.cache) >= self.cache_size:
+                # remove the least recently used statement
+                self.cache.popitem(last=False)
+
+        # put it at the end of the cache
+        self.cache[cache_key] = compiled
+        return compiled
+
+    def _compile(self, source, is_action):
+        """
+        Compile a statement.
+        """
+        func_keys = set()
+        unknown_funcs = set()
+        try:
+            tree = ast.parse(source.strip(), mode="exec" if is_action else "eval")
+            if is_action:
+                nodes = []
+                for stmt in tree.body:
+                    if not isinstance(stmt, ast.Expr):
+                        raise StatementSyntaxError("only expressions can be used in actions")
+                    nodes.append(stmt.value)
+            else:
+                nodes = [tree.body]
+
+            exprs = [self._compile_node(node, is_action, func_keys, unknown_funcs) for node in nodes]
+        except (SyntaxError, StatementSyntaxError), e:
+            return CompiledStatement(source, error=str(e))
+
+        return CompiledStatement(source, exprs, func_keys, unknown_funcs)
+
+    def _compile_node(self, node, is_action, func_keys, unknown_funcs):
+        """
+        Compile an expression node into a callable which takes (caller, obj, kwargs).
+        """
+        if isinstance(node, ast.Call):
+            return self._compile_call(node, func_keys, unknown_funcs)
+
+        if isinstance(node, ast.Name):
+            if node.id in _CONST_NAMES:
+                return _const(_CONST_NAMES[node.id])
+            elif is_action:
+                # functions without args in actions
+                return self._compile_function(node.id, (), func_keys, unknown_funcs)
+            raise StatementSyntaxError("unknown name %s" % node.id)
+
+        if isinstance(node, ast.BoolOp):
+            values = [self._compile_node(value, False, func_keys, unknown_funcs) for value in node.values]
+            if isinstance(node.op, ast.And):
+                return _and(values)
+            else:
+                return _or(values)
+
+        if isinstance(node, ast.UnaryOp):
+            op = _UNARY_OPS.get(type(node.op))
+            if not op:
+                raise StatementSyntaxError("operator %s is not allowed" % type(node.op).__name__)
+            operand = self._compile_node(node.operand, False, func_keys, unknown_funcs)
+            return _unary(op, operand)
+
+        if isinstance(node, ast.BinOp):
+            op = _BIN_OPS.get(type(node.op))
+            if not op:
+                raise StatementSyntaxError("operator %s is not allowed" % type(node.op).__name__)
+            left = self._compile_node(node.left, False, func_keys, unknown_funcs)
+            right = self._compile_node(node.right, False, func_keys, unknown_funcs)
+            return _binary(op, left, right)
+
+        if isinstance(node, ast.Compare):
+            ops = []
+            for op_node in node.ops:
+                op = _COMPARE_OPS.get(type(op_node))
+                if not op:
+                    raise StatementSyntaxError("operator %s is not allowed" % type(op_node).__name__)
+                ops.append(op)
+            left = self._compile_node(node.left, False, func_keys, unknown_funcs)
+            comparators = [self._compile_node(comparator, False, func_keys, unknown_funcs)
+                           for comparator in node.comparators]
+            return _compare(left, ops, comparators)
+
+        # Other nodes must be literals.
+        try:
+            return _const(ast.literal_eval(node))
+        except ValueError:
+            raise StatementSyntaxError("%s is not allowed" % type(node).__name__)
+
+    def _compile_call(self, node, func_keys, unknown_funcs):
+        """
+        Compile a function call. Function's args must be literals.
+        """
+        if node.keywords or getattr(node, "starargs", None) or getattr(node, "kwargs", None):
+            raise StatementSyntaxError("only positional args can be used in functions")
+
+        func_key = _get_func_name(node.func)
+        try:
+            args = tuple(ast.literal_eval(arg) for arg in node.args)
+        except ValueError:
+            raise StatementSyntaxError("args of %s must be literals" % func_key)
+        return self._compile_function(func_key, args, func_keys, unknown_funcs)
+
+    def _compile_function(self, func_key, args, func_keys, unknown_funcs):
+        """
+        Resolve the function's class from the function set.
+        """
+        func_keys.add(func_key)
+        func_class = self.func_set.get_func_class(func_key)
+        if not func_class:
+            unknown_funcs.add(func_key)
+            return _const(None)
+
+        def function(caller, obj, kwargs):
+            try:
+                func_obj = func_class()
+                func_obj.set(caller, obj, args, **kwargs)
+                return func_obj.func()
+            except Exception, e:
+                logger.log_errmsg("Exec function error: %s%s %s" % (func_key, repr(args), repr(e)))
+                traceback.print_exc()
+                return None
+
+        depends = func_class.depends
+        if not func_class.const or depends is None:
+            return _volatile(function)
+
+        try:
+            memo_key = (func_key, args)
+            hash(memo_key)
+        except TypeError:
+            # args are not hashable
+            return _volatile(function)
+
+        def memoized(caller, obj, kwargs):
+            # memoize results on the caller
+            memo = getattr(caller, "statement_memo", None)
+            if memo is None:
+                return function(caller, obj, kwargs)
+            if kwargs:
+                memo.volatile += 1
+                return function(caller, obj, kwargs)
+            return memo.get(memo_key, depends, lambda: function(caller, obj, kwargs))
+        return memoized
+
+
+def _get_func_name(node):
+    """
+    Get a function's key. The key may be a dotted name.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return _get_func_name(node.value) + "." + node.attr
+    raise StatementSyntaxError("invalid function name")
+
+
+def _const(value):
+    return lambda caller, obj, kwargs: value
+
+
+def _volatile(function):
+    # count calls whose results can not be memoized, so the caller knows
+    # whether a statement's result can be memoized
+    def volatile(caller, obj, kwargs):
+        memo = getattr(caller, "statement_memo", None)
+        if memo is not None:
+            memo.volatile += 1
+        return function(caller, obj, kwargs)
+    return volatile
+
+
+def _and(values):
+    def function(caller, obj, kwargs):
+        result = True
+        for value in values:
+            result = value(caller, obj, kwargs)
+            if not result:
+                return result
+        return result
+    return function
+
+
+def _or(values):
+    def function(caller, obj, kwargs):
+        result = False
+        for value in values:
+            result = value(caller, obj, kwargs)
+            if result:
+                return result
+        return result
+    return function
+
+
+def _unary(op, operand):
+    return lambda caller, obj, kwargs: op(operand(caller, obj, kwargs))
+
+
+def _binary(op, left, right):
+    return lambda caller, obj, kwargs: op(left(caller, obj, kwargs), right(caller, obj, kwargs))
+
+
+def _compare(left, ops, comparators):
+    if len(ops) == 1:
+        op = ops[0]
+        right = comparators[0]
+        return lambda caller, obj, kwargs: op(left(caller, obj, kwargs), right(caller, obj, kwargs))
+
+    pairs = list(zip(ops, comparators))
+
+    def function(caller, obj, kwargs):
+        # chained comparisons, such as a < b < c
+        left_value = left(caller, obj, kwargs)
+        for op, comparator in pairs:
+            right_value = comparator(caller, obj, kwargs)
+            if not op(left_value, right_value):
+                return False
+            left_value = right_value
+        return True
+    return function
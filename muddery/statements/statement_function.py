@@ -21,6 +21,12 @@ class StatementFunction(object):
     # only const functions can be used in conditions.
     const = False
 
+    # Changes of the caller's state that the result depends on, see defines.CHANGE_*.
+    # If a const function's result only depends on these changes, its result will be
+    # memoized on the caller until one of these changes happens. If it is None, the
+    # result will never be memoized.
+    depends = None
+
     def __init__(self):
         """
         Init default attributes.
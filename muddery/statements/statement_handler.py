@@ -2,102 +2,34 @@
 This model handle statements.
 """
 
-import re, ast, traceback
+import traceback
 from evennia.utils import logger
 from evennia.utils.utils import class_from_module
+from django.apps import apps
 from django.conf import settings
-
-
-#re_words = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)|("(.*)")')
-re_function = re.compile(r'[a-zA-Z_][a-zA-Z0-9_\.]*\(.*?\)')
-def exec_condition(func_set, condition, caller, obj, **kwargs):
-    """
-    Execute the statements.
-
-    Args:
-        func_set: (object) condition function set
-        condition: (string) condition statement
-        caller: (object) statement's caller
-        obj: (object) caller's target
-
-    Returns:
-        result
-    """
-    func = get_condition_func(func_set, caller, obj, **kwargs)
-    return re_function.sub(func, condition)
-
-
-def get_condition_func(func_set, caller, obj, **kwargs):
-    """
-    Get a function used in re's sub.
-
-    Args:
-        func_set: (object) condition function set
-        caller: (object) statement's caller
-        obj: (object) caller's target
-
-    Returns:
-        function
-    """
-    def function(word):
-        """
-        Do function.
-
-        Args:
-            word: (string) condition function
-
-        Returns:
-            (string) "True" or "False"
-        """
-        func_word = word.group()
-
-        try:
-            result = exec_function(func_set, func_word, caller, obj, **kwargs)
-            if result:
-                return "True"
-            else:
-                return "False"
-        except Exception, e:
-            logger.log_errmsg("Exec function error: %s %s" % (function, repr(e)))
-            traceback.print_exc()
-            return "None"
-
-    return function
-
-
-def exec_function(func_set, func_word, caller, obj, **kwargs):
-    """
-    Do function.
-
-    Args:
-        func_set: (object) function set
-        func_word: (string) function string, such as: func("value")
-        caller: (object) statement's caller
-        obj: (object) caller's target
-
-    Returns:
-        function result
-    """
-
-    # separate function's key and args
-    try:
-        pos = func_word.index("(")
-        func_key = func_word[:pos]
-        func_args = ast.literal_eval(func_word[pos:])
-        if type(func_args) != tuple:
-            func_args = (func_args,)
-    except ValueError:
-        func_key = func_word
-        func_args = ()
-
-    func_class = func_set.get_func_class(func_key)
-    if not func_class:
-        logger.log_errmsg("Statement error: Can not find function: %s of %s." % (func_key, func_word))
-        return
-
-    func_obj = func_class()
-    func_obj.set(caller, obj, func_args, **kwargs)
-    return func_obj.func()
+from muddery.statements.statement_compiler import StatementCompiler
+
+
+# Statements in world data.
+# (table name, field name, statement type)
+WORLD_DATA_STATEMENTS = (
+    ("world_exits", "condition", "condition"),
+    ("world_objects", "condition", "condition"),
+    ("world_npcs", "condition", "condition"),
+    ("shops", "condition", "condition"),
+    ("shop_goods", "condition", "condition"),
+    ("skills", "function", "skill"),
+    ("quests", "condition", "condition"),
+    ("quests", "action", "action"),
+    ("exit_locks", "unlock_condition", "condition"),
+    ("object_creators", "loot_condition", "condition"),
+    ("creator_loot_list", "condition", "condition"),
+    ("character_loot_list", "condition", "condition"),
+    ("quest_reward_list", "condition", "condition"),
+    ("event_data", "condition", "condition"),
+    ("dialogues", "condition", "condition"),
+    ("condition_desc", "condition", "condition"),
+)
 
 
 class StatementHandler(object):
@@ -118,6 +50,57 @@ class StatementHandler(object):
         skill_func_set_class = class_from_module(settings.SKILL_FUNC_SET)
         self.skill_func_set = skill_func_set_class()
 
+        # statement compilers
+        cache_size = settings.STATEMENT_CACHE_SIZE
+        self.action_compiler = StatementCompiler(self.action_func_set, cache_size)
+        self.condition_compiler = StatementCompiler(self.condition_func_set, cache_size)
+        self.skill_compiler = StatementCompiler(self.skill_func_set, cache_size)
+
+    def reload(self):
+        """
+        Compile all statements in world data and report errors, so statements
+        will not be parsed when handling players' requests.
+
+        Returns:
+            (int) number of invalid statements.
+        """
+        self.action_compiler.clear()
+        self.condition_compiler.clear()
+        self.skill_compiler.clear()
+
+        compilers = {"condition": (self.condition_compiler, False, settings.CONDITION_FUNC_SET),
+                     "action": (self.action_compiler, True, settings.ACTION_FUNC_SET),
+                     "skill": (self.skill_compiler, True, settings.SKILL_FUNC_SET)}
+
+        count = 0
+        errors = 0
+        for table_name, field_name, statement_type in WORLD_DATA_STATEMENTS:
+            try:
+                model = apps.get_model(settings.WORLD_DATA_APP, table_name)
+                sources = model.objects.exclude(**{field_name: ""}).values_list(field_name, flat=True).distinct()
+                sources = list(sources)
+            except Exception, e:
+                logger.log_errmsg("Can not load statements from %s.%s: %s" % (table_name, field_name, e))
+                continue
+
+            compiler, is_action, func_set_path = compilers[statement_type]
+            for source in sources:
+                compiled = compiler.preload(source, is_action)
+                count += 1
+
+                if compiled.error:
+                    errors += 1
+                    logger.log_errmsg("Statement error in %s.%s: %s: %s" %
+                                      (table_name, field_name, source, compiled.error))
+                elif compiled.unknown_funcs:
+                    errors += 1
+                    logger.log_errmsg("Statement error in %s.%s: %s: can not find %s in %s." %
+                                      (table_name, field_name, source,
+                                       ", ".join(sorted(compiled.unknown_funcs)), func_set_path))
+
+        logger.log_info("Compiled %d statements, %d errors." % (count, errors))
+        return errors
+
     def do_action(self, action, caller, obj, **kwargs):
         """
         Do a function.
@@ -134,15 +117,7 @@ class StatementHandler(object):
             return
 
         # execute the statement
-        functions = action.split(";")
-        for function in functions:
-            try:
-                exec_function(self.action_func_set, function, caller, obj, **kwargs)
-            except Exception, e:
-                logger.log_errmsg("Exec function error: %s %s" % (function, repr(e)))
-                traceback.print_exc()
-
-        return
+        self.action_compiler.compile_actions(action).execute(caller, obj, **kwargs)
 
     def do_skill(self, action, caller, obj, **kwargs):
         """
@@ -160,18 +135,8 @@ class StatementHandler(object):
             return
 
         # execute the statement
-        functions = action.split(";")
-        results = []
-        for function in functions:
-            try:
-                result = exec_function(self.skill_func_set, function, caller, obj, **kwargs)
-                if result:
-                    results.append(result)
-            except Exception, e:
-                logger.log_errmsg("Exec function error: %s %s" % (function, repr(e)))
-                traceback.print_exc()
-
-        return results
+        results = self.skill_compiler.compile_actions(action).execute(caller, obj, **kwargs)
+        return [result for result in results if result]
 
     def match_condition(self, condition, caller, obj, **kwargs):
         """
@@ -188,14 +153,11 @@ class StatementHandler(object):
         if not condition:
             return True
 
-        # calculate functions first
-        exec_string = exec_condition(self.condition_func_set, condition, caller, obj, **kwargs)
-
         try:
             # do condition
-            result = eval(exec_string)
+            result = self.condition_compiler.compile_condition(condition).evaluate(caller, obj, **kwargs)
         except Exception, e:
-            logger.log_errmsg("Exec function error: %s %s" % (function, repr(e)))
+            logger.log_errmsg("Exec condition error: %s %s" % (condition, repr(e)))
             traceback.print_exc()
             return False
 
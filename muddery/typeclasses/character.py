@@ -11,7 +11,7 @@ creation commands.
 from __future__ import print_function
 
 import time, ast, traceback
-from twisted.internet import reactor, task
+from twisted.internet import reactor
 from twisted.internet.task import deferLater
 from django.conf import settings
 from evennia.objects.objects import DefaultCharacter
@@ -25,11 +25,14 @@ from muddery.worlddata.dao.loot_list_mapper import CHARACTER_LOOT_LIST
 from muddery.worlddata.dao.object_properties_mapper import OBJECT_PROPERTIES
 from muddery.worlddata.dao.default_skills_mapper import DEFAULT_SKILLS
 from muddery.utils.builder import build_object
+from muddery.combat.combat_scheduler import COMBAT_SCHEDULER
 from muddery.utils.loot_handler import LootHandler
 from muddery.utils import defines
 from muddery.utils.game_settings import GAME_SETTINGS
 from muddery.utils.utils import search_obj_data_key
 from muddery.utils.data_field_handler import DataFieldHandler
+from muddery.utils.statement_memo_handler import StatementMemoHandler
+from muddery.utils.skill_handler import SkillHandler
 from muddery.utils.localized_strings_handler import _
 
 
@@ -65,6 +68,16 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
     def body_properties_handler(self):
         return DataFieldHandler(self)
 
+    # memoized results of statement functions
+    @lazy_property
+    def statement_memo(self):
+        return StatementMemoHandler(self)
+
+    # learned skills
+    @lazy_property
+    def skill_handler(self):
+        return SkillHandler(self)
+
     # @property body stores character's body properties before using equipments and skills.
     def __body_get(self):
         """
@@ -111,9 +124,6 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             self.db.position_names = {}
         self.reset_equip_positions()
 
-        if not self.attributes.has("skills"):
-            self.db.skills = {}
-
         # set quests
         if not self.attributes.has("finished_quests"):
             self.db.finished_quests = set()
@@ -156,10 +166,6 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         
         # stop auto casting
         self.stop_auto_combat_skill()
-        
-        # delete all skills
-        for skill in self.db.skills.values():
-            skill.delete()
 
         # delete all contents
         for content in self.contents:
@@ -326,6 +332,7 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             event_key: (string) event's key
         """
         self.db.closed_events.add(event_key)
+        self.statement_memo.changed(defines.CHANGE_EVENT)
 
     def is_event_closed(self, event_key):
         """
@@ -379,6 +386,9 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
                 self.custom_properties_handler.add(key, value)
                 changes[key] = increment
 
+        if any(changes.values()):
+            self.statement_memo.changed(defines.CHANGE_PROPERTY)
+
         return changes
 
     def set_properties(self, values):
@@ -418,6 +428,9 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             setattr(self.prop, key, value)
             actual[key] = value
 
+        if actual:
+            self.statement_memo.changed(defines.CHANGE_PROPERTY)
+
         return actual
 
     def get_combat_status(self):
@@ -472,17 +485,14 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         default_skill_ids = set([record.skill for record in skill_records])
 
         # remove old default skills
-        for key, skill in self.db.skills.iteritems():
-            if not skill:
-                del self.db.skills[key]
-            elif skill.is_default() and key not in default_skill_ids:
+        for key, skill in self.skill_handler.all().items():
+            if skill.is_default() and key not in default_skill_ids:
                 # remove this skill
-                skill.delete()
-                del self.db.skills[key]
+                self.skill_handler.remove(key)
 
         # add new default skills
         for skill_record in skill_records:
-            if skill_record.skill not in self.db.skills:
+            if not self.skill_handler.has(skill_record.skill):
                 self.learn_skill(skill_record.skill, True, True)
 
     def load_default_objects(self):
@@ -521,33 +531,25 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         Returns:
             (boolean) learned skill
         """
-        if skill_key in self.db.skills:
+        if self.skill_handler.has(skill_key):
             self.msg({"msg": _("You have already learned this skill.")})
             return False
 
-        # Create skill object.
-        skill_obj = build_object(skill_key)
-        if not skill_obj:
+        # Store new skill.
+        skill = self.skill_handler.add(skill_key, is_default)
+        if not skill:
             self.msg({"msg": _("Can not learn this skill.")})
             return False
 
-        # set default
-        if is_default:
-            skill_obj.set_default(is_default)
-
-        # Store new skill.
-        skill_obj.set_owner(self)
-        self.db.skills[skill_key] = skill_obj
-
         # If it is a passive skill, player's status may change.
-        if skill_obj.passive:
+        if skill.passive:
             self.refresh_properties()
 
         # Notify the player
         if not silent and self.has_account:
             self.show_status()
             self.show_skills()
-            self.msg({"msg": _("You learned skill {c%s{n.") % skill_obj.get_name()})
+            self.msg({"msg": _("You learned skill {c%s{n.") % skill.get_name()})
 
         return True
 
@@ -565,11 +567,11 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             self.msg({"skill_cast": {"cast": _("Global cooling down!")}})
             return
 
-        if skill_key not in self.db.skills:
+        skill = self.skill_handler.get(skill_key)
+        if not skill:
             self.msg({"skill_cast": {"cast": _("You do not have this skill.")}})
             return
 
-        skill = self.db.skills[skill_key]
         if not skill.cast_skill(target, passive=False):
             return
 
@@ -607,7 +609,7 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         """
         Cast all passive skills.
         """
-        for skill in self.db.skills.values():
+        for skill in self.skill_handler.all().values():
             if skill.passive:
                 skill.cast_skill(self, passive=True)
                 
@@ -615,22 +617,21 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
         """
         Start auto cast skill.
         """
-        if self.auto_cast_loop and self.auto_cast_loop.running:
+        if self.auto_cast_loop and self.auto_cast_loop.active():
             return
 
         # Cast a skill immediately
         # self.auto_cast_skill()
 
         # Set timer of auto cast.
-        self.auto_cast_loop = task.LoopingCall(self.auto_cast_skill)
-        self.auto_cast_loop.start(self.auto_cast_skill_cd)
+        self.auto_cast_loop = COMBAT_SCHEDULER.call_repeatedly(self.auto_cast_skill_cd, self.auto_cast_skill)
 
     def stop_auto_combat_skill(self):
         """
         Stop auto cast skill.
         """
-        if hasattr(self, "auto_cast_loop") and self.auto_cast_loop and self.auto_cast_loop.running:
-            self.auto_cast_loop.stop()
+        if hasattr(self, "auto_cast_loop") and self.auto_cast_loop and self.auto_cast_loop.active():
+            self.auto_cast_loop.cancel()
 
 
     ########################################
@@ -835,14 +836,14 @@ class MudderyCharacter(TYPECLASS("OBJECT"), DefaultCharacter):
             (list) available commands for combat
         """
         commands = []
-        for key, skill in self.db.skills.iteritems():
+        for key, skill in self.skill_handler.all().iteritems():
             if skill.passive:
                 # exclude passive skills
                 continue
 
             command = {"name": skill.get_name(),
                        "key": key,
-                       "icon": getattr(skill, "icon", None)}
+                       "icon": skill.icon}
 
             commands.append(command)
 
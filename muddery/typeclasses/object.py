@@ -26,8 +26,10 @@ from muddery.utils.exception import MudderyError
 from muddery.utils.localized_strings_handler import _
 from muddery.utils.game_settings import GAME_SETTINGS
 from muddery.utils.desc_handler import DESC_HANDLER
+from muddery.utils.data_key_registry import DATA_KEY_REGISTRY
 from muddery.typeclasses.base_typeclass import BaseTypeclass
 from muddery.mappings.typeclass_set import TYPECLASS
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 from muddery.worlddata.dao.object_properties_mapper import OBJECT_PROPERTIES
 
 
@@ -39,6 +41,9 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
     typeclass_name = _("Object", "typeclasses")
     model_name = "objects"
 
+    # the object's data key, it is read from attributes at the first time
+    cached_data_key = None
+
     # initialize all handlers in a lazy fashion
     @lazy_property
     def event(self):
@@ -79,6 +84,26 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
     def custom_properties_handler(self):
         return PropertiesHandler(self)
 
+    def at_idmapper_flush(self):
+        """
+        Write changed properties to db before the object is removed from the
+        cache.
+        """
+        handler = self.__dict__.get("custom_properties_handler")
+        if handler:
+            handler.flush()
+        return super(MudderyBaseObject, self).at_idmapper_flush()
+
+    def delete(self):
+        """
+        Remove the object's data key from the registry after it is deleted.
+        """
+        obj_id = self.id
+        result = super(MudderyBaseObject, self).delete()
+        if result:
+            DATA_KEY_REGISTRY.remove(obj_id)
+        return result
+
     # @property custom stores object's custom data.
     def __prop_get(self):
         """
@@ -217,6 +242,9 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
         # call data_key hook
         self.after_data_key_changed()
 
+        # update the object's data in its location
+        self.refresh_in_location()
+
     def load_system_data(self, key):
         """
         Get object's system data from database.
@@ -234,15 +262,9 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
                 raise MudderyError("No data key.")
 
         for data_model in self.get_models():
-            # Get db model
-            model_obj = apps.get_model(settings.WORLD_DATA_APP, data_model)
-            if not model_obj:
-                logger.log_errmsg("%s can not open model %s" % (key, data_model))
-                continue
-
             # Get data record.
             try:
-                data = model_obj.objects.get(key=key)
+                data = WORLD_DATA.get(data_model, key=key)
             except Exception, e:
                 logger.log_errmsg("%s can not find key %s" % (key, key))
                 continue
@@ -409,12 +431,23 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
         if self.destination:
             self.flush_from_cache()
 
+        # update the object's name in its location
+        self.refresh_in_location()
+
     def get_name(self):
         """
         Get player character's name.
         """
         return self.name
 
+    def refresh_in_location(self):
+        """
+        Update the object's name and data cached in its location.
+        """
+        location = self.location
+        if location and hasattr(location, "update_surrounding"):
+            location.update_surrounding(self)
+
     def set_location(self, location):
         """
         Set object's location.
@@ -539,7 +572,12 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
         Args:
             default: (string) default value if can not find the data key.
         """
-        key = self.attributes.get(key="key", category=settings.DATA_KEY_CATEGORY, strattr=True)
+        # the key is cached, it is only changed by utils.set_obj_data_key()
+        key = self.cached_data_key
+        if key is None:
+            key = self.attributes.get(key="key", category=settings.DATA_KEY_CATEGORY, strattr=True)
+            self.cached_data_key = key or ""
+
         if not key:
             key = default
         return key
@@ -659,6 +697,7 @@ class MudderyBaseObject(BaseTypeclass, DefaultObject):
             except Exception, e:
                 text = json.dumps({"err": "There is an error occurred while outputing messages."})
                 logger.log_errmsg("json.dumps failed: %s" % e)
+            options["json"] = True
 
         options["raw"] = True
 
@@ -12,11 +12,14 @@ from __future__ import print_function
 
 import random
 from django.conf import settings
-from django.apps import apps
+from django.db import transaction
 from muddery.utils import defines, utils
 from muddery.utils.builder import build_object, get_object_record
 from muddery.utils.equip_type_handler import EQUIP_TYPE_HANDLER
 from muddery.utils.quest_handler import QuestHandler
+from muddery.utils.inventory_handler import InventoryHandler
+from muddery.utils.data_key_registry import DATA_KEY_REGISTRY
+from muddery.utils.state_sync_handler import StateSyncHandler
 from muddery.utils.statement_attribute_handler import StatementAttributeHandler
 from muddery.utils.exception import MudderyError
 from muddery.utils.localized_strings_handler import _
@@ -24,9 +27,11 @@ from muddery.utils.game_settings import GAME_SETTINGS
 from muddery.utils.dialogue_handler import DIALOGUE_HANDLER
 from muddery.utils.honours_handler import HONOURS_HANDLER
 from muddery.utils.match_queue_handler import MATCH_QUEUE_HANDLER
+from muddery.utils.world_map_handler import WORLD_MAP
 from muddery.dao.honours_mapper import HONOURS_MAPPER
 from muddery.worlddata.dao.default_objects_mapper import DEFAULT_OBJECTS
 from muddery.worlddata.dao.properties_dict_mapper import PROPERTIES_DICT
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 from evennia.utils.utils import lazy_property
 from evennia.utils import logger
 from evennia.comms.models import ChannelDB
@@ -61,6 +66,14 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
     def quest_handler(self):
         return QuestHandler(self)
 
+    @lazy_property
+    def inventory_handler(self):
+        return InventoryHandler(self)
+
+    @lazy_property
+    def state_sync(self):
+        return StateSyncHandler(self)
+
     # attributes used in statements
     @lazy_property
     def statement_attr(self):
@@ -143,9 +156,12 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         
         """
         super(MudderyPlayerCharacter, self).at_object_receive(moved_obj, source_location)
+        self.statement_memo.changed(defines.CHANGE_OBJECT)
+        self.inventory_handler.add(moved_obj)
 
         # send latest inventory data to player
-        self.msg({"inventory": self.return_inventory()})
+        if not self.inventory_handler.batching:
+            self.show_inventory()
     
     def at_object_left(self, moved_obj, target_location):
         """
@@ -157,9 +173,12 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         
         """
         super(MudderyPlayerCharacter, self).at_object_left(moved_obj, target_location)
-        
+        self.statement_memo.changed(defines.CHANGE_OBJECT)
+        self.inventory_handler.remove(moved_obj)
+
         # send latest inventory data to player
-        self.msg({"inventory": self.return_inventory()})
+        if not self.inventory_handler.batching:
+            self.show_inventory()
 
     def at_before_move(self, destination, **kwargs):
         """
@@ -198,17 +217,21 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
                              "icon": getattr(self, "icon", None)}})
 
         # send character's data to player
-        message = {"status": self.return_status(),
-                   "equipments": self.return_equipments(),
-                   "inventory": self.return_inventory(),
-                   "skills": self.return_skills(),
-                   "quests": self.quest_handler.return_quests(),
-                   "revealed_map": self.get_revealed_map(),
-                   "channels": self.available_channels}
-        self.msg(message)
+        states = {"status": self.return_status(),
+                  "equipments": self.return_equipments(),
+                  "inventory": self.return_inventory(),
+                  "skills": self.return_skills(),
+                  "quests": self.quest_handler.return_quests()}
+        self.state_sync.clear()
+        self.state_sync.send(states,
+                             revealed_map=self.get_revealed_map(),
+                             channels=self.available_channels)
 
         self.show_location()
 
+        if self.location and hasattr(self.location, "add_listener"):
+            self.location.add_listener(self)
+
         # notify its location
         if not self.solo_mode:
             if self.location:
@@ -242,14 +265,27 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
                           "name": self.get_name()}
                 self.location.msg_contents({"player_offline":change}, exclude=self)
 
+        # do not receive room messages any more
+        if self.location and hasattr(self.location, "remove_listener"):
+            self.location.remove_listener(self)
+
         MATCH_QUEUE_HANDLER.remove(self)
 
+        # send full data when puppeted again
+        self.state_sync.clear()
+
+        # write changed properties to db
+        self.custom_properties_handler.flush()
+
     def set_nickname(self, nickname):
         """
         Set player character's nickname.
         """
         self.db.nickname = nickname
 
+        # update the character's name in its location
+        self.refresh_in_location()
+
     def get_name(self):
         """
         Get player character's name.
@@ -316,35 +352,15 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
                           ...}
             }
         """
-        rooms = {}
-        exits = {}
-
-        for room_key in self.db.revealed_map:
-            # get room's information
-            room = utils.search_obj_data_key(room_key)
-            if room:
-                room = room[0]
-                rooms[room_key] = {"name": room.get_name(),
-                                   "icon": room.icon,
-                                   "area": room.location and room.location.get_data_key(),
-                                   "pos": room.position}
-
-                new_exits = room.get_exits()
-                if new_exits:
-                    exits.update(new_exits)
-
-        for path in exits.values():
-            # add room's neighbours
-            if not path["to"] in rooms:
-                neighbour = utils.search_obj_data_key(path["to"])
-                if neighbour:
-                    neighbour = neighbour[0]                    
-                    rooms[neighbour.get_data_key()] = {"name": neighbour.get_name(),
-                                                       "icon": neighbour.icon,
-                                                       "area": neighbour.location and neighbour.location.get_data_key(),
-                                                       "pos": neighbour.position}
-                    
-        return {"rooms": rooms, "exits": exits}
+        # The map is cached and extended when new rooms are revealed. It is
+        # made again when the world map is reloaded.
+        cache = self.ndb.revealed_map
+        if cache and cache[0] == WORLD_MAP.version:
+            return cache[1]
+
+        revealed_map = WORLD_MAP.get_map(self.db.revealed_map)
+        self.ndb.revealed_map = (WORLD_MAP.version, revealed_map)
+        return revealed_map
 
     def show_location(self):
         """
@@ -381,25 +397,22 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
                 # reveal map
                 self.db.revealed_map.add(self.location.get_data_key())
 
-                rooms = {location_key: {"name": self.location.get_name(),
-                                        "icon": self.location.icon,
-                                        "area": self.location.location and self.location.location.get_data_key(),
-                                        "pos": self.location.position}}
-
-                exits = self.location.get_exits()
-
-                for path in exits.values():
-                    # add room's neighbours
-                    if not path["to"] in rooms:
-                        neighbour = utils.search_obj_data_key(path["to"])
-                        if neighbour:
-                            neighbour = neighbour[0]
-
-                            rooms[neighbour.get_data_key()] = {"name": neighbour.get_name(),
-                                                               "icon": neighbour.icon,
-                                                               "area": neighbour.location and neighbour.location.get_data_key(),
-                                                               "pos": neighbour.position}
-                    
+                reveal_map = WORLD_MAP.get_map([location_key])
+                rooms = reveal_map["rooms"]
+                exits = reveal_map["exits"]
+                if location_key not in rooms:
+                    # the room is not in world data
+                    rooms[location_key] = {"name": self.location.get_name(),
+                                           "icon": self.location.icon,
+                                           "area": self.location.location and self.location.location.get_data_key(),
+                                           "pos": self.location.position}
+
+                # extend the cached map
+                cache = self.ndb.revealed_map
+                if cache and cache[0] == WORLD_MAP.version:
+                    cache[1]["rooms"].update(rooms)
+                    cache[1]["exits"].update(exits)
+
                 msg["reveal_map"] = {"rooms": rooms, "exits": exits}
 
             # get appearance
@@ -421,13 +434,12 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         # default objects
         object_records = DEFAULT_OBJECTS.filter(model_name)
 
-        default_object_ids = set([record.object for record in object_records])
-
         # add new default objects
-        for object_record in object_records:
-            if not self.search_inventory(object_record.object):
-                obj_list = [{"object": object_record.object, "number": object_record.number}]
-                self.receive_objects(obj_list, mute=True)
+        obj_list = [{"object": object_record.object, "number": object_record.number}
+                    for object_record in object_records
+                    if not self.inventory_handler.has(object_record.object)]
+        if obj_list:
+            self.receive_objects(obj_list, mute=True)
 
     def receive_objects(self, obj_list, mute=False, combat=False):
         """
@@ -449,136 +461,147 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         reject_reason = {}      # the reasons of why objects have been rejected
 
         # check what the character has now
+        # if the character has more than one item of the same kind,
+        # get the smallest stack.
         inventory = {}
-        for item in self.contents:
-            key = item.get_data_key()
-            if key in inventory:
-                # if the character has more than one item of the same kind,
-                # get the smallest stack.
-                if inventory[key].db.number > item.db.number:
-                    inventory[key] = item
-            else:
-                inventory[key] = item
-
         for obj in obj_list:
             key = obj["object"]
-            available = obj["number"]
-            number = available
-            accepted = 0
-            name = ""
-            unique = False
-
-            if number == 0:
-                # it is an empty object
-                if key in inventory:
-                    # already has this object
-                    accepted_keys[key] = 0
-                    accepted_names[name] = 0
-                    continue
-
-                object_record = None
-                try:
-                    common_model_name = TYPECLASS("COMMON_OBJECT").model_name
-                    common_model_obj = apps.get_model(settings.WORLD_DATA_APP, common_model_name)
-                    object_record = common_model_obj.objects.get(key=key)
-                except Exception, e:
-                    pass
-
-                if not object_record:
-                    # can not find object's data record
-                    reason = _("Can not get %s.") % name
-                    rejected_keys[key] = 0
-                    reject_reason[name] = reason
-                    continue
-
-                if object_record.can_remove:
-                    # remove this empty object
-                    accepted_keys[key] = 0
-                    accepted_names[name] = 0
-                    continue
-
-                # create a new content
-                new_obj = build_object(key)
-                if not new_obj:
-                    reason = _("Can not get %s.") % name
-                    rejected_keys[key] = 0
-                    reject_reason[name] = reason
-                    continue
-
-                name = new_obj.get_name()
-
-                # move the new object to the character
-                if not new_obj.move_to(self, quiet=True, emit_to_obj=self):
-                    new_obj.delete()
-                    reason = _("Can not get %s.") % name
-                    rejected_keys[key] = 0
-                    reject_reason[name] = reason
-                    break
-
-                # accept this object
-                accepted_keys[key] = 0
-                accepted_names[name] = 0
-
-            else:
-                # common number
-                # if already has this kind of object
-                if key in inventory:
-                    # add to current object
-                    name = inventory[key].name
-                    unique = inventory[key].unique
-
-                    add = number
-                    if add > inventory[key].max_stack - inventory[key].db.number:
-                        add = inventory[key].max_stack - inventory[key].db.number
-
-                    if add > 0:
-                        # increase stack number
-                        inventory[key].increase_num(add)
-                        number -= add
-                        accepted += add
-
-                # if does not have this kind of object, or stack is full
-                reason = ""
-                while number > 0:
-                    if unique:
-                        # can not have more than one unique objects
-                        reason = _("Can not get more %s.") % name
-                        break
-
-                    # create a new content
-                    new_obj = build_object(key)
-                    if not new_obj:
-                        reason = _("Can not get %s.") % name
-                        break
-
-                    name = new_obj.get_name()
-                    unique = new_obj.unique
-
-                    # move the new object to the character
-                    if not new_obj.move_to(self, quiet=True, emit_to_obj=self):
-                        new_obj.delete()
-                        reason = _("Can not get %s.") % name
-                        break
-
-                    # Get the number that actually added.
-                    add = number
-                    if add > new_obj.max_stack:
-                        add = new_obj.max_stack
-
-                    if add <= 0:
-                        break
-
-                    new_obj.increase_num(add)
-                    number -= add
-                    accepted += add
-
-                if accepted > 0:
-                    accepted_keys[key] = accepted
-                    accepted_names[name] = accepted
+            if key not in inventory:
+                stacks = self.inventory_handler.get(key)
+                if stacks:
+                    inventory[key] = min(stacks, key=lambda item: item.db.number)
+
+        # Create all objects in one transaction and send the inventory once.
+        new_objs = []
+        self.inventory_handler.begin_batch()
+        try:
+            with transaction.atomic():
+                for obj in obj_list:
+                    key = obj["object"]
+                    available = obj["number"]
+                    number = available
+                    accepted = 0
+                    name = ""
+                    unique = False
+
+                    if number == 0:
+                        # it is an empty object
+                        if key in inventory:
+                            # already has this object
+                            accepted_keys[key] = 0
+                            accepted_names[name] = 0
+                            continue
+
+                        object_record = None
+                        try:
+                            common_model_name = TYPECLASS("COMMON_OBJECT").model_name
+                            object_record = WORLD_DATA.get(common_model_name, key=key)
+                        except Exception, e:
+                            pass
+
+                        if not object_record:
+                            # can not find object's data record
+                            reason = _("Can not get %s.") % name
+                            rejected_keys[key] = 0
+                            reject_reason[name] = reason
+                            continue
+
+                        if object_record.can_remove:
+                            # remove this empty object
+                            accepted_keys[key] = 0
+                            accepted_names[name] = 0
+                            continue
+
+                        # create a new content
+                        new_obj = build_object(key)
+                        if not new_obj:
+                            reason = _("Can not get %s.") % name
+                            rejected_keys[key] = 0
+                            reject_reason[name] = reason
+                            continue
+                        new_objs.append(new_obj)
+
+                        name = new_obj.get_name()
+
+                        # move the new object to the character
+                        if not new_obj.move_to(self, quiet=True, emit_to_obj=self):
+                            new_obj.delete()
+                            reason = _("Can not get %s.") % name
+                            rejected_keys[key] = 0
+                            reject_reason[name] = reason
+                            break
+
+                        # accept this object
+                        accepted_keys[key] = 0
+                        accepted_names[name] = 0
 
-                if accepted < available:
-                    rejected_keys[key] = available - accepted
-                    reject_reason[name] = reason
+                    else:
+                        # common number
+                        # if already has this kind of object
+                        if key in inventory:
+                            # add to current object
+                            name = inventory[key].name
+                            unique = inventory[key].unique
+
+                            add = number
+                            if add > inventory[key].max_stack - inventory[key].db.number:
+                                add = inventory[key].max_stack - inventory[key].db.number
+
+                            if add > 0:
+                                # increase stack number
+                                inventory[key].increase_num(add)
+                                number -= add
+                                accepted += add
+
+                        # if does not have this kind of object, or stack is full
+                        reason = ""
+                        while number > 0:
+                            if unique:
+                                # can not have more than one unique objects
+                                reason = _("Can not get more %s.") % name
+                                break
+
+                            # create a new content
+                            new_obj = build_object(key)
+                            if not new_obj:
+                                reason = _("Can not get %s.") % name
+                                break
+                            new_objs.append(new_obj)
+
+                            name = new_obj.get_name()
+                            unique = new_obj.unique
+
+                            # move the new object to the character
+                            if not new_obj.move_to(self, quiet=True, emit_to_obj=self):
+                                new_obj.delete()
+                                reason = _("Can not get %s.") % name
+                                break
+
+                            # Get the number that actually added.
+                            add = number
+                            if add > new_obj.max_stack:
+                                add = new_obj.max_stack
+
+                            if add <= 0:
+                                break
+
+                            new_obj.increase_num(add)
+                            number -= add
+                            accepted += add
+
+                        if accepted > 0:
+                            accepted_keys[key] = accepted
+                            accepted_names[name] = accepted
+
+                        if accepted < available:
+                            rejected_keys[key] = available - accepted
+                            reject_reason[name] = reason
+        except Exception:
+            # the database has been rolled back, reload cached objects too
+            self.reload_inventory(new_objs)
+            raise
+        finally:
+            self.inventory_handler.end_batch()
 
         if not mute:
             # Send results to the player.
@@ -588,6 +611,9 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
                              "combat": combat}}
             self.msg(message)
 
+        if accepted_keys:
+            self.statement_memo.changed(defines.CHANGE_OBJECT)
+
         self.show_inventory()
 
         # call quest handler
@@ -692,9 +718,18 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
             boolean: success
         """
         success = True
-        for item in obj_list:
-            if not self.remove_object(item["object"], item["number"], True):
-                success = False
+        self.inventory_handler.begin_batch()
+        try:
+            with transaction.atomic():
+                for item in obj_list:
+                    if not self.remove_object(item["object"], item["number"], True):
+                        success = False
+        except Exception:
+            # the database has been rolled back, reload cached objects too
+            self.reload_inventory([])
+            raise
+        finally:
+            self.inventory_handler.end_batch()
 
         self.show_inventory()
         return success
@@ -741,6 +776,7 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
                             # if it is an equipment, take off it first
                             if getattr(obj, "equipped", False):
                                 self.take_off_equipment(obj)
+                            self.inventory_handler.remove(obj)
                             obj.delete()
 
                 if to_remove <= 0:
@@ -748,6 +784,8 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         except Exception, e:
             logger.log_tracemsg("Can not remove object %s: %s" % (obj_key, e))
             return False
+        finally:
+            self.statement_memo.changed(defines.CHANGE_OBJECT)
 
         if to_remove > 0:
             logger.log_err("Remove object error: %s" % obj_key)
@@ -758,19 +796,46 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
 
         return True
 
+    def reload_inventory(self, new_objs):
+        """
+        Reload cached inventory data after a transaction has been rolled back.
+        Objects' numbers and the inventory index are loaded from the database
+        again, and new objects are removed from caches.
+
+        Args:
+            new_objs: (list) objects created in the transaction.
+        """
+        for obj in new_objs:
+            if obj.pk:
+                DATA_KEY_REGISTRY.remove(obj.pk)
+                obj.flush_from_cache(force=True)
+
+        self.attributes.reset_cache()
+
+        # deleted objects are loaded again
+        self.contents_cache.clear()
+        contents = self.contents
+        for obj in contents:
+            obj.attributes.reset_cache()
+
+        # deleted objects were removed from the registry
+        for obj_id, key in utils.get_objs_data_keys(contents).iteritems():
+            DATA_KEY_REGISTRY.set(obj_id, key)
+
+        self.inventory_handler.clear()
+
     def search_inventory(self, obj_key):
         """
         Search specified object in the inventory.
         """
-        result = [item for item in self.contents if item.get_data_key() == obj_key]
-        return result
+        return self.inventory_handler.get(obj_key)
 
     def show_inventory(self):
         """
         Send inventory data to player.
         """
         inv = self.return_inventory()
-        self.msg({"inventory": inv})
+        self.state_sync.send({"inventory": inv})
 
     def return_inventory(self):
         """
@@ -798,7 +863,7 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         Send status to player.
         """
         status = self.return_status()
-        self.msg({"status": status})
+        self.state_sync.send({"status": status})
 
     def return_status(self):
         """
@@ -819,7 +884,7 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         Send equipments to player.
         """
         equipments = self.return_equipments()
-        self.msg({"equipments": equipments})
+        self.state_sync.send({"equipments": equipments})
 
     def return_equipments(self):
         """
@@ -874,10 +939,10 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         # reset character's attributes
         self.refresh_properties()
 
-        message = {"status": self.return_status(),
-                   "equipments": self.return_equipments(),
-                   "inventory": self.return_inventory()}
-        self.msg(message)
+        states = {"status": self.return_status(),
+                  "equipments": self.return_equipments(),
+                  "inventory": self.return_inventory()}
+        self.state_sync.send(states)
 
         return
 
@@ -904,10 +969,10 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         # reset character's attributes
         self.refresh_properties()
 
-        message = {"status": self.return_status(),
-                   "equipments": self.return_equipments(),
-                   "inventory": self.return_inventory()}
-        self.msg(message)
+        states = {"status": self.return_status(),
+                  "equipments": self.return_equipments(),
+                  "inventory": self.return_inventory()}
+        self.state_sync.send(states)
 
     def take_off_equipment(self, equipment):
         """
@@ -926,10 +991,10 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         # reset character's attributes
         self.refresh_properties()
 
-        message = {"status": self.return_status(),
-                   "equipments": self.return_equipments(),
-                   "inventory": self.return_inventory()}
-        self.msg(message)
+        states = {"status": self.return_status(),
+                  "equipments": self.return_equipments(),
+                  "inventory": self.return_inventory()}
+        self.state_sync.send(states)
 
     def unlock_exit(self, exit):
         """
@@ -957,7 +1022,7 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         Send skills to player.
         """
         skills = self.return_skills()
-        self.msg({"skills": skills})
+        self.state_sync.send({"skills": skills})
 
     def return_skills(self):
         """
@@ -965,7 +1030,7 @@ class MudderyPlayerCharacter(TYPECLASS("CHARACTER")):
         """
         skills = []
 
-        for key, skill in self.db.skills.iteritems():
+        for key, skill in self.skill_handler.all().iteritems():
             skills.append(skill.get_appearance(self))
 
         return skills
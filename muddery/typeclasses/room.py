@@ -14,10 +14,18 @@ from muddery.utils.game_settings import GAME_SETTINGS
 from muddery.worlddata.dao.image_resources_mapper import IMAGE_RESOURCES
 from muddery.mappings.typeclass_set import TYPECLASS
 from muddery.utils.localized_strings_handler import _
+from muddery.utils.listener_handler import ListenerHandler
+from muddery.utils.move_notify_handler import MoveNotifyHandler
+from muddery.utils.surroundings_handler import SurroundingsHandler
 from evennia.utils import logger
+from evennia.utils.utils import lazy_property
 from evennia.objects.objects import DefaultRoom
 
 
+# {object's class: surrounding type}
+_SURROUNDING_TYPES = {}
+
+
 class MudderyRoom(TYPECLASS("OBJECT"), DefaultRoom):
     """
     Rooms are like any Object, except their location is None
@@ -32,6 +40,18 @@ class MudderyRoom(TYPECLASS("OBJECT"), DefaultRoom):
     typeclass_name = _("Room", "typeclasses")
     model_name = "world_rooms"
 
+    @lazy_property
+    def listener_handler(self):
+        return ListenerHandler(self)
+
+    @lazy_property
+    def move_notify_handler(self):
+        return MoveNotifyHandler(self)
+
+    @lazy_property
+    def surroundings_handler(self):
+        return SurroundingsHandler(self)
+
     def at_object_creation(self):
         """
         Called once, when this object is first created. This is the
@@ -83,13 +103,16 @@ class MudderyRoom(TYPECLASS("OBJECT"), DefaultRoom):
         """
         super(MudderyRoom, self).at_object_receive(moved_obj, source_location, **kwargs)
 
+        if moved_obj.sessions.count():
+            self.listener_handler.add(moved_obj)
+
+        self.surroundings_handler.update(moved_obj)
+
         if not GAME_SETTINGS.get("solo_mode"):
             # send surrounding changes to player
             type = self.get_surrounding_type(moved_obj)
             if type:
-                change = {type: [{"dbref": moved_obj.dbref,
-                                  "name": moved_obj.get_name()}]}
-                self.msg_contents({"obj_moved_in": change}, exclude=moved_obj)
+                self.notify_moved("obj_moved_in", type, moved_obj)
 
     def at_object_leave(self, moved_obj, target_location, **kwargs):
         """
@@ -102,13 +125,72 @@ class MudderyRoom(TYPECLASS("OBJECT"), DefaultRoom):
         """
         super(MudderyRoom, self).at_object_leave(moved_obj, target_location)
 
+        self.listener_handler.remove(moved_obj)
+        self.surroundings_handler.remove(moved_obj)
+
         if not GAME_SETTINGS.get("solo_mode"):
             # send surrounding changes to player
             type = self.get_surrounding_type(moved_obj)
             if type:
-                change = {type: [{"dbref": moved_obj.dbref,
-                                  "name": moved_obj.get_name()}]}
-                self.msg_contents({"obj_moved_out": change}, exclude=moved_obj)
+                self.notify_moved("obj_moved_out", type, moved_obj)
+
+    def notify_moved(self, event, type, moved_obj):
+        """
+        Send an object's movement to players in this room. Movements are sent
+        in batches if the room_notify_interval setting is not 0.
+
+        Args:
+            event: (string) "obj_moved_in" or "obj_moved_out".
+            type: (string) object's surrounding type.
+            moved_obj: (object) the moved object.
+        """
+        if GAME_SETTINGS.get("room_notify_interval"):
+            self.move_notify_handler.add(event, type, moved_obj)
+        else:
+            change = {type: [{"dbref": moved_obj.dbref,
+                              "name": moved_obj.get_name()}]}
+            self.broadcast({event: change}, exclude=moved_obj)
+
+    def is_crowded(self):
+        """
+        If there are too many players in this room. Players in a crowded room
+        get the number of players instead of each player's data. It only works
+        when movements are sent in batches.
+        """
+        crowd_size = GAME_SETTINGS.get("room_crowd_size")
+        if not crowd_size or not GAME_SETTINGS.get("room_notify_interval"):
+            return False
+
+        return len(self.listener_handler.all()) > crowd_size
+
+    def add_listener(self, obj):
+        """
+        An object in this room has been puppeted.
+        """
+        self.listener_handler.add(obj)
+
+    def remove_listener(self, obj):
+        """
+        An object in this room has been unpuppeted.
+        """
+        self.listener_handler.remove(obj)
+
+    def update_surrounding(self, obj):
+        """
+        An object's name or data in this room has been changed.
+        """
+        self.surroundings_handler.update(obj)
+
+    def broadcast(self, message, exclude=None):
+        """
+        Send a message to all puppeted objects in this room. The message is
+        converted to JSON only once.
+
+        Args:
+            message: (dict) the message to send.
+            exclude: (object or list) do not send to these objects.
+        """
+        self.listener_handler.broadcast(message, exclude)
 
     def get_appearance(self, caller):
         """
@@ -125,58 +207,17 @@ class MudderyRoom(TYPECLASS("OBJECT"), DefaultRoom):
 
         return info
         
-    def get_exits(self):
-        """
-        Get this room's exits.
-        """
-        exits = {}
-        for cont in self.contents:
-            if cont.destination:
-                exits[cont.get_data_key()] = {"from": self.get_data_key(),
-                                              "to": cont.destination.get_data_key()}
-        return exits
-
     def get_surroundings(self, caller):
         """
         This is a convenient hook for a 'look'
         command to call.
         """
-        # get name, description, commands and all objects in it
-        info = {"exits": [],
-                "npcs": [],
-                "things": [],
-                "players": [],
-                "offlines": []}
-
-        visible = (cont for cont in self.contents if cont != caller and
-                   cont.access(caller, "view"))
-
-        if GAME_SETTINGS.get("solo_mode"):
-            visible = (cont for cont in visible if not cont.has_account)
-
-        for cont in visible:
-            # only show objects that match the condition
-            if not cont.is_visible(caller):
-                continue
-
-            type = self.get_surrounding_type(cont)
-            if type:
-                appearance = {}
-
-                if type == "npcs":
-                    # add quest status
-                    if hasattr(cont, "have_quest"):
-                        provide_quest, complete_quest = cont.have_quest(caller)
-                        appearance["provide_quest"] = provide_quest
-                        appearance["complete_quest"] = complete_quest
-                elif type == "offlines":
-                    continue
-
-                appearance["dbref"] = cont.dbref
-                appearance["name"] = cont.get_name()
-                appearance["key"] = cont.get_data_key()
-                
-                info[type].append(appearance)
+        # Data of objects are cached in the room, results of the caller's
+        # filters are memoized until the caller's state changes.
+        crowded = self.is_crowded()
+        info = self.surroundings_handler.get(caller, crowded)
+        if crowded:
+            info["crowd"] = len(self.listener_handler.all())
 
         return info
 
@@ -186,16 +227,22 @@ class MudderyRoom(TYPECLASS("OBJECT"), DefaultRoom):
         """
         if obj.destination:
             return "exits"
-        elif obj.is_typeclass(settings.BASE_GENERAL_CHARACTER_TYPECLASS, exact=False):
-            if obj.is_typeclass(settings.BASE_PLAYER_CHARACTER_TYPECLASS, exact=False):
-                if obj.has_account:
-                    return "players"
+
+        # typeclasses do not change, cache their types
+        type = _SURROUNDING_TYPES.get(obj.__class__)
+        if type is None:
+            if obj.is_typeclass(settings.BASE_GENERAL_CHARACTER_TYPECLASS, exact=False):
+                if obj.is_typeclass(settings.BASE_PLAYER_CHARACTER_TYPECLASS, exact=False):
+                    type = "players"
                 else:
-                    return "offlines"
+                    type = "npcs"
             else:
-                return "npcs"
-        else:
-            return "things"
+                type = "things"
+            _SURROUNDING_TYPES[obj.__class__] = type
+
+        if type == "players" and not obj.has_account:
+            return "offlines"
+        return type
 
     @classmethod
     def get_event_trigger_types(cls):
@@ -8,11 +8,13 @@ from muddery.utils import utils
 from muddery.utils.game_settings import GAME_SETTINGS
 from muddery.mappings.typeclass_set import TYPECLASS, TYPECLASS_SET
 from muddery.worlddata.dao import common_mappers as CM
+from muddery.utils.world_map_handler import WORLD_MAP
 from django.conf import settings
 from django.apps import apps
+from django.db import transaction
 from evennia.utils import create, search, logger
 from evennia.comms.models import ChannelDB
-import traceback
+import time, traceback
 
 
 def get_object_record(obj_key):
@@ -106,107 +108,122 @@ def build_unique_objects(objects_data, type_name, caller=None):
     """
     Build all objects in a model.
 
+    Objects are built in three phases: removing, updating and creating. Each
+    phase runs in one database transaction.
+
     Args:
         model_name: (string) The name of the data model.
         caller: (command caller) If provide, running messages will send to the caller.
     """
+    def message(ostring):
+        print(ostring)
+        if caller:
+            caller.msg(ostring)
+
+    # prefetch data
+    begin = time.time()
+
     # new objects
     new_obj_keys = set(record.key for record in objects_data)
 
-    # current objects
+    # object records
+    object_records = dict((record.key, record) for record in CM.OBJECTS.all())
+
+    # current objects and their data keys
     current_objs = utils.search_obj_unique_type(type_name)
+    current_keys = utils.get_objs_data_keys(current_objs)
+
+    timings = [("prefetch", time.time() - begin)]
 
     # remove objects
+    begin = time.time()
     count_remove = 0
     count_update = 0
     count_create = 0
     current_obj_keys = set()
+    update_objs = []
 
-    for obj in current_objs:
-        obj_key = obj.get_data_key()
+    with transaction.atomic():
+        for obj in current_objs:
+            obj_key = current_keys.get(obj.id, "")
 
-        if obj_key in current_obj_keys:
-            # This object is duplcated.
-            ostring = "Deleting %s" % obj_key
-            print(ostring)
-            if caller:
-                caller.msg(ostring)
-
-            # If default home will be removed, set default home to the Limbo.
-            if obj.dbref == settings.DEFAULT_HOME:
-                settings.DEFAULT_HOME = "#2"
-            obj.delete()
-            count_remove += 1
-            continue
-
-        if not obj_key in new_obj_keys:
-            # This object should be removed
-            ostring = "Deleting %s" % obj_key
-            print(ostring)
-            if caller:
-                caller.msg(ostring)
+            if obj_key in current_obj_keys or not obj_key in new_obj_keys:
+                # This object is duplcated or should be removed.
+                message("Deleting %s" % obj_key)
 
-            # If default home will be removed, set default home to the Limbo.
-            if obj.dbref == settings.DEFAULT_HOME:
-                settings.DEFAULT_HOME = "#2"
-            obj.delete()
-            count_remove += 1
-            continue
+                # If default home will be removed, set default home to the Limbo.
+                if obj.dbref == settings.DEFAULT_HOME:
+                    settings.DEFAULT_HOME = "#2"
+                obj.delete()
+                count_remove += 1
+                continue
 
-        try:
-            # set data
-            obj.load_data()
-            # put obj to its default location
-            obj.reset_location()
-        except Exception, e:
-            ostring = "%s can not load data:%s" % (obj.dbref, e)
-            print(ostring)
-            print(traceback.print_exc())
-            if caller:
-                caller.msg(ostring)
+            current_obj_keys.add(obj_key)
+            update_objs.append(obj)
+
+    timings.append(("remove", time.time() - begin))
+
+    # update objects
+    begin = time.time()
+    with transaction.atomic():
+        for obj in update_objs:
+            try:
+                with transaction.atomic():
+                    # set data
+                    obj.load_data()
+                    # put obj to its default location
+                    obj.reset_location()
+                    # update its data cached in the location
+                    obj.refresh_in_location()
+                count_update += 1
+            except Exception, e:
+                ostring = "%s can not load data:%s" % (obj.dbref, e)
+                message(ostring)
+                print(traceback.print_exc())
 
-        current_obj_keys.add(obj_key)
+    timings.append(("update", time.time() - begin))
 
     # Create new objects.
-    object_model_name = TYPECLASS("OBJECT").model_name
-    object_model = apps.get_model(settings.WORLD_DATA_APP, object_model_name)
-    for record in objects_data:
-        if not record.key in current_obj_keys:
+    begin = time.time()
+    with transaction.atomic():
+        for record in objects_data:
+            if record.key in current_obj_keys:
+                continue
+
             # Create new objects.
-            ostring = "Creating %s." % record.key
-            print(ostring)
-            if caller:
-                caller.msg(ostring)
+            message("Creating %s." % record.key)
 
             try:
-                object_record = object_model.objects.get(key=record.key)
-                typeclass_path = TYPECLASS_SET.get_module(object_record.typeclass)
-                obj = create.create_object(typeclass_path, object_record.name)
+                with transaction.atomic():
+                    # create the object with its final typeclass
+                    object_record = object_records[record.key]
+                    typeclass_path = TYPECLASS_SET.get_module(object_record.typeclass)
+                    obj = create.create_object(typeclass_path, object_record.name)
                 count_create += 1
             except Exception, e:
                 ostring = "Can not create obj %s: %s" % (record.key, e)
-                print(ostring)
+                message(ostring)
                 print(traceback.print_exc())
-                if caller:
-                    caller.msg(ostring)
                 continue
 
             try:
-                obj.set_data_key(record.key, getattr(record, "level", 0))
-                utils.set_obj_unique_type(obj, type_name)
+                with transaction.atomic():
+                    obj.set_data_key(record.key, getattr(record, "level", 0))
+                    utils.set_obj_unique_type(obj, type_name)
             except Exception, e:
                 ostring = "Can not set data info to obj %s: %s" % (record.key, e)
-                print(ostring)
+                message(ostring)
                 print(traceback.print_exc())
-                if caller:
-                    caller.msg(ostring)
                 continue
 
+    timings.append(("create", time.time() - begin))
+
     ostring = "Removed %d object(s). Created %d object(s). Updated %d object(s). Total %d objects.\n"\
               % (count_remove, count_create, count_update, len(objects_data))
-    print(ostring)
-    if caller:
-        caller.msg(ostring)
+    message(ostring)
+
+    ostring = "Build %s: " % type_name + ", ".join("%s %.2fs" % timing for timing in timings)
+    message(ostring)
 
 
 def build_all(caller=None):
@@ -232,6 +249,9 @@ def build_all(caller=None):
     # Build NPCs.
     build_unique_objects(CM.WORLD_NPCS.all(), "world_npcs", caller)
 
+    # Reload the world map.
+    WORLD_MAP.reload()
+
 
 def reset_default_locations():
     """
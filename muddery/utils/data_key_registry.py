@@ -0,0 +1,204 @@
+"""
+DataKeyRegistry maps objects' data keys to their ids, so objects can be found by
+data keys without searching attributes in the database.
+
+A unique world object's data key maps to one id, a common object's data key
+maps to ids of all its clones. The registry is loaded when the server starts
+and is updated when objects' data keys are set or objects are deleted.
+"""
+
+from __future__ import print_function
+
+import time
+from django.conf import settings
+from evennia.utils import logger
+
+
+def query_data_keys():
+    """
+    Get all objects' data keys from the database.
+
+    Returns:
+        (dict) {object's id: data key}
+    """
+    from evennia.objects.models import ObjectDB
+
+    records = ObjectDB.objects.filter(db_attributes__db_key="key",
+                                      db_attributes__db_category=settings.DATA_KEY_CATEGORY)
+    return dict(records.values_list("id", "db_attributes__db_strvalue"))
+
+
+class DataKeyRegistry(object):
+    """
+    Objects' ids indexed by data keys.
+    """
+    def __init__(self):
+        """
+        Initialize the registry.
+        """
+        # {data key: set(object's id)}
+        # It is None before the registry is loaded.
+        self.keys = None
+
+        # {object's id: data key}
+        self.ids = {}
+
+        # counters for profiling
+        self.hits = 0
+        self.fallbacks = 0
+
+    def reload(self):
+        """
+        Load all objects' data keys.
+        """
+        begin = time.time()
+
+        ids = query_data_keys()
+        keys = {}
+        for obj_id, key in ids.iteritems():
+            keys.setdefault(key, set()).add(obj_id)
+
+        self.keys = keys
+        self.ids = ids
+
+        logger.log_info("Loaded %d objects' data keys in %.3f seconds." % (len(ids), time.time() - begin))
+
+    def clear(self):
+        """
+        Remove all data. Objects will be searched in the database.
+        """
+        self.keys = None
+        self.ids = {}
+
+    def is_loaded(self):
+        """
+        If the registry is loaded.
+        """
+        return self.keys is not None
+
+    def set(self, obj_id, key):
+        """
+        Set an object's data key.
+
+        Args:
+            obj_id: (int) object's id.
+            key: (string) object's new data key.
+        """
+        if self.keys is None:
+            return
+
+        self.remove(obj_id)
+        if key:
+            self.keys.setdefault(key, set()).add(obj_id)
+            self.ids[obj_id] = key
+
+    def remove(self, obj_id):
+        """
+        Remove an object.
+
+        Args:
+            obj_id: (int) object's id.
+        """
+        if self.keys is None:
+            return
+
+        key = self.ids.pop(obj_id, None)
+        if key is None:
+            return
+
+        ids = self.keys.get(key)
+        if ids:
+            ids.discard(obj_id)
+            if not ids:
+                del self.keys[key]
+
+    def get_ids(self, key):
+        """
+        Get ids of objects with the data key.
+
+        Args:
+            key: (string) data key.
+
+        Returns:
+            (list) objects' ids, or None if the registry is not loaded.
+        """
+        if self.keys is None:
+            return None
+
+        return list(self.keys.get(key, ()))
+
+    def search(self, key):
+        """
+        Search objects with the data key.
+
+        Args:
+            key: (string) data key.
+
+        Returns:
+            (list) objects, or None if the registry is not loaded.
+        """
+        from evennia.objects.models import ObjectDB
+
+        ids = self.get_ids(key)
+        if ids is None:
+            # the caller should search in the database
+            self.fallbacks += 1
+            return None
+
+        self.hits += 1
+        objs = []
+        for obj_id in sorted(ids):
+            obj = ObjectDB.objects.get_id(obj_id)
+            if obj:
+                objs.append(obj)
+            else:
+                # the object has been removed without calling hooks
+                self.remove(obj_id)
+        return objs
+
+    def check(self):
+        """
+        Compare the registry with the database.
+
+        Returns:
+            (dict) {"missing": {id: key}, objects which are not in the registry,
+                    "stale": {id: key}, objects which are not in the database,
+                    "mismatched": {id: (registry's key, database's key)}}
+        """
+        if self.keys is None:
+            return {"missing": {}, "stale": {}, "mismatched": {}}
+
+        db_ids = query_data_keys()
+
+        missing = {}
+        mismatched = {}
+        for obj_id, key in db_ids.iteritems():
+            if obj_id not in self.ids:
+                missing[obj_id] = key
+            elif self.ids[obj_id] != key:
+                mismatched[obj_id] = (self.ids[obj_id], key)
+
+        stale = dict((obj_id, key) for obj_id, key in self.ids.iteritems() if obj_id not in db_ids)
+
+        # the reverse index must match the registry too
+        for key, ids in self.keys.iteritems():
+            for obj_id in ids:
+                if self.ids.get(obj_id) != key and obj_id not in mismatched:
+                    mismatched[obj_id] = (key, db_ids.get(obj_id))
+
+        return {"missing": missing, "stale": stale, "mismatched": mismatched}
+
+    def stats(self):
+        """
+        Get the registry's counters.
+
+        Returns:
+            (dict) counters
+        """
+        return {"hits": self.hits,
+                "fallbacks": self.fallbacks,
+                "keys": len(self.keys) if self.keys is not None else 0,
+                "objects": len(self.ids)}
+
+
+DATA_KEY_REGISTRY = DataKeyRegistry()
@@ -33,3 +33,10 @@ EVENT_TRIGGER_SENTENCE = "EVENT_TRIGGER_SENTENCE"   # called when a character fi
 EVENT_NONE = ""
 EVENT_ATTACK = "EVENT_ATTACK"               # event to begin a combat
 EVENT_DIALOGUE = "EVENT_DIALOGUE"           # event to begin a dialogue
+
+# changes of a character's state, used to invalidate memoized statement results
+CHANGE_QUEST = "CHANGE_QUEST"               # quests accepted, accomplished, given up or turned in
+CHANGE_OBJECT = "CHANGE_OBJECT"             # objects in the inventory changed
+CHANGE_ATTRIBUTE = "CHANGE_ATTRIBUTE"       # attributes used in statements changed
+CHANGE_PROPERTY = "CHANGE_PROPERTY"         # character's properties changed
+CHANGE_EVENT = "CHANGE_EVENT"               # events closed
@@ -17,6 +17,7 @@ from muddery.worlddata.dao.dialogue_sentences_mapper import DIALOGUE_SENTENCES
 from muddery.worlddata.dao.dialogue_relations_mapper import DIALOGUE_RELATIONS
 from muddery.worlddata.dao.dialogue_quest_dependencies_mapper import DIALOGUE_QUESTION
 from muddery.worlddata.dao.npc_dialogues_mapper import NPC_DIALOGUES
+from muddery.worlddata.dao import common_mappers as CM
 from muddery.mappings.quest_status_set import QUEST_STATUS_SET
 from muddery.events.event_trigger import EventTrigger
 from evennia.utils import logger
@@ -47,6 +48,15 @@ class DialogueHandler(object):
         self.can_close_dialogue = GAME_SETTINGS.get("can_close_dialogue")
         self.single_sentence_mode = GAME_SETTINGS.get("single_dialogue_sentence")
         self.dialogue_storage = {}
+
+    def reload(self):
+        """
+        Load all dialogues and compute quests in them.
+        """
+        self.clear()
+
+        for record in CM.DIALOGUES.all():
+            self.get_reachable_quests(record.key)
     
     def load_cache(self, dialogue):
         """
@@ -127,6 +137,16 @@ class DialogueHandler(object):
 
         data["nexts"] = [next_one.next_dlg for next_one in nexts]
 
+        # quests in all sentences
+        data["provide_quests"] = set()
+        data["finish_quests"] = set()
+        for sentence in data["sentences"]:
+            data["provide_quests"].update(sentence["provide_quest"])
+            data["finish_quests"].update(sentence["finish_quest"])
+
+        # quests in this dialogue and its next dialogues, computed when needed
+        data["reachable_quests"] = None
+
         # Add to cache.
         self.dialogue_storage[dialogue] = data
 
@@ -146,6 +166,44 @@ class DialogueHandler(object):
 
         return self.dialogue_storage[dialogue]
 
+    def get_reachable_quests(self, dialogue):
+        """
+        Get quests that can be provided or finished in the dialogue and all
+        dialogues after it.
+
+        Args:
+            dialogue: (string) dialogue's key
+
+        Returns:
+            (provide_quests, finish_quests): (set, set) quest keys
+        """
+        dlg = self.get_dialogue(dialogue)
+        if not dlg:
+            return (set(), set())
+
+        if dlg["reachable_quests"] is None:
+            provide_quests = set()
+            finish_quests = set()
+
+            # search next dialogues, dialogues may form loops
+            visited = set([dialogue])
+            stack = [dialogue]
+            while stack:
+                current = self.get_dialogue(stack.pop())
+                if not current:
+                    continue
+
+                provide_quests.update(current["provide_quests"])
+                finish_quests.update(current["finish_quests"])
+                for dlg_key in current["nexts"]:
+                    if dlg_key not in visited:
+                        visited.add(dlg_key)
+                        stack.append(dlg_key)
+
+            dlg["reachable_quests"] = (provide_quests, finish_quests)
+
+        return dlg["reachable_quests"]
+
     def get_sentence(self, dialogue, sentence):
         """
         Get specified sentence.
@@ -501,10 +559,28 @@ class DialogueHandler(object):
         if not npc:
             return (provide_quest, finish_quest)
 
-        # get npc's default dialogues
+        # get quests in npc's dialogues
+        provide_quests = set()
+        finish_quests = set()
+        for dlg_key in npc.dialogues:
+            provides, finishes = self.get_reachable_quests(dlg_key)
+            provide_quests.update(provides)
+            finish_quests.update(finishes)
+
+        # match quests with the caller's quests
+        accomplished_quests = caller.quest_handler.get_accomplished_quests()
+        finish_quests &= accomplished_quests
+        provide_quests = set(quest_key for quest_key in provide_quests
+                             if caller.quest_handler.can_provide(quest_key))
+        if not provide_quests and not finish_quests:
+            return (provide_quest, finish_quest)
+
+        # check dialogues' conditions
+        visited = set()
         for dlg_key in npc.dialogues:
             # find quests by recursion
-            provide, finish = self.dialogue_have_quest(caller, npc, dlg_key)
+            provide, finish = self.dialogue_have_quest(caller, npc, dlg_key,
+                                                       provide_quests, finish_quests, visited)
                 
             provide_quest = (provide_quest or provide)
             finish_quest = (finish_quest or finish)
@@ -512,24 +588,41 @@ class DialogueHandler(object):
             if finish_quest:
                 break
 
-            if not caller.quest_handler.get_accomplished_quests():
+            if not accomplished_quests:
                 if provide_quest:
                     break
 
         return (provide_quest, finish_quest)
 
-    def dialogue_have_quest(self, caller, npc, dialogue):
+    def dialogue_have_quest(self, caller, npc, dialogue, provide_quests, finish_quests, visited):
         """
         Find quests by recursion.
+
+        Args:
+            caller: (object) the character.
+            npc: (object) the NPC.
+            dialogue: (string) dialogue's key
+            provide_quests: (set) quests that can be provided to the caller.
+            finish_quests: (set) quests that the caller has accomplished.
+            visited: (set) dialogues that have been checked.
         """
         provide_quest = False
         finish_quest = False
 
+        if dialogue in visited:
+            return (provide_quest, finish_quest)
+        visited.add(dialogue)
+
         # check if the dialogue is available
         npc_dlg = self.get_dialogue(dialogue)
         if not npc_dlg:
             return (provide_quest, finish_quest)
 
+        # skip dialogues which do not have the caller's quests
+        provides, finishes = self.get_reachable_quests(dialogue)
+        if provides.isdisjoint(provide_quests) and finishes.isdisjoint(finish_quests):
+            return (provide_quest, finish_quest)
+
         if not STATEMENT_HANDLER.match_condition(npc_dlg["condition"], caller, npc):
             return (provide_quest, finish_quest)
 
@@ -544,20 +637,18 @@ class DialogueHandler(object):
 
         # find quests in its sentences
         for sen in npc_dlg["sentences"]:
-            for quest_key in sen["finish_quest"]:
-                if caller.quest_handler.is_accomplished(quest_key):
-                    finish_quest = True
-                    return (provide_quest, finish_quest)
+            if not finish_quests.isdisjoint(sen["finish_quest"]):
+                finish_quest = True
+                return (provide_quest, finish_quest)
 
-            if not provide_quest and sen["provide_quest"]:
-                for quest_key in sen["provide_quest"]:
-                    if caller.quest_handler.can_provide(quest_key):
-                        provide_quest = True
-                        return (provide_quest, finish_quest)
+            if not provide_quests.isdisjoint(sen["provide_quest"]):
+                provide_quest = True
+                return (provide_quest, finish_quest)
 
         for dlg_key in npc_dlg["nexts"]:
             # get next dialogue
-            provide, finish = self.dialogue_have_quest(caller, npc, dlg_key)
+            provide, finish = self.dialogue_have_quest(caller, npc, dlg_key,
+                                                       provide_quests, finish_quests, visited)
                 
             provide_quest = (provide_quest or provide)
             finish_quest = (finish_quest or finish)
@@ -565,7 +656,7 @@ class DialogueHandler(object):
             if finish_quest:
                 break
 
-            if not caller.quest_handler.get_accomplished_quests():
+            if not finish_quests:
                 if provide_quest:
                     break
 
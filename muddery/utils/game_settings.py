@@ -97,4 +97,6 @@ GAME_SETTINGS = GameSettings({"game_name": "Muddery",
                               "map_scale": 75.0,
                               "map_room_size": 40.0,
                               "map_room_box": False,
+                              "room_notify_interval": 0.0,
+                              "room_crowd_size": 20,
                               })
@@ -0,0 +1,133 @@
+"""
+InventoryHandler indexes a character's inventory by objects' data keys.
+"""
+
+from __future__ import print_function
+
+import weakref
+from muddery.utils import utils
+
+
+class InventoryHandler(object):
+    """
+    Keeps an index of the owner's contents: {data key: [stacks]}. The index is
+    loaded when it is used first time and is updated when objects move in or
+    out of the owner.
+    """
+    def __init__(self, owner):
+        """
+        Initialize handler
+        """
+        self.owner = weakref.proxy(owner)
+
+        # {object's data key: [objects]}
+        # It is None before it is loaded.
+        self.index = None
+
+        # Inventory messages are not sent in batches.
+        self.batching = 0
+        self.changed = False
+
+    def load(self):
+        """
+        Index all contents of the owner.
+        """
+        contents = self.owner.contents
+        keys = utils.get_objs_data_keys(contents)
+
+        index = {}
+        for obj in sorted(contents, key=lambda x: x.id):
+            index.setdefault(keys.get(obj.id, ""), []).append(obj)
+        self.index = index
+
+    def clear(self):
+        """
+        Reload the index next time.
+        """
+        self.index = None
+
+    def add(self, obj):
+        """
+        An object has been moved into the owner.
+        """
+        if self.batching:
+            self.changed = True
+
+        if self.index is None:
+            return
+
+        stacks = self.index.setdefault(obj.get_data_key(), [])
+        if obj not in stacks:
+            stacks.append(obj)
+
+    def remove(self, obj):
+        """
+        An object has been removed from the owner.
+        """
+        if self.batching:
+            self.changed = True
+
+        if self.index is None:
+            return
+
+        key = obj.get_data_key()
+        stacks = self.index.get(key)
+        if stacks and obj in stacks:
+            stacks.remove(obj)
+            if not stacks:
+                del self.index[key]
+
+    def get(self, key):
+        """
+        Get stacks of an object.
+
+        Args:
+            key: (string) object's data key.
+
+        Returns:
+            (list) objects in the order of their ids.
+        """
+        if self.index is None:
+            self.load()
+
+        stacks = self.index.get(key)
+        if not stacks:
+            return []
+
+        # Objects may be deleted without leaving the owner.
+        valid = [obj for obj in stacks if obj.pk and obj.db_location_id == self.owner.id]
+        if len(valid) < len(stacks):
+            if valid:
+                self.index[key] = valid
+            else:
+                del self.index[key]
+
+        return list(valid)
+
+    def has(self, key):
+        """
+        If the owner has this object.
+
+        Args:
+            key: (string) object's data key.
+        """
+        return len(self.get(key)) > 0
+
+    def begin_batch(self):
+        """
+        Begin to change the inventory in a batch. The owner should not send
+        inventory messages until the batch ends.
+        """
+        if not self.batching:
+            self.changed = False
+        self.batching += 1
+
+    def end_batch(self):
+        """
+        End the batch.
+
+        Returns:
+            (boolean) the inventory has been changed in the batch.
+        """
+        self.batching -= 1
+        return not self.batching and self.changed
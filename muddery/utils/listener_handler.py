@@ -0,0 +1,148 @@
+"""
+ListenerHandler keeps objects in a location which are controlled by sessions,
+so messages can be sent to them without checking all contents.
+"""
+
+from __future__ import print_function
+
+import json, weakref
+from evennia.utils import logger
+
+
+class ListenerHandler(object):
+    """
+    Keeps the owner's puppeted contents. The set is loaded when it is used
+    first time and is updated when objects move in or out, or when characters
+    are puppeted or unpuppeted.
+    """
+    def __init__(self, owner):
+        """
+        Initialize handler
+        """
+        self.owner = weakref.proxy(owner)
+
+        # It is None before it is loaded.
+        self.listeners = None
+
+    def load(self):
+        """
+        Find all puppeted contents.
+        """
+        self.listeners = set(obj for obj in self.owner.contents if obj.sessions.count())
+
+    def clear(self):
+        """
+        Reload listeners next time.
+        """
+        self.listeners = None
+
+    def add(self, obj):
+        """
+        Add a listener.
+        """
+        if self.listeners is not None:
+            self.listeners.add(obj)
+
+    def remove(self, obj):
+        """
+        Remove a listener.
+        """
+        if self.listeners is not None:
+            self.listeners.discard(obj)
+
+    def is_listener(self, obj):
+        """
+        Listeners may leave or be unpuppeted without calling hooks, check it.
+        """
+        return obj.pk and obj.db_location_id == self.owner.id and obj.sessions.count()
+
+    def all(self):
+        """
+        Get all listeners.
+
+        Returns:
+            (list) objects
+        """
+        if self.listeners is None:
+            self.load()
+
+        invalid = [obj for obj in self.listeners if not self.is_listener(obj)]
+        for obj in invalid:
+            self.listeners.discard(obj)
+
+        return list(self.listeners)
+
+    def broadcast(self, message, exclude=None):
+        """
+        Send a message to all listeners. The message is converted to JSON only
+        once.
+
+        Args:
+            message: (dict) the message to send.
+            exclude: (object or list) do not send to these objects.
+
+        Returns:
+            (int) number of sessions received the message.
+        """
+        text = encode_message(message)
+
+        if exclude is None:
+            exclude = ()
+        elif not isinstance(exclude, (list, tuple, set)):
+            exclude = (exclude,)
+
+        if self.listeners is None:
+            self.load()
+
+        count = 0
+        invalid = []
+        for obj in self.listeners:
+            if obj in exclude:
+                continue
+
+            sessions = obj.sessions.all()
+            if not sessions or not obj.pk or obj.db_location_id != self.owner.id:
+                invalid.append(obj)
+                continue
+
+            for session in sessions:
+                session.data_out(text=text, options={"raw": True, "json": True})
+                count += 1
+
+        for obj in invalid:
+            self.listeners.discard(obj)
+
+        return count
+
+    def send(self, message, receivers):
+        """
+        Send a message to some listeners. The message is converted to JSON only
+        once.
+
+        Args:
+            message: (dict) the message to send.
+            receivers: (list) listeners to receive the message.
+
+        Returns:
+            (int) number of sessions received the message.
+        """
+        text = encode_message(message)
+
+        count = 0
+        for obj in receivers:
+            for session in obj.sessions.all():
+                session.data_out(text=text, options={"raw": True, "json": True})
+                count += 1
+
+        return count
+
+
+def encode_message(message):
+    """
+    Convert a message to JSON.
+    """
+    try:
+        return json.dumps(message)
+    except Exception, e:
+        logger.log_errmsg("json.dumps failed: %s" % e)
+        return json.dumps({"err": "There is an error occurred while outputing messages."})
@@ -0,0 +1,130 @@
+"""
+MoveNotifyHandler sends a room's obj_moved_in and obj_moved_out messages in
+batches. Changes in an interval are merged into one message for each listener.
+If there are too many players in the room, listeners get the number of players
+instead of each player's changes.
+"""
+
+from __future__ import print_function
+
+import weakref, traceback
+from collections import OrderedDict
+from twisted.internet import reactor
+from evennia.utils import logger
+from muddery.utils.game_settings import GAME_SETTINGS
+
+
+class MoveNotifyHandler(object):
+    """
+    Collects movements in a room and sends them in an interval.
+    """
+    def __init__(self, owner):
+        """
+        Initialize handler
+        """
+        self.owner = weakref.proxy(owner)
+
+        # [(sequence, event, surrounding type, {"dbref": dbref, "name": name})]
+        self.events = []
+        self.sequence = 0
+
+        # {object: sequence}, objects moved in the room in this interval
+        self.joined = {}
+
+        # the room was crowded at last flush
+        self.crowded = False
+
+        self.flush_call = None
+
+    def add(self, event, type, obj):
+        """
+        An object moved in or out.
+
+        Args:
+            event: (string) "obj_moved_in" or "obj_moved_out".
+            type: (string) object's surrounding type.
+            obj: (object) the moved object.
+        """
+        self.sequence += 1
+        self.events.append((self.sequence, event, type, {"dbref": obj.dbref,
+                                                         "name": obj.get_name()}))
+        if event == "obj_moved_in":
+            # the object gets full data of the room when it moves in, it does
+            # not need changes before that
+            self.joined[obj] = self.sequence
+
+        if not self.flush_call:
+            interval = GAME_SETTINGS.get("room_notify_interval")
+            self.flush_call = reactor.callLater(interval, self.flush)
+
+    def flush(self):
+        """
+        Send all changes.
+        """
+        self.flush_call = None
+
+        events = self.events
+        joined = self.joined
+        self.events = []
+        self.joined = {}
+
+        try:
+            listeners = self.owner.listener_handler.all()
+            crowded = self.owner.is_crowded()
+
+            crowd = None
+            if crowded:
+                crowd = {"count": len(listeners)}
+            elif self.crowded:
+                # send all players when the room is not crowded any more
+                crowd = {"count": len(listeners),
+                         "players": [{"dbref": obj.dbref, "name": obj.get_name()} for obj in listeners]}
+            self.crowded = crowded
+
+            # listeners who joined at the same time get the same message
+            groups = {}
+            for obj in listeners:
+                groups.setdefault(joined.get(obj, 0), []).append(obj)
+
+            for since, receivers in groups.items():
+                message = self.get_message(events, since, crowded)
+                if crowd:
+                    message["room_crowd"] = crowd
+                if message:
+                    self.owner.listener_handler.send(message, receivers)
+        except Exception, e:
+            logger.log_errmsg("Can not send room changes: %s" % e)
+            traceback.print_exc()
+
+    def get_message(self, events, since, crowded):
+        """
+        Merge changes after a sequence.
+
+        Args:
+            events: (list) events in order.
+            since: (int) only merge events after this sequence.
+            crowded: (boolean) do not send players' changes.
+
+        Returns:
+            (dict) message
+        """
+        # {dbref: (event, type, entry)}
+        changes = OrderedDict()
+        for sequence, event, type, entry in events:
+            if sequence <= since:
+                continue
+
+            if crowded and type in ("players", "offlines"):
+                continue
+
+            last = changes.get(entry["dbref"])
+            if last and last[0] != event:
+                # moved in and out, or moved out and in
+                del changes[entry["dbref"]]
+            else:
+                changes[entry["dbref"]] = (event, type, entry)
+
+        message = {}
+        for event, type, entry in changes.values():
+            message.setdefault(event, {}).setdefault(type, []).append(entry)
+        return message
@@ -3,7 +3,11 @@ Data are arbitrary data stored in worlddata tables. They are read only.
 
 """
 from builtins import object
-import weakref
+import time, weakref, traceback
+from django.conf import settings
+from django.db import transaction
+from twisted.internet import task
+from evennia.utils import logger
 
 
 class PropertiesHandler(object):
@@ -18,6 +22,10 @@ class PropertiesHandler(object):
         self.obj = weakref.proxy(obj)
         self.info = obj.get_properties_info()
 
+        # Mutable properties which have not been written to db.
+        self._dirty = set()
+        self.dirty_time = 0
+
         # Load mutable properties from db.
         for key, info in self.info.items():
             if info["mutable"]:
@@ -61,7 +69,72 @@ class PropertiesHandler(object):
         """
         self._store[key] = value
         if self.info[key]["mutable"]:
-            self.obj.attributes.add(key, value, category="prop")
+            PROPERTIES_WRITER.write(self, key)
+
+    def mark_dirty(self, key):
+        """
+        Mark a property to be written to db later.
+
+        Args:
+            key (str): The property's key.
+
+        Returns:
+            (bool) the property is already dirty.
+        """
+        if key in self._dirty:
+            return True
+
+        if not self._dirty:
+            self.dirty_time = time.time()
+        self._dirty.add(key)
+        return False
+
+    def is_dirty(self):
+        """
+        If there are properties which have not been written to db.
+        """
+        return bool(self._dirty)
+
+    def save(self, keys=None):
+        """
+        Write properties to db.
+
+        Args:
+            keys (iterable): properties' keys, save dirty properties if it is None.
+
+        Returns:
+            (int) the number of written properties.
+        """
+        if keys is None:
+            keys = self._dirty
+
+        try:
+            if not self.obj.pk:
+                # the object has been deleted
+                return 0
+        except ReferenceError:
+            return 0
+
+        count = 0
+        for key in keys:
+            if key in self._store:
+                self.obj.attributes.add(key, self._store[key], category="prop")
+                count += 1
+        return count
+
+    def clean(self):
+        """
+        Mark all properties as saved.
+        """
+        self._dirty = set()
+        self.dirty_time = 0
+
+    def flush(self):
+        """
+        Write dirty properties to db now.
+        """
+        if self._dirty:
+            PROPERTIES_WRITER.flush([self])
 
     def clear(self):
         """
@@ -69,6 +142,7 @@ class PropertiesHandler(object):
 
         """
         self._store = {}
+        self.clean()
 
     def all(self, return_tuples=False):
         """
@@ -87,3 +161,112 @@ class PropertiesHandler(object):
         if return_tuples:
             return [(key, value) for (key, value) in self._store.items()]
         return [key for key in self._store]
+
+
+class PropertiesWriter(object):
+    """
+    Writes mutable properties to db. Changed properties are kept in memory and
+    written in batches, a property changed many times is only written once.
+    """
+    def __init__(self):
+        """
+        Initialize the writer.
+        """
+        # Write properties to db immediately if the interval is 0.
+        self.interval = settings.PROPERTIES_FLUSH_INTERVAL
+        self.max_dirty_age = settings.PROPERTIES_MAX_DIRTY_AGE
+
+        # handlers which have dirty properties
+        self.handlers = set()
+        self.loop = None
+
+        # metrics
+        self.writes = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.flushes = 0
+
+    def write(self, handler, key):
+        """
+        A property has been changed.
+
+        Args:
+            handler: (PropertiesHandler) the property's handler.
+            key: (string) the property's key.
+        """
+        self.writes += 1
+
+        if not self.interval:
+            # write it now
+            self.flushed += handler.save([key])
+            return
+
+        if handler.mark_dirty(key):
+            self.coalesced += 1
+            if time.time() - handler.dirty_time > self.max_dirty_age:
+                # the flush timer is lagging, do not keep them too long
+                self.flush([handler])
+            return
+
+        self.handlers.add(handler)
+
+        if not self.loop or not self.loop.running:
+            self.loop = task.LoopingCall(self.flush_all)
+            self.loop.start(self.interval, now=False)
+
+    def flush(self, handlers):
+        """
+        Write handlers' dirty properties to db in one transaction.
+
+        Args:
+            handlers: (list) PropertiesHandlers.
+        """
+        count = 0
+        try:
+            with transaction.atomic():
+                for handler in handlers:
+                    count += handler.save()
+        except Exception, e:
+            if len(handlers) > 1:
+                # write them one by one, so one error does not block others
+                for handler in handlers:
+                    self.flush([handler])
+                return
+
+            # keep it dirty, it will be written in the next flush
+            logger.log_errmsg("Can not write properties: %s" % e)
+            traceback.print_exc()
+            return
+
+        for handler in handlers:
+            handler.clean()
+            self.handlers.discard(handler)
+
+        self.flushed += count
+        self.flushes += 1
+
+    def flush_all(self):
+        """
+        Write all dirty properties to db.
+        """
+        if self.handlers:
+            self.flush(list(self.handlers))
+
+        if not self.handlers and self.loop and self.loop.running:
+            self.loop.stop()
+
+    def stats(self):
+        """
+        Get the writer's metrics.
+
+        Returns:
+            (dict) metrics
+        """
+        return {"dirty_objects": len(self.handlers),
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "flushed": self.flushed,
+                "flushes": self.flushes}
+
+
+PROPERTIES_WRITER = PropertiesWriter()
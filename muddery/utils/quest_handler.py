@@ -8,6 +8,7 @@ from django.conf import settings
 from django.apps import apps
 from django.core.exceptions import ObjectDoesNotExist
 from evennia.utils import logger
+from muddery.utils import defines
 from muddery.utils.builder import build_object
 from muddery.statements.statement_handler import STATEMENT_HANDLER
 from muddery.utils.localized_strings_handler import _
@@ -51,6 +52,7 @@ class QuestHandler(object):
 
         new_quest.set_owner(self.owner)
         self.current_quests[quest_key] = new_quest
+        self.owner.statement_memo.changed(defines.CHANGE_QUEST)
 
         self.owner.msg({"msg": _("Accepted quest {c%s{n.") % new_quest.get_name()})
         self.show_quests()
@@ -65,6 +67,7 @@ class QuestHandler(object):
         for quest_key in self.current_quests:
             self.current_quests[quest_key].delete()
         self.current_quests = []
+        self.owner.statement_memo.changed(defines.CHANGE_QUEST)
 
     def give_up(self, quest_key):
         """
@@ -89,6 +92,7 @@ class QuestHandler(object):
         if quest_key in self.finished_quests:
             self.finished_quests.remove(quest_key)
 
+        self.owner.statement_memo.changed(defines.CHANGE_QUEST)
         self.show_quests()
 
     def turn_in(self, quest_key):
@@ -118,6 +122,7 @@ class QuestHandler(object):
         del (self.current_quests[quest_key])
 
         self.finished_quests.add(quest_key)
+        self.owner.statement_memo.changed(defines.CHANGE_QUEST)
 
         self.owner.msg({"msg": _("Turned in quest {c%s{n.") % name})
         self.show_quests()
@@ -255,7 +260,7 @@ class QuestHandler(object):
         Send quests to player.
         """
         quests = self.return_quests()
-        self.owner.msg({"quests": quests})
+        self.owner.state_sync.send({"quests": quests})
 
     def return_quests(self):
         """
@@ -294,4 +299,5 @@ class QuestHandler(object):
                         _("Quest {c%s{n's goals are accomplished.") % quest.name})
 
         if status_changed:
+            self.owner.statement_memo.changed(defines.CHANGE_QUEST)
             self.show_quests()
@@ -45,6 +45,12 @@ class DataReader(object):
         # No data.
         raise StopIteration
 
+    def close(self):
+        """
+        Release the file.
+        """
+        pass
+
 
 class CSVReader(DataReader):
     """
@@ -62,6 +68,7 @@ class CSVReader(DataReader):
         """
         super(CSVReader, self).__init__(filename)
 
+        self.file = None
         self.reader = None
         if filename:
             csvfile = open(filename, 'r')
@@ -71,6 +78,9 @@ class CSVReader(DataReader):
             if head != codecs.BOM_UTF8:
                 # read from beginning
                 csvfile.seek(0)
+
+            # read lines from the file when they are needed
+            self.file = csvfile
             self.reader = csv.reader(csvfile)
 
     def readln(self):
@@ -84,9 +94,23 @@ class CSVReader(DataReader):
             raise StopIteration
 
         # Read line.
-        values = self.reader.next()
+        try:
+            values = self.reader.next()
+        except StopIteration:
+            self.close()
+            raise
+
         return [unicode(v, "utf-8") for v in values]
 
+    def close(self):
+        """
+        Close the file.
+        """
+        if self.file:
+            self.file.close()
+            self.file = None
+        self.reader = None
+
 
 class XLSReader(DataReader):
     """
@@ -104,6 +128,10 @@ class XLSReader(DataReader):
         """
         super(XLSReader, self).__init__(filename)
 
+        self.book = None
+        self.sheet = None
+        self.row_pos = 0
+
         if not xlrd:
             print('**********************************************************')
             print('You need to install "xlrd" first to import xls/xlsx files!')
@@ -112,11 +140,10 @@ class XLSReader(DataReader):
             return
 
         # load file
-        self.sheet = None
-        self.row_pos = 0
         if filename:
-            book = xlrd.open_workbook(filename)
-            self.sheet = book.sheet_by_index(0)
+            # only load the first sheet
+            self.book = xlrd.open_workbook(filename, on_demand=True)
+            self.sheet = self.book.sheet_by_index(0)
 
     def readln(self):
         """
@@ -129,6 +156,7 @@ class XLSReader(DataReader):
             raise StopIteration
 
         if self.row_pos >= self.sheet.nrows:
+            self.close()
             raise StopIteration
 
         # Read line.
@@ -136,6 +164,15 @@ class XLSReader(DataReader):
         self.row_pos += 1
         return self.sheet.row_values(pos)
 
+    def close(self):
+        """
+        Release the workbook.
+        """
+        if self.book:
+            self.book.release_resources()
+            self.book = None
+        self.sheet = None
+
 
 all_readers = [CSVReader, XLSReader]
 def get_readers():
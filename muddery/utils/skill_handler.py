@@ -0,0 +1,619 @@
+"""
+SkillHandler keeps a character's skills in one packed record instead of skill
+objects in the database.
+
+Skills' data are loaded from world data and are shared by all characters. A
+character's learned skills and their cooldowns are packed into one attribute,
+which is written when skills are learned, removed or cast.
+
+Characters' skills are CharacterSkill objects. A skill typeclass can set its
+skill_class to the path of a CharacterSkill's child class to change skills'
+behaviours.
+"""
+
+from __future__ import print_function
+
+import ast, json, re, time, weakref
+from evennia.utils import logger
+from evennia.utils.utils import class_from_module
+from muddery.utils.game_settings import GAME_SETTINGS
+from muddery.utils.desc_handler import DESC_HANDLER
+from muddery.utils.localized_strings_handler import _
+from muddery.statements.statement_handler import STATEMENT_HANDLER
+from muddery.mappings.typeclass_set import TYPECLASS
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
+from muddery.worlddata.dao.object_properties_mapper import OBJECT_PROPERTIES
+
+
+# the attribute to store a character's skills
+SKILL_RECORD_KEY = "skill_record"
+
+MSG_ESCAPE = re.compile(r'%[%|n|c|t]')
+
+
+def escape_fun(word):
+    """
+    Change escapes to target words.
+    """
+    escape_word = word.group()
+    char = escape_word[1]
+    if char == "%":
+        return char
+    else:
+        return "%(" + char + ")s"
+
+
+def pack_skills(skills):
+    """
+    Pack skills' states to a string.
+
+    Args:
+        skills: (list) [(skill's key, is default, cd finish time)]
+
+    Returns:
+        (string) packed skills
+    """
+    return json.dumps([[key, 1 if is_default else 0, cd_finish_time]
+                       for key, is_default, cd_finish_time in skills],
+                      separators=(",", ":"))
+
+
+def unpack_skills(record):
+    """
+    Unpack skills' states.
+
+    Args:
+        record: (string) packed skills.
+
+    Returns:
+        (list) [(skill's key, is default, cd finish time)]
+    """
+    if not record:
+        return []
+
+    try:
+        return [(key, bool(is_default), cd_finish_time)
+                for key, is_default, cd_finish_time in json.loads(record)]
+    except Exception, e:
+        logger.log_errmsg("Can not unpack skills %s: %s" % (record, e))
+        return []
+
+
+class SkillProperties(object):
+    """
+    A skill's custom properties, they are shared by all characters and can not
+    be changed.
+    """
+    def __init__(self, values):
+        """
+        Args:
+            values: (dict) properties' values.
+        """
+        self.__dict__.update(values)
+
+    def __getattr__(self, key):
+        """
+        Properties which are not set are None.
+        """
+        return None
+
+
+class SkillData(object):
+    """
+    A skill's data shared by all characters.
+    """
+    def __init__(self, key, data, properties, skill_class):
+        """
+        Set the skill's data.
+
+        Args:
+            key: (string) skill's key.
+            data: (dict) skill's fields in world data.
+            properties: (dict) skill's custom properties.
+            skill_class: (class) characters' skills' class.
+        """
+        self.name = ""
+        self.desc = ""
+        self.icon = None
+        self.function = ""
+        self.cd = 0
+        self.passive = False
+        self.main_type = ""
+        self.sub_type = ""
+        self.message = ""
+
+        # keep all fields
+        self.__dict__.update(data)
+        self.key = key
+        self.prop = SkillProperties(properties)
+        self.skill_class = skill_class
+
+        self.message_model = MSG_ESCAPE.sub(escape_fun, self.message) if self.message else ""
+
+
+class SkillDataHandler(object):
+    """
+    Skills' data loaded from world data.
+    """
+    def __init__(self):
+        """
+        Initialize the handler.
+        """
+        # {skill's key: SkillData or None}
+        self.skills = {}
+
+        # {class's path: class}
+        self.classes = {}
+
+    def reload(self):
+        """
+        Clear all skills' data, they will be loaded again when they are used.
+        """
+        self.skills = {}
+        self.classes = {}
+
+    def get_skill_class(self, typeclass_key):
+        """
+        Get the class of characters' skills. It is set by the skill's typeclass.
+
+        Args:
+            typeclass_key: (string) skill's typeclass.
+        """
+        typeclass = TYPECLASS(typeclass_key) if typeclass_key else None
+        path = getattr(typeclass, "skill_class", None)
+        if not path:
+            return CharacterSkill
+
+        if path not in self.classes:
+            self.classes[path] = class_from_module(path)
+        return self.classes[path]
+
+    def get_properties(self, key, typeclass_key):
+        """
+        Get a skill's custom properties.
+
+        Args:
+            key: (string) skill's key.
+            typeclass_key: (string) skill's typeclass.
+        """
+        values = {}
+        for record in OBJECT_PROPERTIES.get_properties(key, 0):
+            serializable_value = record.value
+            if serializable_value == "":
+                value = None
+            else:
+                try:
+                    value = ast.literal_eval(serializable_value)
+                except (SyntaxError, ValueError), e:
+                    # treat as a raw string
+                    value = serializable_value
+            values[record.property] = value
+
+        typeclass = TYPECLASS(typeclass_key) if typeclass_key else None
+        if typeclass:
+            for prop_key in typeclass.get_properties_info():
+                values.setdefault(prop_key, "")
+
+        return values
+
+    def get(self, key):
+        """
+        Get a skill's data.
+
+        Args:
+            key: (string) skill's key.
+
+        Returns:
+            (SkillData) skill's data, or None if the skill does not exist.
+        """
+        if key in self.skills:
+            return self.skills[key]
+
+        data = {}
+        try:
+            for model_name in ("objects", "skills"):
+                record = WORLD_DATA.get(model_name, key=key)
+                for field in record._meta.fields:
+                    data[field.name] = record.serializable_value(field.name)
+
+            typeclass_key = data.get("typeclass")
+            skill = SkillData(key,
+                              data,
+                              self.get_properties(key, typeclass_key),
+                              self.get_skill_class(typeclass_key))
+        except Exception, e:
+            logger.log_errmsg("Can not load skill %s: %s" % (key, e))
+            skill = None
+
+        self.skills[key] = skill
+        return skill
+
+
+SKILL_DATA = SkillDataHandler()
+
+
+class CharacterSkill(object):
+    """
+    A character's skill. Skill typeclasses can use child classes of it by
+    setting their skill_class.
+    """
+    def __init__(self, handler, data, is_default=False, cd_finish_time=0):
+        """
+        Args:
+            handler: (SkillHandler) the owner's skill handler.
+            data: (SkillData) skill's data.
+            is_default: (boolean) if it is the character's default skill.
+            cd_finish_time: (float) the time when the cooldown finishes.
+        """
+        self.handler = handler
+        self.data = data
+        self.default = is_default
+        self.cd_finish_time = cd_finish_time
+
+    @property
+    def owner(self):
+        """
+        The character who has this skill.
+        """
+        return self.handler.get_owner()
+
+    @property
+    def prop(self):
+        return self.data.prop
+
+    @property
+    def name(self):
+        return self.data.name
+
+    @property
+    def icon(self):
+        return self.data.icon
+
+    @property
+    def function(self):
+        return self.data.function
+
+    @property
+    def cd(self):
+        return self.data.cd
+
+    @property
+    def passive(self):
+        return self.data.passive
+
+    @property
+    def main_type(self):
+        return self.data.main_type
+
+    @property
+    def sub_type(self):
+        return self.data.sub_type
+
+    def get_data_key(self, default=""):
+        """
+        Get the skill's key.
+        """
+        return self.data.key or default
+
+    def get_name(self):
+        """
+        Get the skill's name.
+        """
+        return self.data.name
+
+    def get_desc(self, caller):
+        """
+        This returns the skill's descriptions on different conditions.
+        """
+        desc_conditions = DESC_HANDLER.get(self.data.key)
+        if desc_conditions:
+            for item in desc_conditions:
+                if STATEMENT_HANDLER.match_condition(item["condition"], caller, self):
+                    return item["desc"]
+        return self.data.desc
+
+    def set_default(self, is_default):
+        """
+        Set this skill as the character's default skill.
+        When skills in table default_skills changes, character's relative skills
+        will change too.
+
+        Args:
+            is_default: (boolean) if the is default or not.
+        """
+        self.default = is_default
+        self.handler.save()
+
+    def is_default(self):
+        """
+        Check if this skill is the character's default skill.
+
+        Returns:
+            (boolean) is default or not
+        """
+        return self.default
+
+    def get_available_commands(self, caller):
+        """
+        This returns a list of available commands.
+
+        Args:
+            caller: (object) command's caller
+
+        Returns:
+            commands: (list) a list of available commands
+        """
+        if self.passive:
+            return []
+
+        commands = [{"name": _("Cast"), "cmd": "castskill", "args": self.data.key}]
+        return commands
+
+    def cast_skill(self, target, passive):
+        """
+        Cast this skill.
+
+        Args:
+            target: (object) skill's target.
+            passive: (boolean) cast a passive skill.
+
+        Returns:
+            (boolean) the skill has been cast
+        """
+        owner = self.owner
+        message = {}
+        not_available = self.check_available(passive)
+        if not_available:
+            message = {"cast": not_available}
+        else:
+            results = self.do_skill(target)
+
+            if not passive:
+                # set message
+                message = {"caller": owner.dbref,
+                           "skill": self.data.key,
+                           "cast": self.cast_message(target)}
+
+                if target:
+                    message["target"] = target.dbref
+
+                if results:
+                    message["result"] = " ".join(results)
+
+                # set status
+                status = {}
+                if owner.is_in_combat():
+                    for char in owner.ndb.combat_handler.get_all_characters():
+                        status[char.dbref] = char.get_combat_status()
+                elif owner.location:
+                    status[owner.dbref] = owner.get_combat_status()
+                message["status"] = status
+
+        if not passive and message:
+            # send message
+            if owner.is_in_combat():
+                owner.ndb.combat_handler.msg_all({"skill_cast": message})
+            elif owner.location:
+                owner.location.msg_contents({"skill_cast": message})
+
+        return True
+
+    def do_skill(self, target):
+        """
+        Do this skill.
+        """
+        # set cd
+        if not self.passive and self.cd > 0:
+            self.cd_finish_time = time.time() + self.cd
+            self.handler.save()
+
+        # call skill function
+        return STATEMENT_HANDLER.do_skill(self.function, self.owner, target)
+
+    def check_available(self, passive):
+        """
+        Check this skill.
+
+        Args:
+            passive: (boolean) cast a passive skill.
+
+        Returns:
+            message: (string) If the skill is not available, returns a string of reason.
+                     If the skill is available, return "".
+        """
+        if not passive and self.passive:
+            return _("{c%s{n is a passive skill!") % self.get_name()
+
+        if self.is_cooling_down():
+            return _("{c%s{n is not ready yet!") % self.get_name()
+
+        return ""
+
+    def is_available(self, passive):
+        """
+        If this skill is available.
+
+        Args:
+            passive: (boolean) cast a passive skill.
+
+        Returns:
+            (boolean) available or not.
+        """
+        if not passive and self.passive:
+            return False
+
+        if self.is_cooling_down():
+            return False
+
+        return True
+
+    def is_cooling_down(self):
+        """
+        If this skill is cooling down.
+        """
+        return self.cd > 0 and time.time() < self.cd_finish_time
+
+    def get_remain_cd(self):
+        """
+        Get skill's CD.
+
+        Returns:
+            (float) Remain CD in seconds.
+        """
+        remain_cd = self.cd_finish_time - time.time()
+        if remain_cd < 0:
+            remain_cd = 0
+        return remain_cd
+
+    def cast_message(self, target):
+        """
+        Create skill's result message.
+        """
+        caller_name = ""
+        target_name = ""
+        message = ""
+
+        owner = self.owner
+        if owner:
+            caller_name = owner.get_name()
+
+        if target:
+            target_name = target.get_name()
+
+        if self.data.message_model:
+            values = {"n": self.data.name,
+                      "c": caller_name,
+                      "t": target_name}
+            message = self.data.message_model % values
+
+        return message
+
+    def get_appearance(self, caller):
+        """
+        This is a convenient hook for a 'look'
+        command to call.
+        """
+        info = {"key": self.data.key,
+                "name": self.get_name(),
+                "desc": self.get_desc(caller),
+                "cmds": self.get_available_commands(caller),
+                "icon": self.icon,
+                "passive": self.passive,
+                "cd_remain": self.get_remain_cd()}
+        return info
+
+
+class SkillHandler(object):
+    """
+    Keeps a character's skills. Skills are loaded when they are used first
+    time.
+    """
+    def __init__(self, owner):
+        """
+        Initialize handler
+        """
+        self.owner = weakref.proxy(owner)
+        self.owner_ref = weakref.ref(owner)
+
+        # {skill's key: CharacterSkill}
+        # It is None before skills are loaded.
+        self.skills = None
+
+    def get_owner(self):
+        """
+        Get the owner object.
+        """
+        return self.owner_ref()
+
+    def load(self):
+        """
+        Load skills from the owner's record.
+        """
+        skills = {}
+        record = self.owner.attributes.get(SKILL_RECORD_KEY)
+        for key, is_default, cd_finish_time in unpack_skills(record):
+            data = SKILL_DATA.get(key)
+            if data:
+                skills[key] = data.skill_class(self, data, is_default, cd_finish_time)
+        self.skills = skills
+
+    def save(self):
+        """
+        Write skills to the owner's record.
+        """
+        if self.skills is None:
+            return
+
+        record = pack_skills((key, skill.default, skill.cd_finish_time)
+                             for key, skill in self.skills.iteritems())
+        self.owner.attributes.add(SKILL_RECORD_KEY, record)
+
+    def all(self):
+        """
+        Get all skills.
+
+        Returns:
+            (dict) {skill's key: skill}, do not modify it.
+        """
+        if self.skills is None:
+            self.load()
+
+        return self.skills
+
+    def has(self, key):
+        """
+        If the owner has the skill.
+        """
+        return key in self.all()
+
+    def get(self, key):
+        """
+        Get a skill.
+
+        Args:
+            key: (string) skill's key.
+
+        Returns:
+            (CharacterSkill) skill, or None if the owner does not have it.
+        """
+        return self.all().get(key)
+
+    def add(self, key, is_default):
+        """
+        Add a new skill.
+
+        Args:
+            key: (string) skill's key.
+            is_default: (boolean) if it is a default skill.
+
+        Returns:
+            (CharacterSkill) the new skill, or None if it can not be added.
+        """
+        skills = self.all()
+        if key in skills:
+            return None
+
+        data = SKILL_DATA.get(key)
+        if not data:
+            return None
+
+        skill = data.skill_class(self, data, is_default)
+        if not skill.passive:
+            # Set skill cd. Add gcd to the new skill.
+            gcd = GAME_SETTINGS.get("global_cd")
+            if gcd > 0:
+                skill.cd_finish_time = time.time() + gcd
+
+        skills[key] = skill
+        self.save()
+        return skill
+
+    def remove(self, key):
+        """
+        Remove a skill.
+
+        Args:
+            key: (string) skill's key.
+        """
+        if self.all().pop(key, None):
+            self.save()
@@ -0,0 +1,188 @@
+"""
+StateSyncHandler sends a character's inventory, status, equipments, skills and
+quests to the client. The first message of a session contains full data, later
+messages only contain changed entries.
+
+Full data:
+    {"inventory": [...], "state_versions": {"inventory": <version>}}
+
+Changes:
+    {"state_delta": {"inventory": {"version": <version>,
+                                   "changed": {<entry's key>: <entry>},
+                                   "removed": [<entry's key>],
+                                   "order": [<entry's key>]}}}
+
+"order" is only sent when the order of entries has been changed. If the client
+finds a version gap, it sends a "resync" command to get full data again.
+"""
+
+from __future__ import print_function
+
+import weakref
+
+
+# Data of these channels are lists of entries, entries are identified by dbrefs,
+# or by keys if they are not objects, such as skills.
+LIST_CHANNELS = ("inventory", "skills", "quests")
+
+# Data of these channels are dicts.
+DICT_CHANNELS = ("status", "equipments")
+
+CHANNELS = LIST_CHANNELS + DICT_CHANNELS
+
+
+def get_entries(channel, data):
+    """
+    Index a channel's data.
+
+    Args:
+        channel: (string) channel's name.
+        data: (list or dict) channel's data.
+
+    Returns:
+        (dict, list) {entry's key: entry}, [entries' keys in order]
+    """
+    if channel in LIST_CHANNELS:
+        entries = {}
+        order = []
+        for item in data:
+            entry_id = item["dbref"] if "dbref" in item else item["key"]
+            entries[entry_id] = item
+            order.append(entry_id)
+        return entries, order
+    else:
+        return data, None
+
+
+def get_delta(last_entries, last_order, entries, order):
+    """
+    Get changes between two versions of data.
+
+    Args:
+        last_entries: (dict) last sent entries.
+        last_order: (list) last sent order.
+        entries: (dict) current entries.
+        order: (list) current order.
+
+    Returns:
+        (dict) changes, or None if nothing changed.
+    """
+    changed = {}
+    for key, entry in entries.iteritems():
+        if key not in last_entries or last_entries[key] != entry:
+            changed[key] = entry
+
+    removed = [key for key in last_entries if key not in entries]
+
+    delta = {}
+    if changed:
+        delta["changed"] = changed
+    if removed:
+        delta["removed"] = removed
+    if order is not None and order != last_order:
+        delta["order"] = order
+
+    return delta or None
+
+
+class StateSyncHandler(object):
+    """
+    Keeps the last sent data of each session and sends changes.
+    """
+    def __init__(self, owner):
+        """
+        Initialize handler
+        """
+        self.owner = weakref.proxy(owner)
+
+        # {session id: {channel: (version, entries, order)}}
+        self.sent = {}
+
+    def clear(self, session=None):
+        """
+        Send full data next time.
+
+        Args:
+            session: (Session) clear this session's data, clear all sessions'
+                     data if it is None.
+        """
+        if session:
+            self.sent.pop(session.sessid, None)
+        else:
+            self.sent = {}
+
+    def resync(self, channels, session):
+        """
+        Send full data of channels to a session.
+
+        Args:
+            channels: (list) channels' names.
+            session: (Session) the session to receive data.
+        """
+        sent = self.sent.get(session.sessid)
+        if sent:
+            for channel in channels:
+                sent.pop(channel, None)
+
+        getters = {"inventory": self.owner.return_inventory,
+                   "status": self.owner.return_status,
+                   "equipments": self.owner.return_equipments,
+                   "skills": self.owner.return_skills,
+                   "quests": self.owner.quest_handler.return_quests}
+        states = dict((channel, getters[channel]()) for channel in channels if channel in getters)
+        self.send(states, session=session)
+
+    def send(self, states, session=None, **kwargs):
+        """
+        Send data to sessions.
+
+        Args:
+            states: (dict) {channel: data}, data of channels.
+            session: (Session) send data to this session, send data to all
+                     sessions if it is None.
+            kwargs: other messages to send with data.
+        """
+        if session:
+            sessions = [session]
+        else:
+            sessions = self.owner.sessions.all()
+
+            # remove closed sessions
+            sessids = set(sess.sessid for sess in sessions)
+            for sessid in self.sent.keys():
+                if sessid not in sessids:
+                    del self.sent[sessid]
+
+        indexed = dict((channel, get_entries(channel, data)) for channel, data in states.iteritems())
+
+        for sess in sessions:
+            sent = self.sent.setdefault(sess.sessid, {})
+            message = dict(kwargs)
+            versions = {}
+            deltas = {}
+
+            for channel, data in states.iteritems():
+                entries, order = indexed[channel]
+
+                if channel not in sent:
+                    # send full data
+                    message[channel] = data
+                    versions[channel] = 1
+                    sent[channel] = (1, entries, order)
+                    continue
+
+                version, last_entries, last_order = sent[channel]
+                delta = get_delta(last_entries, last_order, entries, order)
+                if delta:
+                    version += 1
+                    delta["version"] = version
+                    deltas[channel] = delta
+                    sent[channel] = (version, entries, order)
+
+            if versions:
+                message["state_versions"] = versions
+            if deltas:
+                message["state_delta"] = deltas
+
+            if message:
+                self.owner.msg(message, session=sess)
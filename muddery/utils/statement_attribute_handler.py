@@ -2,6 +2,7 @@
 Handles a character's attributes used in statements.
 """
 
+from muddery.utils import defines
 from muddery.utils.localized_strings_handler import _
 from django.conf import settings
 from evennia.utils import logger
@@ -23,6 +24,7 @@ class StatementAttributeHandler(object):
         Set an attribute.
         """
         self.attributes[key] = value
+        self.owner.statement_memo.changed(defines.CHANGE_ATTRIBUTE)
 
     def get(self, key, default=None):
         """
@@ -44,6 +46,7 @@ class StatementAttributeHandler(object):
             return False
 
         del self.attributes[key]
+        self.owner.statement_memo.changed(defines.CHANGE_ATTRIBUTE)
         return True
 
     def has(self, key):
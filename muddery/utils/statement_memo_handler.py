@@ -0,0 +1,99 @@
+"""
+Memoizes a character's const statement function results.
+
+A result is kept until the character's state it depends on changes.
+
+The handler's version increases when any state changes, and its volatile
+counter increases when a statement function which can not be memoized is
+called. Other caches can use them to memoize results of whole statements.
+"""
+
+
+class StatementMemoHandler(object):
+    """
+    Memoizes results of const statement functions called by a character.
+    """
+    def __init__(self, owner):
+        """
+        Initialize handler.
+        """
+        self.owner = owner
+        self.results = {}
+        self.dependents = {}
+
+        # increases when the character's state changes
+        self.version = 0
+
+        # increases when a function which can not be memoized is called
+        self.volatile = 0
+
+        # counters for profiling
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, depends, function):
+        """
+        Get a memoized result. If there is no result, call the function.
+
+        Args:
+            key: (tuple) function's key and args.
+            depends: (tuple) changes that will invalidate the result.
+            function: (function) function to get the result.
+
+        Returns:
+            the result
+        """
+        try:
+            result = self.results[key]
+            self.hits += 1
+            return result
+        except KeyError:
+            pass
+
+        self.misses += 1
+        result = function()
+        self.results[key] = result
+        for change in depends:
+            if change not in self.dependents:
+                self.dependents[change] = set()
+            self.dependents[change].add(key)
+        return result
+
+    def changed(self, change):
+        """
+        The character's state has changed, remove results depend on it.
+
+        Args:
+            change: (string) the change's type, defined in defines.CHANGE_*
+        """
+        self.version += 1
+
+        keys = self.dependents.pop(change, None)
+        if not keys:
+            return
+
+        for key in keys:
+            if key in self.results:
+                del self.results[key]
+                self.invalidations += 1
+
+    def clear(self):
+        """
+        Remove all results.
+        """
+        self.version += 1
+        self.results = {}
+        self.dependents = {}
+
+    def stats(self):
+        """
+        Get the handler's counters.
+
+        Returns:
+            (dict) counters
+        """
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self.results)}
@@ -0,0 +1,184 @@
+"""
+SurroundingsHandler caches a room's surroundings. Data which do not depend on
+the caller, such as objects' dbrefs, names, keys and types, are cached in the
+room and updated when objects move in or out or are renamed. Results of
+callers' filters, such as visible conditions and quest marks, are memoized
+until the caller's state changes. Locks are checked every time.
+"""
+
+from __future__ import print_function
+
+import weakref
+from muddery.utils.game_settings import GAME_SETTINGS
+
+
+class SurroundingsHandler(object):
+    """
+    Keeps surroundings' data of a room.
+    """
+    def __init__(self, owner):
+        """
+        Initialize handler
+        """
+        self.owner = weakref.proxy(owner)
+
+        # {object: {"type": surrounding type, "dbref": dbref, "name": name, "key": data key}}
+        self.entries = {}
+
+        # {caller's id: (caller's state version, {object: (visible, provide_quest, complete_quest)})}
+        self.memo = {}
+
+        # counters for profiling
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """
+        Reload all data next time.
+        """
+        self.entries = {}
+        self.memo = {}
+
+    def update(self, obj):
+        """
+        An object moved in or its data changed.
+        """
+        type = self.owner.get_surrounding_type(obj)
+        if not type:
+            self.entries.pop(obj, None)
+        else:
+            if type == "offlines":
+                type = "players"
+            self.entries[obj] = {"type": type,
+                                 "dbref": obj.dbref,
+                                 "name": obj.get_name(),
+                                 "key": obj.get_data_key()}
+
+        # the object's condition may have changed
+        for version, results in self.memo.values():
+            results.pop(obj, None)
+
+    def remove(self, obj):
+        """
+        An object moved out.
+        """
+        self.entries.pop(obj, None)
+        self.memo.pop(obj.id, None)
+        for version, results in self.memo.values():
+            results.pop(obj, None)
+
+    def get_filter(self, caller, obj):
+        """
+        Check if the object's condition matches the caller and if the object
+        has quests for the caller. Locks are not checked here, because lock
+        and permission changes do not change the caller's state version.
+
+        Returns:
+            (tuple) (visible, provide_quest, complete_quest)
+        """
+        if not obj.is_visible(caller):
+            return (False, False, False)
+
+        if self.entries[obj]["type"] == "npcs" and hasattr(obj, "have_quest"):
+            provide_quest, complete_quest = obj.have_quest(caller)
+            return (True, provide_quest, complete_quest)
+
+        return (True, False, False)
+
+    def get(self, caller, crowded):
+        """
+        Get the caller's surroundings.
+
+        Args:
+            caller: (object) the caller.
+            crowded: (boolean) do not get players.
+
+        Returns:
+            (dict) surroundings in types
+        """
+        info = {"exits": [],
+                "npcs": [],
+                "things": [],
+                "players": [],
+                "offlines": []}
+
+        contents = self.owner.contents
+
+        # objects may be created or moved without calling hooks
+        if len(self.entries) > len(contents):
+            current = set(contents)
+            for obj in [obj for obj in self.entries if obj not in current]:
+                self.remove(obj)
+
+        state = getattr(caller, "statement_memo", None)
+        if state is None:
+            results = None
+        else:
+            version, results = self.memo.get(caller.id, (None, None))
+            if version != state.version:
+                results = {}
+                self.memo[caller.id] = (state.version, results)
+
+        solo_mode = GAME_SETTINGS.get("solo_mode")
+        for obj in contents:
+            if obj == caller:
+                continue
+
+            entry = self.entries.get(obj)
+            if entry is None:
+                self.update(obj)
+                entry = self.entries.get(obj)
+                if entry is None:
+                    continue
+
+            type = entry["type"]
+            if type == "players":
+                if not obj.has_account:
+                    # offline players are not shown
+                    continue
+                elif crowded or solo_mode:
+                    continue
+
+            if not obj.access(caller, "view"):
+                continue
+
+            if results is None:
+                filter = self.get_filter(caller, obj)
+            else:
+                filter = results.get(obj)
+                if filter is None:
+                    self.misses += 1
+                    volatile = state.volatile
+                    filter = self.get_filter(caller, obj)
+                    if state.volatile == volatile:
+                        # the result only depends on the caller's state
+                        results[obj] = filter
+                else:
+                    self.hits += 1
+
+            visible, provide_quest, complete_quest = filter
+            if not visible:
+                continue
+
+            appearance = {"dbref": entry["dbref"],
+                          "name": entry["name"],
+                          "key": entry["key"]}
+            if type == "npcs" and hasattr(obj, "have_quest"):
+                appearance["provide_quest"] = provide_quest
+                appearance["complete_quest"] = complete_quest
+
+            info[type].append(appearance)
+
+        return info
+
+    def stats(self):
+        """
+        Get the handler's counters.
+
+        Returns:
+            (dict) counters
+        """
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.entries),
+                "callers": len(self.memo)}
@@ -0,0 +1,42 @@
+from importlib import import_module
+from django.test import TestCase
+from muddery.utils.skill_handler import pack_skills, unpack_skills
+
+
+class TestSkillRecords(TestCase):
+
+    def test_pack_skills(self):
+        record = pack_skills([("skill_hit", True, 0), ("skill_heal", False, 1500000000.5)])
+        self.assertEqual(record, '[["skill_hit",1,0],["skill_heal",0,1500000000.5]]')
+
+    def test_unpack_skills(self):
+        skills = [("skill_hit", True, 0), ("skill_heal", False, 1500000000.5)]
+        self.assertEqual(unpack_skills(pack_skills(skills)), skills)
+
+    def test_unpack_empty(self):
+        self.assertEqual(unpack_skills(None), [])
+        self.assertEqual(unpack_skills(""), [])
+        self.assertEqual(unpack_skills(pack_skills([])), [])
+
+    def test_unpack_invalid(self):
+        self.assertEqual(unpack_skills("not a record"), [])
+        self.assertEqual(unpack_skills('[["skill_hit",1]]'), [])
+
+    def test_migration_record(self):
+        # records made by the migration can be read by the skill handler
+        migration = import_module("muddery.game_template.database.migrations.0003_skill_records")
+        record = migration.make_record({"skill_hit": 10, "skill_heal": 11, "skill_fire": 12},
+                                       {10: {"is_default": True, "cd_finish_time": 0},
+                                        11: {"cd_finish_time": 1500000000.5},
+                                        12: {"is_default": None, "cd_finish_time": None}})
+        self.assertEqual(record, pack_skills([("skill_fire", False, 0),
+                                              ("skill_heal", False, 1500000000.5),
+                                              ("skill_hit", True, 0)]))
+        self.assertEqual(unpack_skills(record), [("skill_fire", False, 0),
+                                                 ("skill_heal", False, 1500000000.5),
+                                                 ("skill_hit", True, 0)])
+
+    def test_packed_id(self):
+        migration = import_module("muddery.game_template.database.migrations.0003_skill_records")
+        self.assertEqual(migration.get_packed_id(("__packed_dbobj__", ("objects", "objectdb"), 1.0, 5)), 5)
+        self.assertEqual(migration.get_packed_id("skill_hit"), None)
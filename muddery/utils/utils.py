@@ -14,6 +14,7 @@ from evennia.utils import search, logger
 from evennia.utils.utils import class_from_module
 from muddery.server.launcher import configs
 from muddery.worlddata.dao.localized_strings_mapper import LOCALIZED_STRINGS
+from muddery.utils.data_key_registry import DATA_KEY_REGISTRY
 from importlib import import_module
 from pkgutil import iter_modules
 
@@ -36,6 +37,32 @@ def set_obj_data_key(obj, key):
     """
     obj.attributes.add("key", key, category=settings.DATA_KEY_CATEGORY, strattr=True)
 
+    # mirror it to an indexed tag
+    obj.tags.clear(category=settings.DATA_KEY_CATEGORY)
+    if key:
+        obj.tags.add(key, category=settings.DATA_KEY_CATEGORY)
+
+    obj.cached_data_key = key
+    DATA_KEY_REGISTRY.set(obj.id, key)
+
+
+def search_obj_tag(value, category):
+    """
+    Search objects by tags. Tags are indexed, so it is faster than searching
+    attributes.
+
+    Args:
+        value: (string) tag's value.
+        category: (string) tag's category.
+    """
+    from evennia.objects.models import ObjectDB
+
+    # evennia keeps tags in lower case
+    return ObjectDB.objects.filter(db_tags__db_key=value.strip().lower(),
+                                   db_tags__db_category=category,
+                                   db_tags__db_model="objectdb",
+                                   db_tags__db_tagtype__isnull=True)
+
 
 def search_obj_data_key(key):
     """
@@ -47,9 +74,61 @@ def search_obj_data_key(key):
     if not key:
         return None
 
-    return search.search_object_attribute(key="key", strvalue=key, category=settings.DATA_KEY_CATEGORY)
-    
-    
+    # find objects in the registry, or search them in the database if the
+    # registry is not loaded
+    objs = DATA_KEY_REGISTRY.search(key)
+    if objs is None:
+        objs = search_obj_data_key_in_db(key)
+    return objs
+
+
+def search_obj_data_key_in_db(key):
+    """
+    Search objects which have the given key in the database.
+
+    Args:
+        key: (string) Data's key.
+    """
+    # tags are not case sensitive, check keys
+    objs = [obj for obj in search_obj_tag(key, settings.DATA_KEY_CATEGORY) if obj.get_data_key() == key]
+    if not objs:
+        # objects created before data key tags were added
+        objs = search.search_object_attribute(key="key", strvalue=key, category=settings.DATA_KEY_CATEGORY)
+    return objs
+
+
+def get_objs_data_keys(objs):
+    """
+    Get data keys of objects with a few queries.
+
+    Args:
+        objs: (list) objects.
+
+    Returns:
+        (dict) {object's id: data key}
+    """
+    from evennia.objects.models import ObjectDB
+
+    keys = {}
+    ids = []
+    for obj in objs:
+        # use cached keys
+        key = getattr(obj, "cached_data_key", None)
+        if key is None:
+            ids.append(obj.id)
+        else:
+            keys[obj.id] = key
+
+    # query in batches, some databases limit the number of query args
+    batch_size = 500
+    for i in xrange(0, len(ids), batch_size):
+        records = ObjectDB.objects.filter(id__in=ids[i:i + batch_size],
+                                          db_attributes__db_key="key",
+                                          db_attributes__db_category=settings.DATA_KEY_CATEGORY)
+        keys.update(records.values_list("id", "db_attributes__db_strvalue"))
+    return keys
+
+
 def search_db_data_type(key, value, typeclass):
     """
     Search objects of the given typeclass which have the given value.
@@ -68,6 +147,11 @@ def set_obj_unique_type(obj, type):
     """
     obj.attributes.add("type", type, category=settings.DATA_KEY_CATEGORY, strattr=True)
 
+    # mirror it to an indexed tag
+    obj.tags.clear(category=settings.UNIQUE_TYPE_CATEGORY)
+    if type:
+        obj.tags.add(type, category=settings.UNIQUE_TYPE_CATEGORY)
+
 
 def search_obj_unique_type(type):
     """
@@ -76,7 +160,11 @@ def search_obj_unique_type(type):
     Args:
         type: (string) unique object's type.
     """
-    obj = search.search_object_attribute(key="type", strvalue=type, category=settings.DATA_KEY_CATEGORY)
+    # types are defined by models' names which are in lower case
+    obj = list(search_obj_tag(type, settings.UNIQUE_TYPE_CATEGORY))
+    if not obj:
+        # objects created before unique type tags were added
+        obj = search.search_object_attribute(key="type", strvalue=type, category=settings.DATA_KEY_CATEGORY)
     return obj
 
 
@@ -0,0 +1,126 @@
+"""
+WorldMapHandler keeps the graph of world rooms and exits in memory, so maps can
+be made without searching room objects in the database.
+
+The graph is loaded from world data when the server starts and is loaded again
+when the world is rebuilt.
+"""
+
+from __future__ import print_function
+
+import ast
+from evennia.utils import logger
+from muddery.worlddata.dao import common_mappers as CM
+
+
+class WorldMapHandler(object):
+    """
+    The graph of world rooms and exits.
+    """
+    def __init__(self):
+        """
+        Initialize the handler.
+        """
+        # {room's key: {"name": name, "icon": icon, "area": area, "pos": position}}
+        # It is None before the graph is loaded.
+        self.rooms = None
+
+        # {room's key: {exit's key: {"from": room's key, "to": room's key}}}
+        self.exits = {}
+
+        # increases when the graph is loaded, so cached maps can be checked
+        self.version = 0
+
+    def reload(self):
+        """
+        Load the graph from world data.
+        """
+        rooms = {}
+        for record in CM.WORLD_ROOMS.all():
+            try:
+                name = CM.OBJECTS.get(key=record.key).name
+            except Exception, e:
+                logger.log_errmsg("Can not find room %s's name: %s" % (record.key, e))
+                name = ""
+
+            position = None
+            if record.position:
+                try:
+                    position = ast.literal_eval(record.position)
+                except Exception, e:
+                    logger.log_errmsg("Room %s's position error: %s" % (record.key, e))
+
+            rooms[record.key] = {"name": name,
+                                 "icon": record.icon,
+                                 "area": record.location,
+                                 "pos": position}
+
+        exits = {}
+        for record in CM.WORLD_EXITS.all():
+            if record.location in rooms and record.destination in rooms:
+                exits.setdefault(record.location, {})[record.key] = {"from": record.location,
+                                                                     "to": record.destination}
+
+        self.rooms = rooms
+        self.exits = exits
+        self.version += 1
+
+        logger.log_info("Loaded %d rooms and %d exits of the world map." %
+                        (len(rooms), sum(len(room_exits) for room_exits in exits.values())))
+
+    def get_room(self, room_key):
+        """
+        Get a room's map data. Do not modify it.
+
+        Args:
+            room_key: (string) room's key.
+
+        Returns:
+            (dict) {"name": name, "icon": icon, "area": area, "pos": position}
+            or None if the room does not exist.
+        """
+        if self.rooms is None:
+            self.reload()
+
+        return self.rooms.get(room_key)
+
+    def get_map(self, room_keys, rooms=None, exits=None):
+        """
+        Get the map of rooms, with their exits and neighbours.
+
+        Args:
+            room_keys: (list) rooms' keys.
+            rooms: (dict) add rooms to this dict.
+            exits: (dict) add exits to this dict.
+
+        Returns:
+            (dict) {"rooms": {room's key: room's data},
+                    "exits": {exit's key: {"from": room's key, "to": room's key}}}
+        """
+        if self.rooms is None:
+            self.reload()
+
+        if rooms is None:
+            rooms = {}
+        if exits is None:
+            exits = {}
+
+        for room_key in room_keys:
+            room = self.rooms.get(room_key)
+            if not room:
+                continue
+
+            rooms[room_key] = room
+            room_exits = self.exits.get(room_key)
+            if room_exits:
+                exits.update(room_exits)
+
+                # add room's neighbours
+                for path in room_exits.values():
+                    if path["to"] not in rooms:
+                        rooms[path["to"]] = self.rooms[path["to"]]
+
+        return {"rooms": rooms, "exits": exits}
+
+
+WORLD_MAP = WorldMapHandler()
@@ -6,6 +6,14 @@ if (typeof(require) != "undefined") {
 
 $$.client = {
  	onText: function(args, kwargs) {
+ 	    if (kwargs && kwargs["json"]) {
+ 	        // Messages have been decoded with the frame.
+ 	        for (var i = 0; i < args.length; i++) {
+ 		        $$.client.showDecoded(args[i]);
+ 		    }
+ 		    return;
+ 	    }
+
  	    for (var i = 0; i < args.length; i++) {
  		    $$.client.doShow("out", args[i]);
  		}
@@ -17,25 +25,15 @@ $$.client = {
         if (type == "out") {
             try {
                 var decode = JSON.parse(msg);
-                var type = Object.prototype.toString.call(decode);
-                
-                if (type == "[object Object]") {
-                    // Json object.
-                    data = decode;
-                }
-                else if (type == "[object String]") {
-                    // String
-                    data = {"msg": decode};
-                }
-                else {
-                    // Other types, treat them as normal text messages.
-                    data = {"msg": msg};
-                }
             }
             catch(err) {
                 // Not JSON packed, treat it as a normal text message.
-                data = {"msg": msg};
+                this.displayData({"msg": msg});
+                return;
             }
+
+            this.showDecoded(decode);
+            return;
         }
         else if (type == "err") {
             data = {"err": msg};
@@ -56,6 +54,34 @@ $$.client = {
         this.displayData(data);
     },
 
+    showDecoded: function(decode) {
+        var type = Object.prototype.toString.call(decode);
+        
+        if (type == "[object Object]") {
+            // Json object.
+            this.displayData(decode);
+        }
+        else if (type == "[object Array]") {
+            // Several messages in one frame.
+            for (var i = 0; i < decode.length; i++) {
+                if (Object.prototype.toString.call(decode[i]) == "[object Object]") {
+                    this.displayData(decode[i]);
+                }
+                else {
+                    this.displayData({"msg": decode[i]});
+                }
+            }
+        }
+        else if (type == "[object String]") {
+            // String
+            this.displayData({"msg": decode});
+        }
+        else {
+            // Other types, treat them as normal text messages.
+            this.displayData({"msg": String(decode)});
+        }
+    },
+
     // display all kinds of data
     displayData : function(data) {
         for (var key in data) {
@@ -96,6 +122,9 @@ $$.client = {
                 else if (key == "obj_moved_out") {
                     $$.main.showObjMovedOut(data[key]);
                 }
+                else if (key == "room_crowd") {
+                    $$.main.showRoomCrowd(data[key]);
+                }
                 else if (key == "player_online") {
                     $$.main.showPlayerOnline(data[key]);
                 }
@@ -115,20 +144,31 @@ $$.client = {
                 }
                 else if (key == "status") {
                     var status = data[key];
+                    $$.data_handler.setState(key, status);
                     $$.main.setStatus(status);
                 }
                 else if (key == "equipments") {
+                    $$.data_handler.setState(key, data[key]);
 			        $$.main.setEquipments(data[key]);
                 }
                 else if (key == "inventory") {
+                    $$.data_handler.setState(key, data[key]);
                     $$.main.setInventory(data[key]);
                 }
                 else if (key == "skills") {
+                    $$.data_handler.setState(key, data[key]);
                     $$.main.setSkills(data[key]);
                 }
                 else if (key == "quests") {
+                    $$.data_handler.setState(key, data[key]);
                 	$$.main.setQuests(data[key]);
                 }
+                else if (key == "state_versions") {
+                    $$.data_handler.setStateVersions(data[key]);
+                }
+                else if (key == "state_delta") {
+                    $$.main.applyStateDelta(data[key]);
+                }
                 else if (key == "get_objects") {
                 	var get_objects = data[key];
                     $$.main.showGetObjects(get_objects["accepted"], get_objects["rejected"], get_objects["combat"]);
@@ -104,11 +104,21 @@ $$.commands = {
         Evennia.msg("text", this.cmdString("unpuppet", ""));
     },
     
+    // get full data of the character's inventory, status, etc.
+    doResync : function(channels) {
+        Evennia.msg("text", this.cmdString("resync", channels));
+    },
+
     // look
     doLook : function(dbref) {
         Evennia.msg("text", this.cmdString("look", dbref));
     },
 
+    // look at a skill
+    doLookSkill : function(skill) {
+        Evennia.msg("text", this.cmdString("look_skill", skill));
+    },
+
     // go to
     doGoto : function(dbref) {
         Evennia.msg("text", this.cmdString("goto", dbref));
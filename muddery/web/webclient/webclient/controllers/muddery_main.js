@@ -636,6 +636,40 @@ MudderyMain.prototype.setQuests = function(quests) {
 	$$.component.quests.setQuests(quests);
 }
 
+/*
+ * Apply changes of the player's inventory, status, equipments, skills and quests.
+ */
+MudderyMain.prototype.applyStateDelta = function(deltas) {
+    var resync = [];
+
+    for (var channel in deltas) {
+        var data = $$.data_handler.patchState(channel, deltas[channel]);
+        if (data === null) {
+            // missed some changes
+            resync.push(channel);
+        }
+        else if (channel == "status") {
+            this.setStatus(data);
+        }
+        else if (channel == "equipments") {
+            this.setEquipments(data);
+        }
+        else if (channel == "inventory") {
+            this.setInventory(data);
+        }
+        else if (channel == "skills") {
+            this.setSkills(data);
+        }
+        else if (channel == "quests") {
+            this.setQuests(data);
+        }
+    }
+
+    if (resync.length > 0) {
+        $$.commands.doResync(resync);
+    }
+}
+
 /*
  * Set the player's current scene.
  */
@@ -663,6 +697,13 @@ MudderyMain.prototype.showPlayerOffline = function(player) {
 	$$.component.scene.removePlayer(player);
 }
 
+/*
+ * Notify the number of players in a crowded place.
+ */
+MudderyMain.prototype.showRoomCrowd = function(crowd) {
+	$$.component.scene.setCrowd(crowd);
+}
+
 /*
  * Notify an object has moved to the player's current place.
  */
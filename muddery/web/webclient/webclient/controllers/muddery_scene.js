@@ -71,6 +71,7 @@ MudderyScene.prototype.clearScene = function() {
     this.clearElements("#scene_things_container");
     this.clearElements("#scene_npcs_container");
     this.clearElements("#scene_players_container");
+    this.select("#scene_players_crowd").empty();
 
     for (var i = 0; i < 9; ++i) {
         this.clearElements("#scene_exits_" + i);
@@ -115,6 +116,10 @@ MudderyScene.prototype.setScene = function(scene) {
     var players = "players" in scene ? scene["players"]: null;
     this.addLinks("#scene_players", "#scene_players_container", players);
 
+    if ("crowd" in scene) {
+        this.setCrowd({"count": scene["crowd"]});
+    }
+
     // add exits
     var exits = "exits" in scene ? scene["exits"]: null;
     this.setExitsMap(exits, room_name);
@@ -149,6 +154,29 @@ MudderyScene.prototype.removePlayer = function(player) {
 	}
 }
 
+/*
+ * Set the number of players in a crowded scene. If the scene is not crowded
+ * any more, show all players again.
+ */
+MudderyScene.prototype.setCrowd = function(crowd) {
+    this.clearElements("#scene_players_container");
+    this.select("#scene_players_crowd").empty();
+
+    if ("players" in crowd) {
+        var players = [];
+        for (var i in crowd["players"]) {
+            if (crowd["players"][i]["dbref"] != $$.data_handler.character_dbref) {
+                players.push(crowd["players"][i]);
+            }
+        }
+        this.addLinks("#scene_players", "#scene_players_container", players);
+    }
+    else {
+        this.select("#scene_players_crowd").text($$.trans("Number: ") + crowd["count"]);
+        this.select("#scene_players").show();
+    }
+}
+
 /*
  * Add new objects to this scene.
  */
@@ -37,8 +37,8 @@ MudderySkills.prototype.bindEvents = function() {
  * Event when clicks the skill link.
  */
 MudderySkills.prototype.onLook = function(element) {
-    var dbref = this.select(element).data("dbref");
-    $$.commands.doLook(dbref);
+    var key = this.select(element).data("key");
+    $$.commands.doLookSkill(key);
 }
 
 /*
@@ -63,7 +63,7 @@ MudderySkills.prototype.setSkills = function(skills) {
         var item = this.cloneTemplate(template);
 
         item.find(".skill_name")
-            .data("dbref", obj["dbref"])
+            .data("key", obj["key"])
         	.text(obj["name"]);
             
         if (obj["icon"]) {
@@ -78,6 +78,7 @@ $$.local_string_zh_cn = {
     "NPCs: ": "人物：",
     "Players": "玩家",
     "Players: ": "玩家：",
+    "Number: ": "数量：",
     "Actions": "动作",
     "NAME": "名称",
     "NUM": "数量",
@@ -70,6 +70,7 @@ $$.local_string_zh_tw = {
     "NPCs: ": "人物：",
     "Players": "玩家",
     "Players: ": "玩家：",
+    "Number: ": "數量：",
     "Actions": "動作",
     "NAME": "名稱",
     "NUM": "數量",
@@ -12,6 +12,11 @@ $$.data_handler = {
     dialogues_list: [],
     skill_cd_time: {},
 
+    // last received inventory, status, equipments, skills and quests
+    // {channel: {"entries": {key: entry}, "order": [keys] or null}}
+    states: {},
+    state_versions: {},
+
     getEscapes: function() {
         return {"$PLAYER_NAME": this.character_name};
     },
@@ -28,6 +33,76 @@ $$.data_handler = {
         }
     },
 
+    setState: function(channel, data) {
+        var entries = {};
+        var order = null;
+
+        if (Object.prototype.toString.call(data) == "[object Array]") {
+            // entries are identified by dbrefs, or by keys if they are not objects
+            order = [];
+            for (var i = 0; i < data.length; i++) {
+                var entry_id = ("dbref" in data[i]) ? data[i]["dbref"] : data[i]["key"];
+                entries[entry_id] = data[i];
+                order.push(entry_id);
+            }
+        }
+        else {
+            for (var key in data) {
+                entries[key] = data[key];
+            }
+        }
+
+        this.states[channel] = {"entries": entries, "order": order};
+    },
+
+    setStateVersions: function(versions) {
+        for (var channel in versions) {
+            this.state_versions[channel] = versions[channel];
+        }
+    },
+
+    // Apply changes to a channel's data.
+    // Returns the channel's full data, or null if some changes are missing.
+    patchState: function(channel, delta) {
+        var state = this.states[channel];
+        if (!state || this.state_versions[channel] + 1 != delta["version"]) {
+            return null;
+        }
+        this.state_versions[channel] = delta["version"];
+
+        var entries = state["entries"];
+        if ("changed" in delta) {
+            for (var key in delta["changed"]) {
+                entries[key] = delta["changed"][key];
+            }
+        }
+
+        if ("removed" in delta) {
+            for (var i = 0; i < delta["removed"].length; i++) {
+                delete entries[delta["removed"][i]];
+            }
+        }
+
+        if ("order" in delta) {
+            state["order"] = delta["order"];
+        }
+
+        if (state["order"] === null) {
+            var data = {};
+            for (var key in entries) {
+                data[key] = entries[key];
+            }
+            return data;
+        }
+        else {
+            var data = [];
+            for (var i = 0; i < state["order"].length; i++) {
+                data.push(entries[state["order"][i]]);
+            }
+            return data;
+        }
+    },
+
     setSkillCD: function(skill, cd, gcd) {
         // update skill's cd
         var current_time = (new Date()).valueOf();
@@ -8,6 +8,8 @@ from evennia.utils import logger
 from django.apps import apps
 from django.conf import settings
 from muddery.worlddata.dao.general_query_mapper import get_all_from_tables, get_tables_record_by_key
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
+
 
 class CommonMapper(object):
     """
@@ -19,13 +21,17 @@ class CommonMapper(object):
         self.objects = self.model.objects
 
     def all(self):
-        return self.objects.all()
+        return WORLD_DATA.all(self.model_name)
 
     def get(self, *args, **kwargs):
-        return self.objects.get(*args, **kwargs)
+        if args:
+            return self.objects.get(*args, **kwargs)
+        return WORLD_DATA.get(self.model_name, **kwargs)
 
     def filter(self, *args, **kwargs):
-        return self.objects.filter(*args, **kwargs)
+        if args:
+            return self.objects.filter(*args, **kwargs)
+        return WORLD_DATA.filter(self.model_name, **kwargs)
 
 
 class ObjectsMapper(CommonMapper):
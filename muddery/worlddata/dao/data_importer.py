@@ -7,16 +7,36 @@ from __future__ import print_function
 import os, traceback
 from django.apps import apps
 from django.conf import settings
-from django.db import models
+from django.db import models, connections, router, transaction
 from django.core.exceptions import ValidationError
 from evennia.utils import logger
 from muddery.utils import readers
 from muddery.utils.exception import MudderyError, ERR
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
+
+
+def clear_table(model_obj):
+    """
+    Remove all data of a table. Records are deleted directly without being
+    loaded, call it in a transaction.
+
+    Args:
+        model_obj: model object.
+    """
+    using = router.db_for_write(model_obj)
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM %s" % connection.ops.quote_name(model_obj._meta.db_table))
+
+    # deleting directly does not send signals
+    WORLD_DATA.invalidate(model_obj._meta.model_name)
 
 
 def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs):
     """
-    Import data from a data file to the db model
+    Import data from a data file to the db model. Records are inserted in
+    batches, the whole table is imported in one transaction, so the table will
+    not change if there are any errors.
 
     Args:
         fullname: (string) file's full name
@@ -108,17 +128,46 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
 
         return record
 
-    def import_data(model_obj, data_iterator):
+    def get_unique_fields(model_obj):
+        """
+        Get groups of fields whose values must be unique.
+        """
+        unique_fields = [(field.name,) for field in model_obj._meta.fields
+                         if field.unique and not field.primary_key]
+        unique_fields.extend(tuple(fields) for fields in model_obj._meta.unique_together)
+        return unique_fields
+
+    def check_unique(data, unique_fields, unique_values):
+        """
+        Check if the record's unique values are duplicated in the file.
+
+        Args:
+            data: (model) the record.
+            unique_fields: (list) groups of unique fields.
+            unique_values: (dict) values of unique fields imported before.
+        """
+        for fields in unique_fields:
+            values = tuple(getattr(data, field) for field in fields)
+            if values in unique_values[fields]:
+                raise ValidationError({fields[0]: "%s with this %s already exists." %
+                                                  (data.__class__.__name__, ", ".join(fields))})
+            unique_values[fields].add(values)
+
+    def import_data(model_obj, data_iterator, empty_table):
         """
         Import data to a table.
 
         Args:
             model_obj: (model) model object.
             data_iterator: (list) data list.
+            empty_table: (boolean) the table is empty, records only need to be
+                         checked with other records in the file.
 
         Returns:
             None
         """
+        batch_size = settings.WORLD_DATA_IMPORT_BATCH_SIZE
+        batch = []
         line = 1
         try:
             # read title
@@ -126,6 +175,9 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
             field_types = get_field_types(model_obj, titles)            
             line += 1
 
+            unique_fields = get_unique_fields(model_obj)
+            unique_values = dict((fields, set()) for fields in unique_fields)
+
             # import values
             for values in data_iterator:
                 # skip blank lines
@@ -140,10 +192,24 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
 
                 record = parse_record(titles, field_types, values)
                 data = model_obj(**record)
-                data.full_clean()
-                data.save()
+                if empty_table:
+                    # check unique values without querying the db
+                    data.full_clean(validate_unique=False)
+                    check_unique(data, unique_fields, unique_values)
+                else:
+                    data.full_clean()
+                    # records in the batch have not been saved yet
+                    check_unique(data, unique_fields, unique_values)
+
+                batch.append(data)
+                if len(batch) >= batch_size:
+                    model_obj.objects.bulk_create(batch)
+                    batch = []
                 line += 1
 
+            if batch:
+                model_obj.objects.bulk_create(batch)
+
         except StopIteration:
             # reach the end of file, pass this exception
             pass
@@ -154,19 +220,6 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
             traceback.print_stack()
             raise MudderyError(ERR.import_data_error, "%s (model: %s, line: %s)" % (e, model_obj.__name__, line))
 
-    def clear_model_data(model_obj, **kwargs):
-        """
-        Remove all data from db.
-
-        Args:
-            model_obj: model object.
-
-        Returns:
-            None
-        """
-        # clear old data
-        model_obj.objects.all().delete()
-
     def parse_error(error, model_name, line):
         """
         Parse validation error to string message.
@@ -211,9 +264,6 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
     # get model
     model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
 
-    if clear:
-        clear_model_data(model_obj, **kwargs)
-
     reader_class = readers.get_reader(file_type)
     if not reader_class:
         # Does support this file type.
@@ -225,5 +275,15 @@ def import_file(fullname, file_type=None, table_name=None, clear=True, **kwargs)
         raise(MudderyError(ERR.import_data_error, "Does not support this file type."))
 
     logger.log_infomsg("Importing %s" % table_name)
-    import_data(model_obj, reader)
+    try:
+        with transaction.atomic(using=router.db_for_write(model_obj)):
+            if clear:
+                clear_table(model_obj)
+
+            import_data(model_obj, reader, clear)
+    finally:
+        reader.close()
+
+        # bulk operations do not send signals
+        WORLD_DATA.invalidate(table_name)
 
@@ -7,6 +7,7 @@ from __future__ import print_function
 from evennia.utils import logger
 from django.apps import apps
 from django.conf import settings
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 
 
 class DialogueRelationsMapper(object):
@@ -25,7 +26,7 @@ class DialogueRelationsMapper(object):
         Args:
             key: (string) dialogue's key.
         """
-        return self.objects.filter(dialogue=key)
+        return WORLD_DATA.filter(self.model_name, dialogue=key)
 
 
 DIALOGUE_RELATIONS = DialogueRelationsMapper()
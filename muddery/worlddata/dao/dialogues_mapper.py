@@ -7,6 +7,7 @@ from __future__ import print_function
 from evennia.utils import logger
 from django.apps import apps
 from django.conf import settings
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 
 
 class DialoguesMapper(object):
@@ -25,7 +26,7 @@ class DialoguesMapper(object):
         Args:
             key: (string) dialogue's key.
         """
-        return self.objects.get(key=key)
+        return WORLD_DATA.get(self.model_name, key=key)
 
 
 DIALOGUES = DialoguesMapper()
@@ -8,12 +8,11 @@ from evennia.utils import logger
 from django.apps import apps
 from django.conf import settings
 from muddery.utils import defines
-from muddery.worlddata.dao.common_mapper_base import ObjectsMapper
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 
 
 def get_object_event(object_key):
     """
     Get object's event.
     """
-    model = apps.get_model(settings.WORLD_DATA_APP, "event_data")
-    return model.objects.filter(trigger_obj=object_key)
+    return WORLD_DATA.filter("event_data", trigger_obj=object_key)
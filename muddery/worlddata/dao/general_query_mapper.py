@@ -34,6 +34,22 @@ def get_all_records(table_name):
     return model_obj.objects.all()
 
 
+def iter_all_values(table_name, fields):
+    """
+    Iterate over values of a table's all records without caching records.
+
+    Args:
+        table_name: (string) db table's name.
+        fields: (list) field names.
+
+    Returns:
+        (iterator) tuples of values
+    """
+    # get model
+    model_obj = apps.get_model(settings.WORLD_DATA_APP, table_name)
+    return model_obj.objects.all().values_list(*fields).iterator()
+
+
 def filter_records(table_name, **kwargs):
     """
     Filter records by conditions.
@@ -7,6 +7,7 @@ from __future__ import print_function
 from evennia.utils import logger
 from django.apps import apps
 from django.conf import settings
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 
 
 class LootListMapper(object):
@@ -22,7 +23,7 @@ class LootListMapper(object):
         """
         Get object's loot list.
         """
-        return self.objects.filter(provider=object_key)
+        return WORLD_DATA.filter(self.model_name, provider=object_key)
 
 
 CHARACTER_LOOT_LIST = LootListMapper("character_loot_list")
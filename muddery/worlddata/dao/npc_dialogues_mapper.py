@@ -7,6 +7,7 @@ from __future__ import print_function
 from evennia.utils import logger
 from django.apps import apps
 from django.conf import settings
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 
 
 class NPCDialoguesMapper(object):
@@ -25,7 +26,7 @@ class NPCDialoguesMapper(object):
         Args:
             npc: (string) NPC's key.
         """
-        return self.objects.filter(npc=npc)
+        return WORLD_DATA.filter(self.model_name, npc=npc)
 
 
 NPC_DIALOGUES = NPCDialoguesMapper()
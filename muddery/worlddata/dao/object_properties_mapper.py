@@ -9,6 +9,7 @@ from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from muddery.utils.exception import MudderyError, ERR
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 
 
 class ObjectPropertiesMapper(object):
@@ -28,7 +29,7 @@ class ObjectPropertiesMapper(object):
             object: (string) object's key.
             level: (number) object's level.
         """
-        return self.objects.filter(object=object, level=level)
+        return WORLD_DATA.filter(self.model_name, object=object, level=level)
 
     def get_properties_all_levels(self, object):
         """
@@ -65,6 +66,9 @@ class ObjectPropertiesMapper(object):
                 data = self.model(**record)
                 data.save()
 
+        # update() does not send signals
+        WORLD_DATA.invalidate(self.model_name)
+
     def delete_properties(self, object, level):
         """
         Delete object's properties.
@@ -0,0 +1,342 @@
+"""
+In-memory snapshot of world data.
+
+All world data tables are loaded once when the server starts. Records are kept
+in immutable tuples and indexed by their keys and frequently queried fields, so
+mappers do not need to query the database when handling players' requests.
+
+A table is loaded again when it is queried after its records have been changed
+by the world editor. New tables replace old ones by a single assignment, so
+readers always get complete tables.
+"""
+
+from __future__ import print_function
+
+import time
+from collections import namedtuple
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from evennia.utils import logger
+
+
+# Secondary indexes built when tables are loaded.
+# {table name: (field names)}
+# Indexes of other fields are built when they are queried at the first time.
+SNAPSHOT_INDEXES = {
+    "event_data": (("trigger_obj",),),
+    "world_rooms": (("location",),),
+    "world_exits": (("location",), ("destination",)),
+    "world_objects": (("location",),),
+    "world_npcs": (("location",),),
+    "dialogue_sentences": (("dialogue",),),
+    "dialogue_relations": (("dialogue",),),
+    "dialogue_quest_dependencies": (("dialogue",),),
+    "npc_dialogues": (("npc",),),
+    "creator_loot_list": (("provider",),),
+    "character_loot_list": (("provider",),),
+    "quest_reward_list": (("provider",),),
+    "object_properties": (("level", "object"),),
+    "quest_dependencies": (("quest",),),
+    "quest_objectives": (("quest",),),
+    "default_objects": (("character",),),
+    "default_skills": (("character",),),
+}
+
+
+class TableSnapshot(object):
+    """
+    Immutable records of a world data table.
+    """
+    def __init__(self, model, records):
+        """
+        Args:
+            model: (class) table's model.
+            records: (tuple) table's records.
+        """
+        self.model = model
+        self.records = records
+        self.indexes = {}
+
+        # add the key index if keys are unique
+        self.key_index = None
+        field = _get_field(model, "key")
+        if field and field.unique:
+            self.key_index = dict((record.key, record) for record in records)
+
+        for names in SNAPSHOT_INDEXES.get(model._meta.model_name, ()):
+            self.get_index(names)
+
+    @classmethod
+    def load(cls, model):
+        """
+        Load a table from the database.
+
+        Args:
+            model: (class) table's model.
+        """
+        names = [field.name for field in model._meta.fields]
+        record_class = _record_class(model, names)
+        values = model.objects.all().order_by("pk").values_list(*names)
+        records = tuple(record_class._make(value) for value in values)
+        return cls(model, records)
+
+    def get_index(self, names):
+        """
+        Get records grouped by values of fields.
+
+        Args:
+            names: (tuple) sorted field names.
+
+        Returns:
+            (dict) {values: (records)}
+        """
+        index = self.indexes.get(names)
+        if index is None:
+            groups = {}
+            for record in self.records:
+                values = tuple(getattr(record, name) for name in names)
+                if values in groups:
+                    groups[values].append(record)
+                else:
+                    groups[values] = [record]
+
+            index = dict((values, tuple(group)) for values, group in groups.items())
+            self.indexes[names] = index
+        return index
+
+    def all(self):
+        """
+        Get all records.
+        """
+        return self.records
+
+    def get(self, **kwargs):
+        """
+        Get a record. Raise model's DoesNotExist or MultipleObjectsReturned
+        like the model's manager.
+        """
+        if self.key_index is not None and len(kwargs) == 1 and "key" in kwargs:
+            try:
+                return self.key_index[kwargs["key"]]
+            except KeyError:
+                raise self.model.DoesNotExist("%s matching query does not exist." %
+                                              self.model._meta.object_name)
+
+        records = self.filter(**kwargs)
+        if not records:
+            raise self.model.DoesNotExist("%s matching query does not exist." %
+                                          self.model._meta.object_name)
+        elif len(records) > 1:
+            raise self.model.MultipleObjectsReturned("get() returned more than one %s -- it returned %s!" %
+                                                     (self.model._meta.object_name, len(records)))
+        return records[0]
+
+    def filter(self, **kwargs):
+        """
+        Get records whose fields equal to given values.
+        """
+        if not kwargs:
+            return self.records
+
+        names = tuple(sorted(kwargs))
+        values = tuple(kwargs[name] for name in names)
+        return self.get_index(names).get(values, ())
+
+
+class WorldDataSnapshot(object):
+    """
+    Keeps snapshots of all world data tables.
+    """
+    def __init__(self):
+        # {table name: TableSnapshot}
+        # It is None before the snapshot is loaded.
+        self.tables = None
+
+        # names of changed tables
+        self.stale = set()
+
+    def reload(self):
+        """
+        Load all world data tables.
+        """
+        begin = time.time()
+
+        tables = {}
+        count = 0
+        for model in apps.get_app_config(settings.WORLD_DATA_APP).get_models():
+            try:
+                table = TableSnapshot.load(model)
+            except Exception, e:
+                logger.log_errmsg("Can not load world data %s: %s" % (model._meta.model_name, e))
+                continue
+
+            tables[model._meta.model_name] = table
+            count += len(table.records)
+
+        # replace all tables at once
+        self.tables = tables
+        self.stale = set()
+
+        logger.log_info("Loaded %d world data records in %.3f seconds." % (count, time.time() - begin))
+
+    def clear(self):
+        """
+        Remove all tables. Mappers will query the database directly.
+        """
+        self.tables = None
+        self.stale = set()
+
+    def is_loaded(self):
+        """
+        If the snapshot is loaded.
+        """
+        return self.tables is not None
+
+    def invalidate(self, model_name):
+        """
+        A table's records have been changed, it will be loaded again when it
+        is queried.
+
+        Args:
+            model_name: (string) table's name.
+        """
+        if self.tables is not None:
+            self.stale.add(model_name)
+
+    def reload_table(self, model_name):
+        """
+        Load a table again.
+
+        Args:
+            model_name: (string) table's name.
+        """
+        self.stale.discard(model_name)
+
+        tables = dict(self.tables)
+        try:
+            model = apps.get_model(settings.WORLD_DATA_APP, model_name)
+            tables[model_name] = TableSnapshot.load(model)
+        except Exception, e:
+            # query it from the database
+            logger.log_errmsg("Can not load world data %s: %s" % (model_name, e))
+            tables.pop(model_name, None)
+        self.tables = tables
+
+    def get_table(self, model_name, kwargs=None):
+        """
+        Get a table's snapshot. Returns None if the table is not in the snapshot
+        or the query can not be done with the snapshot.
+
+        Args:
+            model_name: (string) table's name.
+            kwargs: (dict) query's conditions, will be converted to fields' types.
+        """
+        if self.tables is None:
+            return None
+
+        if model_name in self.stale:
+            self.reload_table(model_name)
+
+        table = self.tables.get(model_name)
+        if table is None or not kwargs:
+            return table
+
+        # only support exact values of fields
+        for name, value in kwargs.items():
+            field = _get_field(table.model, name)
+            if not field:
+                return None
+
+            try:
+                kwargs[name] = field.to_python(value)
+            except Exception:
+                return None
+
+        return table
+
+    def all(self, model_name):
+        """
+        Get all records of a table.
+
+        Args:
+            model_name: (string) table's name.
+        """
+        table = self.get_table(model_name)
+        if table is None:
+            return apps.get_model(settings.WORLD_DATA_APP, model_name).objects.all()
+        return table.all()
+
+    def get(self, model_name, **kwargs):
+        """
+        Get a record of a table.
+
+        Args:
+            model_name: (string) table's name.
+        """
+        table = self.get_table(model_name, kwargs)
+        if table is None:
+            return apps.get_model(settings.WORLD_DATA_APP, model_name).objects.get(**kwargs)
+        return table.get(**kwargs)
+
+    def filter(self, model_name, **kwargs):
+        """
+        Get records of a table.
+
+        Args:
+            model_name: (string) table's name.
+        """
+        table = self.get_table(model_name, kwargs)
+        if table is None:
+            return apps.get_model(settings.WORLD_DATA_APP, model_name).objects.filter(**kwargs)
+        return table.filter(**kwargs)
+
+
+def _get_field(model, name):
+    """
+    Get a model's field, returns None if the field does not exist.
+    """
+    try:
+        return model._meta.get_field(name)
+    except Exception:
+        return None
+
+
+def _record_class(model, names):
+    """
+    Create a record class of a model. Records have the same attributes as
+    model instances, and can be used like model instances in reading.
+    """
+    record_class = namedtuple(model._meta.object_name, names)
+
+    def serializable_value(self, field_name):
+        return getattr(self, field_name)
+
+    return type(model._meta.object_name, (record_class,), {"__slots__": (),
+                                                           "_meta": model._meta,
+                                                           "serializable_value": serializable_value})
+
+
+def _on_record_changed(sender, **kwargs):
+    """
+    Reload the table whose record has been changed.
+    """
+    WORLD_DATA.invalidate(sender._meta.model_name)
+
+
+def _connect_signals():
+    """
+    Watch changes of world data models only, so saving and deleting other
+    models are not affected.
+    """
+    for model in apps.get_app_config(settings.WORLD_DATA_APP).get_models():
+        model_name = model._meta.model_name
+        post_save.connect(_on_record_changed, sender=model,
+                          dispatch_uid="world_data_snapshot_save_%s" % model_name)
+        post_delete.connect(_on_record_changed, sender=model,
+                            dispatch_uid="world_data_snapshot_delete_%s" % model_name)
+
+
+WORLD_DATA = WorldDataSnapshot()
+
+_connect_signals()
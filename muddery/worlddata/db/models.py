@@ -115,6 +115,17 @@ class game_settings(models.Model):
     # Show room's box if it does not have an icon.
     map_room_box = models.BooleanField(blank=True, default=False)
 
+    # Objects' movements in a room are sent to players in this interval (in
+    # seconds). They are sent immediately if it is 0.
+    room_notify_interval = models.FloatField(blank=True,
+                                             default=0.0,
+                                             validators=[MinValueValidator(0.0)])
+
+    # If there are more players in a room, players get the number of players
+    # instead of each player's movements. It only works when the
+    # room_notify_interval is not 0. Set it to 0 to disable it.
+    room_crowd_size = models.PositiveIntegerField(blank=True, default=20)
+
     class Meta:
         "Define Django meta options"
         abstract = True
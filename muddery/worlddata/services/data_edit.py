@@ -12,6 +12,7 @@ from muddery.worlddata.dao import general_query_mapper
 from muddery.worlddata.dao.common_mappers import WORLD_AREAS, WORLD_ROOMS, WORLD_EXITS
 from muddery.worlddata.dao.system_data_mapper import SYSTEM_DATA
 from muddery.worlddata.dao.object_properties_mapper import OBJECT_PROPERTIES
+from muddery.worlddata.dao.world_data_snapshot import WORLD_DATA
 from muddery.mappings.form_set import FORM_SET
 from muddery.mappings.typeclass_set import TYPECLASS, TYPECLASS_SET
 from muddery.worlddata.forms.default_forms import ObjectsForm
@@ -279,7 +280,7 @@ def save_map_positions(area, rooms):
     """
     with transaction.atomic():
         # area data
-        record = WORLD_AREAS.get(key=area["key"])
+        record = WORLD_AREAS.objects.get(key=area["key"])
         record.background = area["background"]
         record.width = area["width"]
         record.height = area["height"]
@@ -292,7 +293,7 @@ def save_map_positions(area, rooms):
             position = ""
             if len(room["position"]) > 1:
                 position = "(%s,%s)" % (room["position"][0], room["position"][1])
-            record = WORLD_ROOMS.get(key=room["key"])
+            record = WORLD_ROOMS.objects.get(key=room["key"])
             record.position = position
 
             record.full_clean()
@@ -366,19 +367,24 @@ def update_object_key(typeclass_key, old_key, new_key):
         model_name = TYPECLASS("ROOM").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
+            # update() does not send signals
+            WORLD_DATA.invalidate(model_name)
     elif issubclass(typeclass, TYPECLASS("ROOM")):
         # Update relative exit's location.
         model_name = TYPECLASS("EXIT").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
             general_query_mapper.filter_records(model_name, destination=old_key).update(destination=new_key)
+            WORLD_DATA.invalidate(model_name)
 
         # Update relative world object's location.
         model_name = TYPECLASS("WORLD_OBJECT").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
+            WORLD_DATA.invalidate(model_name)
 
         # Update relative world NPC's location.
         model_name = TYPECLASS("WORLD_NPC").model_name
         if model_name:
             general_query_mapper.filter_records(model_name, location=old_key).update(location=new_key)
+            WORLD_DATA.invalidate(model_name)
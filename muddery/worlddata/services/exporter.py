@@ -5,9 +5,13 @@ This module imports data from files to db.
 from __future__ import print_function
 
 import os
+import shutil
 import tempfile
 import zipfile
+from itertools import imap
+from multiprocessing.pool import ThreadPool
 from django.conf import settings
+from django.db import connections
 from evennia.utils import logger
 from evennia.settings_default import GAME_DIR
 from muddery.server.launcher import configs
@@ -38,46 +42,79 @@ def export_file(filename, table_name, file_type=None):
     header = [field.name for field in fields]
     writer.writeln(header)
 
-    records = general_query_mapper.get_all_records(table_name)
-    for record in records:
-        line = [str(record.serializable_value(field.get_attname())) for field in fields]
+    # read records one by one, do not load the whole table
+    attnames = [field.get_attname() for field in fields]
+    for values in general_query_mapper.iter_all_values(table_name, attnames):
+        line = [str(value) for value in values]
         writer.writeln(line)
 
     writer.save()
 
 
-def export_zip_all(file_obj, file_type=None):
+def export_zip_all(file_obj, file_type=None, workers=None):
     """
     Export all tables to a zip file which contains a group of csv files.
+
+    Args:
+        file_obj: (file) the zip file.
+        file_type: (string) data file's type.
+        workers: (int) number of threads exporting tables. Tables are exported
+                 in the current thread if it is less than 2.
     """
     if not file_type:
         # Set default file type.
         file_type = "csv"
 
+    if workers is None:
+        workers = settings.WORLD_DATA_EXPORT_WORKERS
+
     writer_class = writers.get_writer(file_type)
     if not writer_class:
         raise(MudderyError(ERR.export_data_error, "Unsupport file type %s" % file_type))
 
-    # Get tempfile's name.
-    temp = tempfile.mktemp()
+    # Tables are exported to temp files record by record, then added to the zip
+    # file in chunks, so the memory usage does not depend on tables' sizes.
+    temp_path = tempfile.mkdtemp()
     file_ext = writer_class.file_ext
 
+    def export_table(model_name):
+        filename = model_name + "." + file_ext
+        temp = os.path.join(temp_path, filename)
+        try:
+            export_file(temp, model_name, file_type)
+        finally:
+            if workers > 1:
+                # close this thread's db connections
+                connections.close_all()
+        return filename, temp
+
+    pool = None
     try:
         archive = zipfile.ZipFile(file_obj, 'w', zipfile.ZIP_DEFLATED)
 
         # get model names
         models = model_mapper.get_all_models()
-        for model in models:
-            model_name = model._meta.object_name
-            export_file(temp, model_name, file_type)
-            filename = model_name + "." + file_ext
+        model_names = [model._meta.object_name for model in models]
+
+        if workers > 1:
+            pool = ThreadPool(workers)
+            results = pool.imap(export_table, model_names)
+        else:
+            results = imap(export_table, model_names)
+
+        # keep the order of tables
+        for filename, temp in results:
             archive.write(temp, filename)
+            os.remove(temp)
 
         # add version file
         version_file = os.path.join(GAME_DIR, configs.CONFIG_FILE)
         archive.write(version_file, configs.CONFIG_FILE)
+        archive.close()
     finally:
-        os.remove(temp)
+        if pool:
+            pool.terminate()
+        shutil.rmtree(temp_path)
 
 
 def export_resources(file_obj):
@@ -6,13 +6,14 @@ from __future__ import print_function
 
 import os, glob, tempfile, zipfile, shutil
 from django.conf import settings
+from django.db import router, transaction
 from evennia.utils import logger
 from muddery.server.upgrader.upgrade_handler import UPGRADE_HANDLER
 from muddery.server.launcher import configs
 from muddery.server.launcher.utils import copy_tree
 from muddery.utils import readers
 from muddery.utils.exception import MudderyError, ERR
-from muddery.worlddata.dao.data_importer import import_file
+from muddery.worlddata.dao.data_importer import import_file, clear_table
 from muddery.worlddata.dao import model_mapper
 
 
@@ -130,25 +131,28 @@ def import_table_path(path, table_name, clear=True):
     """
     Import a table's data from a path.
     """
-    # clear old data
     model = model_mapper.get_model(table_name)
     if not model:
         return
 
-    if clear:
-        model.objects.all().delete()
-
-    if not os.path.isdir(path):
-        return
-
-    for file_name in os.listdir(path):
-        file_name = os.path.join(path, file_name)
-        if os.path.isdir(file_name):
-            # if it is a folder
-            continue
-
-        print("Importing %s" % file_name)
-        try:
-            import_file(file_name, table_name=table_name, clear=False)
-        except Exception, e:
-            print("Import error: %s" % e)
+    # Import all files in one transaction, so the table will not change if
+    # there are any errors.
+    try:
+        with transaction.atomic(using=router.db_for_write(model)):
+            # clear old data
+            if clear:
+                clear_table(model)
+
+            if not os.path.isdir(path):
+                return
+
+            for file_name in os.listdir(path):
+                file_name = os.path.join(path, file_name)
+                if os.path.isdir(file_name):
+                    # if it is a folder
+                    continue
+
+                print("Importing %s" % file_name)
+                import_file(file_name, table_name=table_name, clear=False)
+    except Exception, e:
+        print("Import error: %s" % e)
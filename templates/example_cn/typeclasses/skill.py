@@ -1,12 +1,13 @@
 """
 Skills
 
-Each skill is a skill object stored in the character. The skill object stores all data and
-actions of a skill.
+Skills' data are defined by the skill typeclass. Characters' skills are
+ManaSkill objects, which cost mana.
 
 """
 
 from muddery.typeclasses.skill import MudderySkill
+from muddery.utils.skill_handler import CharacterSkill
 from muddery.utils.localized_strings_handler import _
 
 
@@ -16,6 +17,13 @@ class Skill(MudderySkill):
     """
     typeclass_key = "SKILL"
 
+    skill_class = "typeclasses.skill.ManaSkill"
+
+
+class ManaSkill(CharacterSkill):
+    """
+    A character's skill which costs mana.
+    """
     def do_skill(self, target):
         """
         Do this skill.
@@ -24,7 +32,7 @@ class Skill(MudderySkill):
             # set mp
             self.owner.prop.mp -= self.prop.mp
 
-        return super(Skill, self).do_skill(target)
+        return super(ManaSkill, self).do_skill(target)
 
     def check_available(self, passive):
         """
@@ -37,10 +45,10 @@ class Skill(MudderySkill):
             message: (string) If the skill is not available, returns a string of reason.
                      If the skill is available, return "".
         """
-        message = super(Skill, self).check_available(passive)
+        message = super(ManaSkill, self).check_available(passive)
         if message:
             return message
-            
+
         if self.owner.prop.mp < self.prop.mp:
             return _("Not enough mana to cast {c%s{n!") % self.get_name()
 
@@ -56,10 +64,10 @@ class Skill(MudderySkill):
         Returns:
             (boolean) available or not.
         """
-        result = super(Skill, self).is_available(passive)
+        result = super(ManaSkill, self).is_available(passive)
         if not result:
             return result
-            
+
         if self.owner.prop.mp < self.prop.mp:
             return False
 
@@ -70,8 +78,8 @@ class Skill(MudderySkill):
         This is a convenient hook for a 'look'
         command to call.
         """
-        info = super(Skill, self).get_appearance(caller)
-        
+        info = super(ManaSkill, self).get_appearance(caller)
+
         info["mp"] = self.prop.mp
 
         return info
@@ -25,7 +25,7 @@ Skills.prototype.setSkills = function(skills) {
         var item = this.cloneTemplate(template);
 
         item.find(".skill_name")
-            .data("dbref", obj["dbref"])
+            .data("key", obj["key"])
         	.text(obj["name"]);
             
         if (obj["icon"]) {